@@ -1,7 +1,13 @@
 # Scraper/scrape.py
-import argparse, re, sys, os, time, datetime as dt
+import argparse, re, sys, os, time, random, threading, queue, datetime as dt
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from html.parser import HTMLParser
 from urllib.parse import urljoin
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # Make backend importable no matter where we run from
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 BACKEND_DIR = os.path.join(BASE_DIR, "backend")
@@ -9,9 +15,18 @@ for p in (BASE_DIR, BACKEND_DIR):
     if p not in sys.path:
         sys.path.insert(0, p)
 
-from backend.app import create_app
-from backend.db import db
-from backend.models.job import Job
+# Same module names the backend itself uses (backend/ is on sys.path), so the
+# models are only defined once on the shared metadata. Only the database is
+# needed here: a plain session (db.SessionFactory), not the Flask app.
+from cache import response_cache
+from db import SessionFactory
+from dedup import rescan as rescan_duplicates
+from frontier import FETCHED, CrawlFrontier
+from ingest import bulk_upsert_jobs
+from models.job import Job
+
+from dotenv import load_dotenv
+from sqlalchemy import select
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -21,6 +36,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
 
+load_dotenv()  # DATABASE_URL, CACHE_URL, FRONTIER_DATABASE_URL from a local .env
+
 # put near the imports
 PROPER_CASE_OVERRIDES = {
     "qbe": "QBE",
@@ -46,6 +63,12 @@ def company_from_slug(url: str) -> str:
 
 LISTING_URL = "https://www.actuarylist.com/"
 
+HTTP_TIMEOUT = 20  # seconds, plain HTTP detail fetches
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/129.0 Safari/537.36"
+)
+
 DETAIL_HREF_RE = re.compile(r"/actuarial-jobs/\d+[-/]")  # matches e.g. /actuarial-jobs/20904-liberty-mutual
 
 JOB_TYPE_TERMS = [
@@ -57,6 +80,30 @@ JOB_TYPE_TERMS = [
     "Senior Actuary",
 ]
 
+# A line with two or more of these is the tag "chips" line
+TAG_KEYWORDS = ("Analyst", "Actuary", "Life", "Health", "Property", "Pensions", "Reinsurance",
+                "Python", "SQL", "SAS", "Pricing", "Risk", "Valuation", "Modelling")
+TAG_KEYWORD_RE = re.compile("|".join(map(re.escape, TAG_KEYWORDS)))
+TAG_SPLIT_RE = re.compile(r"[•|,;/\s]+")
+TAG_STOPWORDS = {"at", "and"}
+
+# Every label on a detail page in one pattern, run once over the page text:
+# "City:" / "Country:" at the start of a line (value read by lookahead) and
+# "Posted Date: 19-Oct-2025" anywhere. [^\S\n] keeps matches on one line.
+DETAIL_LABEL_RE = re.compile(
+    r"^(?P<label>(?i:city|country)):(?=(?P<value>.*))"
+    r"|Posted Date:[^\S\n]*(?P<posted>[0-9]{1,2}-[A-Za-z]{3}-[0-9]{4})",
+    re.M,
+)
+RELATIVE_DATE_RE = re.compile(r"\d+[^\S\n]*(?:h|d|w|mo)[^\S\n]+ago", re.I)
+
+# One round trip per page: every detail href, the first <h1> and the body text
+PAGE_SNAPSHOT_JS = """
+const links = Array.from(document.querySelectorAll("a[href*='/actuarial-jobs/']"), a => a.href);
+const h1 = document.querySelector("h1");
+return {hrefs: links, h1: h1 ? h1.innerText : "", text: document.body ? document.body.innerText : ""};
+"""
+
 import datetime as dt
 # ...
 def parse_relative_date(text: str):
@@ -117,20 +164,56 @@ def wait_for_any_job_link(driver):
         EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']"))
     )
 
-def collect_detail_links_on_page(driver) -> list[str]:
-    anchors = driver.find_elements(By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']")
-    urls = []
-    for a in anchors:
-        href = a.get_attribute("href") or ""
-        if DETAIL_HREF_RE.search(href):
-            urls.append(href)
-    # De-dupe but keep order
-    seen, unique = set(), []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            unique.append(u)
-    return unique
+class PageProfile:
+    """
+    Per-page timings for --profile, by stage: "fetch" (load / GET), "extract"
+    (snapshot or HTML -> h1 + text) and "parse" (text -> record). Thread-safe;
+    a disabled profile times nothing.
+    """
+    STAGES = ("fetch", "extract", "parse")
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.samples = {stage: [] for stage in self.STAGES}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, stage: str):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.samples[stage].append(time.perf_counter() - t0)
+
+    def report(self) -> str:
+        lines = [f"{'stage':8} {'pages':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for stage in self.STAGES:
+            ms = sorted(s * 1000 for s in self.samples[stage])
+            if not ms:
+                continue
+            p50, p95 = ms[len(ms) // 2], ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+            lines.append(f"{stage:8} {len(ms):6} {sum(ms) / len(ms):9.2f} {p50:9.2f} {p95:9.2f} {ms[-1]:9.2f}")
+        return "\n".join(lines)
+
+
+NO_PROFILE = PageProfile(enabled=False)
+
+def snapshot_page(driver) -> dict:
+    """{"hrefs", "h1", "text"} of the current page in a single execute_script call."""
+    snap = driver.execute_script(PAGE_SNAPSHOT_JS) or {}
+    return {"hrefs": snap.get("hrefs") or [], "h1": snap.get("h1") or "", "text": snap.get("text") or ""}
+
+def detail_links(hrefs) -> list[str]:
+    """Detail-page URLs among `hrefs`, de-duplicated, in page order."""
+    return list(dict.fromkeys(h for h in hrefs if h and DETAIL_HREF_RE.search(h)))
+
+def collect_detail_links_on_page(driver, profile: PageProfile = NO_PROFILE) -> list[str]:
+    with profile.timed("extract"):
+        return detail_links(snapshot_page(driver)["hrefs"])
 
 def click_next_if_present(driver) -> bool:
     # The listing has a "Next" link at the bottom (we saw "Showing 1 - 30 ... Next")
@@ -153,71 +236,107 @@ def click_next_if_present(driver) -> bool:
             continue
     return False
 
-from selenium.common.exceptions import NoSuchElementException
+def split_tags(line: str) -> list[str]:
+    tags, seen = [], set()
+    for p in TAG_SPLIT_RE.split(line):
+        if p and p.lower() not in TAG_STOPWORDS and len(p) <= 30 and p not in seen:
+            tags.append(p)
+            seen.add(p)
+    return tags
 
-def parse_detail(driver, url: str) -> dict | None:
-    driver.get(url)
-    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+def scan_detail_lines(lines: list[str]) -> dict:
+    """
+    City / country (first 120 lines), posted date (first 150) and the tag chips
+    line (first 40), from whole-text regex scans instead of several searches
+    per line. An explicit "Posted Date:" wins over a relative "Xd ago";
+    a line mentioning "remote" sets the country until a label has been seen.
+    """
+    head = lines[:150]
+    block = "\n".join(head)
+    cut40 = len("\n".join(head[:40]))
+    cut120 = len("\n".join(head[:120]))
 
-    # --- TITLE: take the H1 (this is the real job title) ---
-    try:
-        title = driver.find_element(By.XPATH, "//h1").text.strip()
-    except NoSuchElementException:
-        title = ""
+    posting_date = None
+    events = []  # (line number, 0 = label / 1 = remote, match)
+    line, pos = 0, 0
+    for m in DETAIL_LABEL_RE.finditer(block):
+        line += block.count("\n", pos, m.start())
+        pos = m.start()
+        if m.group("label"):
+            if pos < cut120:
+                events.append((line, 0, m))
+        elif posting_date is None:
+            try:
+                posting_date = dt.datetime.strptime(m.group("posted"), "%d-%b-%Y").date()
+            except ValueError:
+                pass
+    if posting_date is None:
+        m = RELATIVE_DATE_RE.search(block)
+        posting_date = parse_relative_date(m.group()) if m else None
+
+    low = block[:cut120].lower()
+    line, pos = 0, 0
+    hit = low.find("remote")
+    while hit != -1:
+        line += low.count("\n", pos, hit)
+        events.append((line, 1, None))
+        pos = low.find("\n", hit)
+        hit = -1 if pos == -1 else low.find("remote", pos)
+
+    # replay labels and "remote" lines in page order
+    city = country = None
+    label_lines = {ln for ln, kind, _m in events if kind == 0}
+    for ln, kind, m in sorted(events, key=lambda e: (e[0], e[1])):
+        if kind == 0:
+            value = m.group("value").strip()
+            if m.group("label").lower() == "city":
+                city = value
+            else:
+                country = value
+        elif ln not in label_lines and not (city or country):
+            country = "Remote"
+
+    # tag chips: the first line with two or more distinct keywords
+    tags = []
+    seen, line, pos = {}, 0, 0
+    for m in TAG_KEYWORD_RE.finditer(block, 0, cut40):
+        line += block.count("\n", pos, m.start())
+        pos = m.start()
+        words = seen.setdefault(line, set())
+        words.add(m.group())
+        if len(words) >= 2:
+            tags = split_tags(head[line])
+            break
+
+    return {"city": city, "country": country, "posting_date": posting_date, "tags": tags}
+
+def parse_detail_text(url: str, title: str, text: str, strict: bool = False) -> dict | None:
+    """
+    Build a job record from a detail page's <h1> and visible body text.
+    Shared by the Selenium and plain-HTTP fetchers. With strict=True, return
+    None when the location or posted date labels are missing instead of
+    falling back to defaults (the HTTP path then retries with Selenium).
+    """
+    title = (title or "").strip()
 
     # --- COMPANY: derive from the slug ---
     company = company_from_slug(url)
 
-    # --- PAGE TEXT for labels like Country, City, Posted Date ---
-    text = driver.find_element(By.TAG_NAME, "body").text
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    # --- PAGE TEXT: one pass over the lines, one regex for every label ---
+    lines = [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
+    fields = scan_detail_lines(lines)
+    city, country, posting_date, tags = fields["city"], fields["country"], fields["posting_date"], fields["tags"]
 
-    # LOCATION
-    city = country = None
-    for ln in lines[:120]:
-        low = ln.lower()
-        if low.startswith("city:"):
-            city = ln.split(":", 1)[1].strip()
-        elif low.startswith("country:"):
-            country = ln.split(":", 1)[1].strip()
-        elif "remote" in low and not (city or country):
-            country = "Remote"
     if city and country:
         location = f"{city}, {country}"
     else:
         location = country or city or "Remote"
 
-    # POSTED DATE (prefer explicit 'Posted Date:'; else relative 'Xd ago'; else today)
-    posting_date = None
-    for ln in lines[:150]:
-        m = re.search(r"Posted Date:\s*([0-9]{1,2}-[A-Za-z]{3}-[0-9]{4})", ln)
-        if m:
-            try:
-                posting_date = dt.datetime.strptime(m.group(1), "%d-%b-%Y").date()
-                break
-            except Exception:
-                pass
-        d = parse_relative_date(ln)
-        if d and not posting_date:
-            posting_date = d
+    if strict and (not title or not (city or country) or not posting_date):
+        return None
     if not posting_date:
         posting_date = dt.date.today()
 
-    # TAGS (grab the “chips” line close to the top; keep short, dedup)
-    tags = []
-    for ln in lines[:40]:
-        if sum(k in ln for k in ["Analyst", "Actuary", "Life", "Health", "Property",
-                                 "Pensions", "Reinsurance", "Python", "SQL", "SAS",
-                                 "Pricing", "Risk", "Valuation", "Modelling"]) >= 2:
-            parts = re.split(r"[•|,;/\s]+", ln)
-            seen = set()
-            for p in parts:
-                p = p.strip()
-                if p and p.lower() not in {"at", "and"} and len(p) <= 30 and p not in seen:
-                    tags.append(p)
-                    seen.add(p)
-            break
-
     # JOB TYPE (guess from tags; otherwise a safe default)
     job_type = next((t for t in tags if "Actuary" in t or "Analyst" in t), "") or "Analyst (Experienced)"
 
@@ -235,97 +354,419 @@ def parse_detail(driver, url: str) -> dict | None:
         "source_url": url,
     }
 
-def upsert_job(sess, data: dict):
-    # Ensure posting_date is a Python date
-    pd = data.get("posting_date")
-    if isinstance(pd, str):
+def parse_detail(driver, url: str, profile: PageProfile = NO_PROFILE) -> dict | None:
+    with profile.timed("fetch"):
+        driver.get(url)
+        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+    # --- TITLE (the H1 is the real job title) and body text in one round trip ---
+    with profile.timed("extract"):
+        snap = snapshot_page(driver)
+    with profile.timed("parse"):
+        return parse_detail_text(url, snap["h1"], snap["text"])
+
+
+# --- Plain HTTP fetch path (no browser) ---
+
+class DetailHTMLParser(HTMLParser):
+    """
+    Pull the first <h1> and the visible body text out of static HTML, with a
+    line break at block elements so the text splits into lines the way
+    Selenium's `body.text` does.
+    """
+    BLOCK_TAGS = {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+        "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+        "main", "nav", "ol", "p", "section", "table", "tr", "ul",
+    }
+    SKIP_TAGS = {"script", "style", "noscript", "template", "head", "svg"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.h1 = None
+        self._h1_parts = None
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "h1" and self.h1 is None and not self._skip:
+            self._h1_parts = []
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "h1" and self._h1_parts is not None:
+            self.h1 = " ".join("".join(self._h1_parts).split())
+            self._h1_parts = None
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.parts.append(data)
+        if self._h1_parts is not None:
+            self._h1_parts.append(data)
+
+    @property
+    def text(self) -> str:
+        lines = ("".join(self.parts)).splitlines()
+        return "\n".join(" ".join(ln.split()) for ln in lines)
+
+
+def parse_detail_html(url: str, html: str, strict: bool = True, profile: PageProfile = NO_PROFILE) -> dict | None:
+    with profile.timed("extract"):
+        parser = DetailHTMLParser()
+        parser.feed(html)
+        parser.close()
+        text = parser.text
+    with profile.timed("parse"):
+        return parse_detail_text(url, parser.h1 or "", text, strict=strict)
+
+
+def get_http_session(pool_size: int = 4) -> requests.Session:
+    """Pooled keep-alive HTTP client for detail pages."""
+    http = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    http.headers["User-Agent"] = HTTP_USER_AGENT
+    return http
+
+
+def parse_detail_http(http: requests.Session, url: str, profile: PageProfile = NO_PROFILE) -> dict | None:
+    """Fetch a detail page without a browser; None if the static HTML lacks the fields."""
+    with profile.timed("fetch"):
+        resp = http.get(url, timeout=HTTP_TIMEOUT)
+        resp.raise_for_status()
+        html = resp.text
+    return parse_detail_html(url, html, profile=profile)
+
+def load_known_jobs(sess) -> dict:
+    """source_url -> (content_hash, updated_at) for every stored job, in one query."""
+    rows = sess.execute(
+        select(Job.source_url, Job.content_hash, Job.updated_at).where(Job.source_url.isnot(None))
+    )
+    return {url: (digest, updated_at) for url, digest, updated_at in rows}
+
+def write_batch(sess, frontier: CrawlFrontier, batch: list, totals: dict):
+    """
+    Upsert a batch of (claim, record) in one go and commit, then mark the
+    claims parsed in the frontier; bad rows are reported and marked failed, not fatal.
+    """
+    if not batch:
+        return
+    result = bulk_upsert_jobs(sess, [record for _claim, record in batch])
+    sess.commit()
+    if result["inserted"] or result["updated"]:
+        response_cache.invalidate()
+    for key in ("inserted", "updated", "unchanged", "merged"):
+        totals[key] += result[key]
+    bad = set()
+    for err in result["errors"]:
+        totals["skipped"] += 1
+        claim = batch[err["index"]][0]
+        bad.add(err["index"])
+        print(f"[skip] {claim.url}: {err['error']}")
+        frontier.failed(claim, err["error"], retry=False)
+    frontier.parsed([claim for i, (claim, _record) in enumerate(batch) if i not in bad])
+    batch.clear()
+
+class RateLimiter:
+    """Global limit on detail-page requests per second, shared by all workers."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DriverPool:
+    """
+    Up to `size` Chrome drivers handed out one per worker. Extra drivers are
+    started lazily; a driver that errors out is replaced on its next checkout.
+
+    The idle stack holds live drivers and None for each free slot: taking a
+    None means starting a driver there. A driver that failed to start, or
+    errored out, turns back into a None, so the pool never shrinks and a
+    waiting worker is woken to fill the slot.
+    """
+
+    def __init__(self, size: int, visible: bool = False, first=None):
+        self.size = max(1, size)
+        self.visible = visible
+        self._idle = queue.LifoQueue()  # live drivers are reused before free slots are filled
+        self._all = []
+        self._lock = threading.Lock()
+        for _ in range(self.size - (first is not None)):
+            self._idle.put(None)
+        if first is not None:
+            self._all.append(first)
+            self._idle.put(first)
+
+    def _checkout(self):
+        drv = self._idle.get()
+        if drv is None:
+            try:
+                drv = get_driver(visible=self.visible)
+            except BaseException:
+                self._idle.put(None)  # give the slot back
+                raise
+            with self._lock:
+                self._all.append(drv)
+        return drv
+
+    def _discard(self, drv):
+        with self._lock:
+            self._all.remove(drv)
         try:
-            pd = dt.date.fromisoformat(pd)
+            drv.quit()
         except Exception:
-            pd = dt.date.today()
+            pass
+        self._idle.put(None)
+
+    @contextmanager
+    def driver(self):
+        drv = self._checkout()
+        healthy = True
+        try:
+            yield drv
+        except WebDriverException as e:
+            # the session may be dead (a slow page is not): the next checkout starts a fresh driver
+            healthy = isinstance(e, TimeoutException)
+            raise
+        finally:
+            if healthy:
+                self._idle.put(drv)
+            else:
+                self._discard(drv)
+
+    def quit(self):
+        for drv in self._all:
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+
+def fetch_details(urls, fetch_one, workers: int = 1, limiter: RateLimiter | None = None,
+                  retries: int = 2, backoff: float = 1.5):
+    """
+    Run fetch_one(url) -> record on `workers` threads. Yields (url, data, error)
+    as pages complete; the caller is the single DB writer.
+    """
+    def work(url):
+        last_err = None
+        for attempt in range(retries + 1):
+            if limiter:
+                limiter.wait()
+            try:
+                return url, fetch_one(url), None
+            except Exception as e:
+                last_err = e
+                if attempt < retries:
+                    # exponential backoff with jitter, per worker
+                    time.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+        return url, None, last_err
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="detail") as ex:
+        futures = [ex.submit(work, u) for u in urls]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def make_detail_fetcher(mode: str, pool: DriverPool, http: requests.Session | None = None, stats: dict | None = None,
+                        profile: PageProfile = NO_PROFILE):
+    """
+    mode="selenium": render every page in Chrome.
+    mode="http": plain GET + static HTML parse, Chrome only when fields are missing.
+    """
+    stats = stats if stats is not None else {}
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            stats[key] = stats.get(key, 0) + 1
+
+    def via_selenium(url):
+        with pool.driver() as drv:
+            count("selenium")
+            return parse_detail(drv, url, profile)
+
+    def via_http(url):
+        try:
+            data = parse_detail_http(http, url, profile)
+        except requests.RequestException as e:
+            print(f"[http] {url}: {e}; falling back to Chrome")
+            data = None
+        if data is not None:
+            count("http")
+            return data
+        return via_selenium(url)
+
+    return via_http if mode == "http" else via_selenium
 
-    existing = (
-        sess.query(Job)
-        .filter(Job.title == data["title"], Job.company == data["company"], Job.location == data["location"])
-        .first()
-    )
-    if existing:
-        existing.posting_date = pd
-        existing.job_type = data.get("job_type")
-        existing.tags = ",".join(data.get("tags", []))
-        sess.add(existing)
-        return "updated"
-    else:
-        j = Job(
-            title=data["title"],
-            company=data["company"],
-            location=data["location"],
-            posting_date=pd,
-            job_type=data.get("job_type"),
-            tags=",".join(data.get("tags", [])),
-        )
-        sess.add(j)
-        return "inserted"
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--limit", type=int, default=60, help="max number of jobs to fetch")
     ap.add_argument("--pages", type=int, default=2, help="how many listing pages to walk via Next")
     ap.add_argument("--visible", action="store_true", help="run Chrome with a visible window for debugging")
+    ap.add_argument("--workers", type=int, default=1, help="detail pages fetched in parallel (one Chrome each)")
+    ap.add_argument("--rate", type=float, default=2.0, help="max detail requests per second across workers (0 = no limit)")
+    ap.add_argument("--retries", type=int, default=2, help="retries per detail page, with exponential backoff")
+    ap.add_argument("--fetch", choices=["http", "selenium"], default="http",
+                    help="detail pages via plain HTTP (Chrome only as fallback) or always via Chrome")
+    ap.add_argument("--batch-size", type=int, default=50,
+                    help="URLs claimed from the frontier at a time; their jobs are written in one bulk upsert")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue with the URLs already in the crawl frontier (skip the listing walk if there are any)")
+    ap.add_argument("--frontier-db", default=os.getenv("FRONTIER_DATABASE_URL"),
+                    help="database URL for the crawl frontier, e.g. sqlite:///crawl.db (default: the app database)")
+    ap.add_argument("--max-attempts", type=int, default=3,
+                    help="frontier attempts per URL across runs before it is marked failed")
+    ap.add_argument("--lease", type=float, default=600,
+                    help="seconds a claimed batch stays reserved for this process")
+    ap.add_argument("--incremental", action="store_true",
+                    help="skip detail pages already stored; stop paging once a listing page has only known jobs")
+    ap.add_argument("--refresh-days", type=int, default=0,
+                    help="with --incremental, still re-fetch known jobs not updated for this many days (0 = never)")
+    ap.add_argument("--profile", action="store_true",
+                    help="print per-page fetch / extract / parse timings at the end")
+    ap.add_argument("--rescan-duplicates", action="store_true",
+                    help="afterwards, re-index the whole table and merge near-duplicate jobs (see backend/dedup.py)")
     args = ap.parse_args()
 
-    app = create_app()
+    Session = SessionFactory()
+    response_cache.configure()  # invalidations reach the web workers with CACHE_URL
     driver = get_driver(visible=args.visible)
+    pool = DriverPool(args.workers, visible=args.visible, first=driver)
+    http = get_http_session(args.workers) if args.fetch == "http" else None
+    fetch_stats = {}
+    profile = PageProfile() if args.profile else NO_PROFILE
+
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "merged": 0, "skipped": 0}
+    known_skipped = 0
+    fetched, fetch_secs = 0, 0.0
+
+    # Incremental mode: everything we already have, loaded once up front
+    known = {}
+    if args.incremental:
+        with Session() as sess:
+            known = load_known_jobs(sess)
+    stale_before = dt.datetime.utcnow() - dt.timedelta(days=args.refresh_days)
+
+    def wanted(url):
+        if url not in known:
+            return True
+        _digest, updated_at = known[url]
+        return bool(args.refresh_days) and (updated_at is None or updated_at < stale_before)
+
+    frontier = CrawlFrontier(SessionFactory(args.frontier_db).engine if args.frontier_db else Session.engine,
+                             lease_seconds=args.lease, max_attempts=args.max_attempts)
 
-    inserted = updated = skipped = 0
     try:
-        driver.get(LISTING_URL)
-        wait_for_any_job_link(driver)
-
-        detail_urls = []
-        for _ in range(max(1, args.pages)):
-            detail_urls.extend(collect_detail_links_on_page(driver))
-            # Stop early if we already have enough URLs
-            if len(detail_urls) >= args.limit:
-                break
-            if not click_next_if_present(driver):
-                break
-            # small wait after pagination
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']")))
-
-        # unique & trim to limit
-        seen, urls = set(), []
-        for u in detail_urls:
-            if u not in seen:
-                seen.add(u)
-                urls.append(u)
-        urls = urls[: args.limit]
-
-        with app.app_context():
-            sess = db.session
-            for i, url in enumerate(urls, 1):
-                try:
-                    data = parse_detail(driver, url)
+        if args.resume and frontier.has_work():
+            print(f"Resuming crawl frontier: {frontier.counts()}")
+        else:
+            driver.get(LISTING_URL)
+            wait_for_any_job_link(driver)
+
+            detail_urls = []
+            for _ in range(max(1, args.pages)):
+                page_urls = collect_detail_links_on_page(driver, profile)
+                new_urls = [u for u in page_urls if wanted(u)]
+                known_skipped += len(page_urls) - len(new_urls)
+                detail_urls.extend(new_urls)
+                # Stop early if we already have enough URLs
+                if len(detail_urls) >= args.limit:
+                    break
+                # Listing is newest-first: a page of only known jobs means the rest are known too
+                if args.incremental and page_urls and not new_urls:
+                    break
+                if not click_next_if_present(driver):
+                    break
+                # small wait after pagination
+                WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/actuarial-jobs/']")))
+
+            # unique & trim to limit, then checkpoint them before fetching anything
+            urls = list(dict.fromkeys(detail_urls))[: args.limit]
+            frontier.enqueue(urls)
+
+        with Session() as sess:
+            t0 = time.perf_counter()
+
+            # records a crashed run parsed but never wrote
+            while claims := frontier.claim(args.batch_size, state=FETCHED):
+                write_batch(sess, frontier, [(c, c.payload) for c in claims], totals)
+
+            fetch_one = make_detail_fetcher(args.fetch, pool, http, fetch_stats, profile)
+            limiter = RateLimiter(args.rate)
+            remaining = args.limit
+            while remaining > 0 and (claims := frontier.claim(min(args.batch_size, remaining))):
+                remaining -= len(claims)
+                by_url = {c.url: c for c in claims}
+                batch = []
+                for url, data, err in fetch_details(list(by_url), fetch_one, workers=args.workers,
+                                                    limiter=limiter, retries=args.retries):
+                    fetched += 1
+                    claim = by_url[url]
+                    if err is not None:
+                        totals["skipped"] += 1
+                        print(f"[skip] {url}: {err}")
+                        frontier.failed(claim, err)
+                        continue
                     if not data or not data.get("title") or not data.get("company"):
-                        skipped += 1
+                        totals["skipped"] += 1
+                        frontier.failed(claim, "page has no title / company")
                         continue
-                    status = upsert_job(sess, data)
-                    if status == "inserted":
-                        inserted += 1
-                    else:
-                        updated += 1
-                    if i % 5 == 0:
-                        sess.commit()
-                except Exception as e:
-                    sess.rollback()
-                    skipped += 1
-                    print(f"[skip] {url}: {e}")
-            sess.commit()
+                    frontier.fetched(claim, data)
+                    batch.append((claim, data))
+                write_batch(sess, frontier, batch, totals)
+            fetch_secs = time.perf_counter() - t0
+
+            if args.rescan_duplicates:
+                rescanned = rescan_duplicates(sess, merge=True)
+                sess.commit()
+                if rescanned["duplicates"]:
+                    response_cache.invalidate()
+                print(f"Rescanned {rescanned['scanned']} jobs: merged {rescanned['duplicates']} near-duplicates "
+                      f"into {len(rescanned['groups'])} jobs.")
 
     finally:
-        driver.quit()
-
-    print(f"Inserted {inserted}, updated {updated}, skipped {skipped}.")
+        # unfinished claims go back to the frontier for the next run
+        frontier.release()
+        pool.quit()
+        if http is not None:
+            http.close()
+
+    rate = fetched / fetch_secs if fetch_secs else 0.0
+    print(f"Inserted {totals['inserted']}, updated {totals['updated']}, unchanged {totals['unchanged']}, "
+          f"merged {totals['merged']} near-duplicates, "
+          f"skipped {totals['skipped']}"
+          f"{f', already known {known_skipped}' if args.incremental else ''}. "
+          f"{fetched} pages in {fetch_secs:.1f}s ({rate:.2f} pages/sec, {args.workers} workers; "
+          f"{fetch_stats.get('http', 0)} via HTTP, {fetch_stats.get('selenium', 0)} via Chrome).")
+    if args.profile:
+        print(profile.report())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,240 @@
+# Scraper/test_scrape.py
+"""
+Detail-page parsing against the saved pages in fixtures/ (no network, no
+browser, no database), the single-pass scan_detail_lines against the
+per-line parser it replaced, and DriverPool with stand-in drivers.
+
+    python -m pytest -q Scraper
+"""
+import datetime as dt
+import os
+import re
+import threading
+
+import pytest
+
+import scrape
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture_html(name: str) -> str:
+    with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_detail_full():
+    url = "https://www.actuarylist.com/actuarial-jobs/20904-liberty-mutual"
+    job = scrape.parse_detail_html(url, fixture_html("detail_full"))
+    assert job == {
+        "title": "Senior Pricing Actuary",
+        "company": "Liberty Mutual",
+        "location": "Boston, United States",
+        "posting_date": dt.date(2025, 10, 3),
+        "job_type": "Actuary",
+        # the <h1> is the first line with two tag keywords
+        "tags": ["Senior", "Pricing", "Actuary"],
+        "source_url": url,
+    }
+
+
+def test_detail_remote():
+    url = "https://www.actuarylist.com/actuarial-jobs/20911-qbe"
+    job = scrape.parse_detail_html(url, fixture_html("detail_remote"))
+    assert job["title"] == "Valuation Analyst"  # multi-line <h1>, whitespace collapsed
+    assert job["company"] == "QBE"
+    # "Remote (Europe time zones)"; the "Country:" inside <noscript> is not visible text
+    assert job["location"] == "Remote"
+    assert job["posting_date"] == dt.date.today() - dt.timedelta(days=4)  # "4d ago"
+    assert job["tags"] == ["Analyst", "(Experienced)", "Life", "Valuation", "SQL"]
+    assert job["job_type"] == "Analyst"
+    assert job["source_url"] == url
+
+
+def test_detail_js_shell_falls_back_to_chrome():
+    url = "https://www.actuarylist.com/actuarial-jobs/20920-aviva"
+    html = fixture_html("detail_js_shell")
+    # no <h1>, labels or date in the static HTML: strict parsing gives up, so
+    # parse_detail_http returns None and the fetcher retries with Selenium
+    assert scrape.parse_detail_html(url, html, strict=True) is None
+    assert scrape.parse_detail_html(url, html, strict=False) is None
+
+
+@pytest.mark.parametrize("name", ["detail_full", "detail_remote"])
+def test_html_parser_text(name):
+    parser = scrape.DetailHTMLParser()
+    parser.feed(fixture_html(name))
+    parser.close()
+    lines = [ln for ln in parser.text.splitlines() if ln]
+    # script / style / noscript content never reaches the text
+    assert not any("gtag" in ln or ".chip{" in ln or "Nowhere" in ln for ln in lines)
+
+
+# --- scan_detail_lines vs. the per-line parser it replaced ---
+
+def per_line_fields(lines: list[str]) -> dict:
+    """The field extraction parse_detail_text did before scan_detail_lines (several searches per line)."""
+    city = country = None
+    for ln in lines[:120]:
+        low = ln.lower()
+        if low.startswith("city:"):
+            city = ln.split(":", 1)[1].strip()
+        elif low.startswith("country:"):
+            country = ln.split(":", 1)[1].strip()
+        elif "remote" in low and not (city or country):
+            country = "Remote"
+
+    posting_date = None
+    for ln in lines[:150]:
+        m = re.search(r"Posted Date:\s*([0-9]{1,2}-[A-Za-z]{3}-[0-9]{4})", ln)
+        if m:
+            try:
+                posting_date = dt.datetime.strptime(m.group(1), "%d-%b-%Y").date()
+                break
+            except Exception:
+                pass
+        d = scrape.parse_relative_date(ln)
+        if d and not posting_date:
+            posting_date = d
+
+    tags = []
+    for ln in lines[:40]:
+        if sum(k in ln for k in ["Analyst", "Actuary", "Life", "Health", "Property",
+                                 "Pensions", "Reinsurance", "Python", "SQL", "SAS",
+                                 "Pricing", "Risk", "Valuation", "Modelling"]) >= 2:
+            parts = re.split(r"[•|,;/\s]+", ln)
+            seen = set()
+            for p in parts:
+                p = p.strip()
+                if p and p.lower() not in {"at", "and"} and len(p) <= 30 and p not in seen:
+                    tags.append(p)
+                    seen.add(p)
+            break
+
+    return {"city": city, "country": country, "posting_date": posting_date, "tags": tags}
+
+
+def page_lines(text: str) -> list[str]:
+    return [ln.strip() for ln in text.splitlines() if ln.strip()]
+
+
+def fixture_lines(name: str) -> list[str]:
+    parser = scrape.DetailHTMLParser()
+    parser.feed(fixture_html(name))
+    parser.close()
+    return page_lines(parser.text)
+
+
+# page texts the fixtures don't cover: label order, "remote" before / after / on label lines,
+# explicit date after a relative one, an invalid explicit date, labels past the scan limits
+EDGE_PAGES = {
+    "remote_then_labels": "Title\nFully remote role\nCountry: Ireland\nCity: Dublin\n2w ago",
+    "labels_then_remote": "Title\ncity: Leeds\nCOUNTRY: United Kingdom\nRemote friendly\nPosted Date: 7-Jan-2025",
+    "remote_on_label_line": "Title\nCountry: Remote (UK)\nremote\n3d ago",
+    "relative_then_explicit": "Pricing Actuary | Life\n1d ago\nPosted Date: 19-Oct-2025\n2d ago",
+    "bad_explicit_date": "Title\nPosted Date: 31-Foo-2025\n5h ago\nPosted Date: 01-Feb-2024",
+    "chips_late": "\n".join(["filler"] * 39 + ["Risk / Modelling / SAS", "Health, Pensions"]),
+    "chips_too_late": "\n".join(["filler"] * 40 + ["Risk / Modelling / SAS"]),
+    "labels_too_late": "\n".join(["filler"] * 120 + ["City: Paris", "Country: France", "remote"]),
+    "date_too_late": "\n".join(["filler"] * 150 + ["Posted Date: 01-Feb-2024", "4d ago"]),
+    "repeated_labels": "City: A\nCity: B\nCountry: C\nremote\nCountry: D",
+    "empty": "",
+}
+
+
+@pytest.mark.parametrize("name", ["detail_full", "detail_remote", "detail_js_shell"])
+def test_scan_matches_per_line_parser_on_fixtures(name):
+    lines = fixture_lines(name)
+    assert scrape.scan_detail_lines(lines) == per_line_fields(lines)
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_PAGES))
+def test_scan_matches_per_line_parser_on_edge_cases(name):
+    lines = page_lines(EDGE_PAGES[name])
+    assert scrape.scan_detail_lines(lines) == per_line_fields(lines)
+
+
+# --- DriverPool (get_driver replaced by stand-ins) ---
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    """Stand-in get_driver; append an exception to `failures` to make the next start fail."""
+    started, failures = [], []
+
+    def get_driver(visible=False):
+        if failures:
+            raise failures.pop(0)
+        started.append(FakeDriver())
+        return started[-1]
+
+    monkeypatch.setattr(scrape, "get_driver", get_driver)
+    return started, failures
+
+
+def test_pool_reuses_idle_driver(drivers):
+    started, _ = drivers
+    pool = scrape.DriverPool(2)
+    with pool.driver() as a:
+        pass
+    with pool.driver() as b:
+        pass
+    assert a is b and len(started) == 1
+
+
+def test_pool_failed_start_frees_the_slot(drivers):
+    started, failures = drivers
+    pool = scrape.DriverPool(1)
+    failures.append(scrape.WebDriverException("chrome did not start"))
+    with pytest.raises(scrape.WebDriverException):
+        with pool.driver():
+            pass
+    with pool.driver() as drv:  # would block forever if the slot had leaked
+        assert drv is started[0]
+
+
+def test_pool_replaces_dead_driver(drivers):
+    started, failures = drivers
+    pool = scrape.DriverPool(1)
+    with pytest.raises(scrape.WebDriverException, match="session deleted"):
+        with pool.driver() as dead:
+            failures.append(scrape.WebDriverException("chrome did not start"))
+            raise scrape.WebDriverException("session deleted")
+    assert dead.quit_called and dead not in pool._all
+    # the replacement start fails on this checkout, then succeeds on the next
+    with pytest.raises(scrape.WebDriverException, match="did not start"):
+        with pool.driver():
+            pass
+    with pool.driver() as drv:
+        assert drv is not dead and not drv.quit_called
+    assert pool._all == [drv]
+
+
+def test_pool_keeps_driver_after_timeout(drivers):
+    started, _ = drivers
+    pool = scrape.DriverPool(1)
+    with pytest.raises(scrape.TimeoutException):
+        with pool.driver():
+            raise scrape.TimeoutException("slow page")
+    with pool.driver() as drv:
+        assert drv is started[0] and not drv.quit_called
+
+
+def test_pool_wakes_waiter_when_a_driver_dies(drivers):
+    started, _ = drivers
+    pool = scrape.DriverPool(1)
+    got = []
+    with pytest.raises(scrape.WebDriverException):
+        with pool.driver():
+            waiter = threading.Thread(target=lambda: got.append(pool._checkout()))
+            waiter.start()
+            raise scrape.WebDriverException("session deleted")
+    waiter.join(timeout=5)
+    assert got and got[0] is started[1]
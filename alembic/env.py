@@ -1,4 +1,6 @@
 from __future__ import annotations
+import os
+import sys
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
@@ -7,20 +9,41 @@ from alembic import context
 from dotenv import load_dotenv
 load_dotenv()
 
-# Import your Flask app + DB metadata
-from backend.app import create_app
-from backend.db import db
+# DB metadata only (no Flask app): backend/ modules import each other as top-level names
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+from db import database_url, db, import_models
+import_models()
 
 # Alembic config
 config = context.config
-app = create_app()
 
 # Use the same DB URL as Flask (Postgres in your case)
-config.set_main_option("sqlalchemy.url", app.config["SQLALCHEMY_DATABASE_URI"])
+config.set_main_option("sqlalchemy.url", database_url().replace("%", "%%"))
 
 # Metadata for autogenerate
 target_metadata = db.metadata
 
+# Created by raw DDL, not the models: the FTS5 table and its shadow tables
+# (search.py, SQLite), the generated search column and its index, and the
+# trigram indexes (Postgres)
+DDL_ONLY_TABLE_PREFIX = "jobs_fts"
+DDL_ONLY_NAMES = {"search_vector", "ix_jobs_search_vector", "ix_jobs_location_trgm", "ix_jobs_tags_trgm"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave DDL-only objects, and indexes limited to another dialect (Index.ddl_if), out of autogenerate."""
+    if type_ == "table" and name.startswith(DDL_ONLY_TABLE_PREFIX):
+        return False
+    if name in DDL_ONLY_NAMES:
+        return False
+    ddl_if = getattr(obj, "_ddl_if", None) if type_ == "index" and not reflected else None
+    if ddl_if is not None and ddl_if.dialect is not None:
+        dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+        return context.get_context().dialect.name in dialects
+    return True
+
 # Logging
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -31,6 +54,7 @@ def run_migrations_offline():
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_object=include_object,
         compare_type=True,
         compare_server_default=True,
     )
@@ -47,6 +71,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
             compare_type=True,
             compare_server_default=True,
         )
@@ -0,0 +1,77 @@
+"""add job_tombstones (deletes for GET /jobs/changes)
+
+Revision ID: 14d9721ab3bf
+Revises: d2f6a8b41e93
+Create Date: 2026-10-18 16:21:44.305918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14d9721ab3bf'
+down_revision: Union[str, Sequence[str], None] = 'd2f6a8b41e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE TRIGGER IF NOT EXISTS jobs_tombstone_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO job_tombstones (job_id, deleted_at)
+        VALUES (old.id, strftime('%Y-%m-%d %H:%M:%f000', 'now'))
+        ON CONFLICT (job_id) DO UPDATE SET deleted_at = excluded.deleted_at;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_tombstone_ai AFTER INSERT ON jobs BEGIN
+        DELETE FROM job_tombstones WHERE job_id = new.id;
+    END""",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS jobs_tombstone_ai",
+    "DROP TRIGGER IF EXISTS jobs_tombstone_ad",
+]
+
+POSTGRES_UPGRADE = [
+    """CREATE OR REPLACE FUNCTION job_tombstones_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO job_tombstones (job_id, deleted_at)
+            VALUES (OLD.id, clock_timestamp() AT TIME ZONE 'utc')
+            ON CONFLICT (job_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+        ELSE
+            DELETE FROM job_tombstones WHERE job_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER jobs_tombstone AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION job_tombstones_sync()""",
+]
+
+POSTGRES_DOWNGRADE = ["DROP FUNCTION IF EXISTS job_tombstones_sync() CASCADE"]
+
+
+def upgrade() -> None:
+    """Upgrade schema. Deletes made before this revision are not in the feed."""
+    op.create_table(
+        "job_tombstones",
+        sa.Column("job_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("job_id", name=op.f("pk_job_tombstones")),
+    )
+    op.create_index("ix_job_tombstones_deleted_at_job_id", "job_tombstones", ["deleted_at", "job_id"])
+
+    dialect = op.get_bind().dialect.name
+    for stmt in {"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE}.get(dialect, []):
+        op.execute(stmt)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for stmt in {"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE}.get(dialect, []):
+        op.execute(stmt)
+    op.drop_index("ix_job_tombstones_deleted_at_job_id", table_name="job_tombstones")
+    op.drop_table("job_tombstones")
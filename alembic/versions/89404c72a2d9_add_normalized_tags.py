@@ -0,0 +1,86 @@
+"""add normalized tags and job_tags
+
+Revision ID: 89404c72a2d9
+Revises: ed601c9517d9
+Create Date: 2026-10-17 13:41:05.772310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89404c72a2d9'
+down_revision: Union[str, Sequence[str], None] = 'ed601c9517d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH = 5000
+
+
+def _slug(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tags = op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("slug", sa.String(length=100), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_tags")),
+        sa.UniqueConstraint("slug", name=op.f("uq_tags_slug")),
+    )
+    job_tags = op.create_table(
+        "job_tags",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], name=op.f("fk_job_tags_job_id_jobs"), ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"], name=op.f("fk_job_tags_tag_id_tags"), ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id", "tag_id", name=op.f("pk_job_tags")),
+    )
+    op.create_index("ix_job_tags_tag_id_job_id", "job_tags", ["tag_id", "job_id"])
+
+    # Backfill from the comma-separated jobs.tags column, in id order and in batches
+    conn = op.get_bind()
+    jobs = sa.table("jobs", sa.column("id", sa.Integer), sa.column("tags", sa.Text))
+    tag_ids = {}  # slug -> id
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(jobs.c.id, jobs.c.tags)
+            .where(jobs.c.id > last_id, jobs.c.tags.isnot(None))
+            .order_by(jobs.c.id)
+            .limit(BATCH)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        links = []
+        for job_id, raw in rows:
+            seen = set()
+            for name in raw.split(","):
+                name = " ".join(name.split())[:100]
+                slug = _slug(name)
+                if not slug or slug in seen:
+                    continue
+                seen.add(slug)
+                if slug not in tag_ids:
+                    tag_ids[slug] = conn.execute(
+                        tags.insert().values(name=name, slug=slug)
+                    ).inserted_primary_key[0]
+                links.append({"job_id": job_id, "tag_id": tag_ids[slug]})
+        if links:
+            conn.execute(job_tags.insert(), links)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_tags_tag_id_job_id", table_name="job_tags")
+    op.drop_table("job_tags")
+    op.drop_table("tags")
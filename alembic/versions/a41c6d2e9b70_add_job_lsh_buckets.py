@@ -0,0 +1,36 @@
+"""add job_lsh_buckets (near-duplicate index)
+
+Revision ID: a41c6d2e9b70
+Revises: f028967dcc25
+Create Date: 2026-10-17 21:12:40.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6d2e9b70'
+down_revision: Union[str, Sequence[str], None] = 'f028967dcc25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema. Fill it with `python dedup.py` from backend/."""
+    op.create_table(
+        "job_lsh_buckets",
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], name=op.f("fk_job_lsh_buckets_job_id_jobs"), ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("bucket", "job_id", name=op.f("pk_job_lsh_buckets")),
+    )
+    op.create_index("ix_job_lsh_buckets_job_id", "job_lsh_buckets", ["job_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_lsh_buckets_job_id", table_name="job_lsh_buckets")
+    op.drop_table("job_lsh_buckets")
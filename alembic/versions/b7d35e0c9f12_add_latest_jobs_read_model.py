@@ -0,0 +1,116 @@
+"""add latest_jobs and job_type_counts (read model)
+
+Revision ID: b7d35e0c9f12
+Revises: a41c6d2e9b70
+Create Date: 2026-10-17 23:52:18.640117
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d35e0c9f12'
+down_revision: Union[str, Sequence[str], None] = 'a41c6d2e9b70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LATEST_JOBS_SIZE = int(os.getenv("LATEST_JOBS_SIZE", "500"))
+LATEST_COLUMNS = "id, title, company, location, posting_date, job_type, tags, source_url, created_at, updated_at"
+
+_COUNT_UPSERT = """INSERT INTO job_type_counts (job_type, n, last_updated_at)
+        VALUES (coalesce(new.job_type, ''), 1, new.updated_at)
+        ON CONFLICT (job_type) DO UPDATE SET n = n + 1, last_updated_at = CASE
+            WHEN last_updated_at IS NULL OR excluded.last_updated_at > last_updated_at
+            THEN excluded.last_updated_at ELSE last_updated_at END;"""
+
+SQLITE_UPGRADE = [
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_counts_ai AFTER INSERT ON jobs BEGIN
+        {_COUNT_UPSERT}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_counts_ad AFTER DELETE ON jobs BEGIN
+        UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(old.job_type, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_counts_au AFTER UPDATE OF job_type, updated_at ON jobs BEGIN
+        UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(old.job_type, '');
+        {_COUNT_UPSERT}
+    END""",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS jobs_counts_au",
+    "DROP TRIGGER IF EXISTS jobs_counts_ad",
+    "DROP TRIGGER IF EXISTS jobs_counts_ai",
+]
+
+POSTGRES_UPGRADE = [
+    """CREATE OR REPLACE FUNCTION job_type_counts_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(OLD.job_type, '');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO job_type_counts (job_type, n, last_updated_at)
+            VALUES (coalesce(NEW.job_type, ''), 1, NEW.updated_at)
+            ON CONFLICT (job_type) DO UPDATE SET n = job_type_counts.n + 1,
+                last_updated_at = greatest(job_type_counts.last_updated_at, EXCLUDED.last_updated_at);
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER jobs_counts AFTER INSERT OR DELETE OR UPDATE OF job_type, updated_at ON jobs
+        FOR EACH ROW EXECUTE FUNCTION job_type_counts_sync()""",
+]
+
+POSTGRES_DOWNGRADE = ["DROP FUNCTION IF EXISTS job_type_counts_sync() CASCADE"]
+
+BACKFILL = [
+    """INSERT INTO job_type_counts (job_type, n, last_updated_at)
+        SELECT coalesce(job_type, ''), count(*), max(updated_at) FROM jobs GROUP BY coalesce(job_type, '')""",
+    f"""INSERT INTO latest_jobs ({LATEST_COLUMNS})
+        SELECT {LATEST_COLUMNS} FROM jobs ORDER BY posting_date DESC NULLS LAST, id DESC LIMIT {LATEST_JOBS_SIZE}""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "latest_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("company", sa.String(length=200), nullable=False),
+        sa.Column("location", sa.String(length=200), nullable=False),
+        sa.Column("posting_date", sa.Date(), nullable=True),
+        sa.Column("job_type", sa.String(length=100), nullable=True),
+        sa.Column("tags", sa.Text(), nullable=True),
+        sa.Column("source_url", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_latest_jobs")),
+    )
+    op.create_table(
+        "job_type_counts",
+        sa.Column("job_type", sa.String(length=100), nullable=False),
+        sa.Column("n", sa.Integer(), nullable=False),
+        sa.Column("last_updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_type", name=op.f("pk_job_type_counts")),
+    )
+
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE}.get(dialect)
+    if statements is None:
+        return  # no triggers here: the app does not use the read model on this database
+    for stmt in statements + BACKFILL:
+        op.execute(stmt)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for stmt in {"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE}.get(dialect, []):
+        op.execute(stmt)
+    op.drop_table("job_type_counts")
+    op.drop_table("latest_jobs")
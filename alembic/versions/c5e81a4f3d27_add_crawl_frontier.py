@@ -0,0 +1,44 @@
+"""add crawl_frontier (scraper work queue)
+
+Revision ID: c5e81a4f3d27
+Revises: b7d35e0c9f12
+Create Date: 2026-10-18 09:41:12.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81a4f3d27'
+down_revision: Union[str, Sequence[str], None] = 'b7d35e0c9f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "crawl_frontier",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=500), nullable=False),
+        sa.Column("state", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("leased_by", sa.String(length=100), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("payload", sa.Text(), nullable=True),
+        sa.Column("discovered_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_crawl_frontier")),
+        sa.UniqueConstraint("url", name=op.f("uq_crawl_frontier_url")),
+    )
+    op.create_index("ix_crawl_frontier_state_lease", "crawl_frontier", ["state", "lease_expires_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_crawl_frontier_state_lease", table_name="crawl_frontier")
+    op.drop_table("crawl_frontier")
@@ -0,0 +1,83 @@
+"""add full-text search to jobs
+
+Revision ID: cdf9e815fdae
+Revises: eeb6b78b6f3d
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cdf9e815fdae'
+down_revision: Union[str, Sequence[str], None] = 'eeb6b78b6f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, location, job_type, tags,
+        content='jobs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, location, job_type, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.job_type, new.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, job_type, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.job_type, old.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_fts_au
+        AFTER UPDATE OF title, company, location, job_type, tags ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, job_type, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.job_type, old.tags);
+        INSERT INTO jobs_fts(rowid, title, company, location, job_type, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.job_type, new.tags);
+    END""",
+    # index the rows that already exist
+    "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS jobs_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_fts_ai",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+POSTGRES_UPGRADE = [
+    """ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(tags, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(location, '') || ' ' || coalesce(job_type, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_jobs_search_vector",
+    "ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE}.get(dialect, [])
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE}.get(dialect, [])
+    for stmt in statements:
+        op.execute(stmt)
@@ -0,0 +1,85 @@
+"""add city, country and is_remote to jobs (and latest_jobs)
+
+Revision ID: d2f6a8b41e93
+Revises: c5e81a4f3d27
+Create Date: 2026-10-18 14:05:37.912604
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a8b41e93'
+down_revision: Union[str, Sequence[str], None] = 'c5e81a4f3d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_jobs_country_city_id", ["country", "city", "id"]),
+    ("ix_jobs_city_id", ["city", "id"]),
+    ("ix_jobs_is_remote_posting_date_id", ["is_remote", "posting_date", "id"]),
+]
+FILL_BATCH = 5000
+
+# the columns this revision reads and writes, as they are at this revision
+place_tables = [
+    sa.table(name, sa.column("id", sa.Integer), sa.column("location", sa.String),
+             sa.column("city", sa.String), sa.column("country", sa.String), sa.column("is_remote", sa.Boolean))
+    for name in ("jobs", "latest_jobs")
+]
+
+
+def fill_places(conn) -> None:
+    """Resolve every row's location with the gazetteer (backend/geo.py) and write the place columns."""
+    from geo import place_columns  # alembic/env.py puts backend/ on sys.path
+
+    for table in place_tables:
+        stmt = (
+            table.update().where(table.c.id == sa.bindparam("b_id"))
+            .values(city=sa.bindparam("b_city"), country=sa.bindparam("b_country"),
+                    is_remote=sa.bindparam("b_is_remote"))
+        )
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                sa.select(table.c.id, table.c.location).where(table.c.id > last_id)
+                .order_by(table.c.id).limit(FILL_BATCH)
+            ).all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                cols = place_columns(row.location)
+                if cols["city"] or cols["country"] or cols["is_remote"]:
+                    params.append({"b_id": row.id, "b_city": cols["city"], "b_country": cols["country"],
+                                   "b_is_remote": cols["is_remote"]})
+            if params:
+                conn.execute(stmt, params)
+            last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema, then fill the new columns from location (updated_at is left alone)."""
+    for table in ("jobs", "latest_jobs"):
+        op.add_column(table, sa.Column("city", sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column("country", sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column("is_remote", sa.Boolean(), nullable=False, server_default=sa.false()))
+    for name, columns in INDEXES:
+        op.create_index(name, "jobs", columns)
+    if context.is_offline_mode():
+        op.execute("-- fill city / country / is_remote afterwards: python backend/geo.py")
+    else:
+        fill_places(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name="jobs")
+    # plain ALTER TABLE ... DROP COLUMN (SQLite >= 3.35): a batch copy of jobs would lose its triggers
+    for table in ("latest_jobs", "jobs"):
+        for column in ("is_remote", "country", "city"):
+            op.drop_column(table, column)
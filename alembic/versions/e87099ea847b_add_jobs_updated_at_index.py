@@ -0,0 +1,28 @@
+"""add jobs updated_at index
+
+Revision ID: e87099ea847b
+Revises: 89404c72a2d9
+Create Date: 2026-10-17 15:20:52.913654
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e87099ea847b'
+down_revision: Union[str, Sequence[str], None] = '89404c72a2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_jobs_updated_at_id", "jobs", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_updated_at_id", table_name="jobs")
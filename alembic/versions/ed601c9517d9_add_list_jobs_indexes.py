@@ -0,0 +1,67 @@
+"""add list_jobs filter and sort indexes
+
+Revision ID: ed601c9517d9
+Revises: cdf9e815fdae
+Create Date: 2026-10-17 11:03:27.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed601c9517d9'
+down_revision: Union[str, Sequence[str], None] = 'cdf9e815fdae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name -> columns; id is the keyset tiebreaker used by list_jobs
+BTREE_INDEXES = {
+    "ix_jobs_posting_date_id": ["posting_date", "id"],
+    "ix_jobs_title_id": ["title", "id"],
+    "ix_jobs_company_id": ["company", "id"],
+    "ix_jobs_job_type_posting_date_id": ["job_type", "posting_date", "id"],
+    "ix_jobs_job_type_title_id": ["job_type", "title", "id"],
+    "ix_jobs_job_type_company_id": ["job_type", "company", "id"],
+}
+
+# Postgres only: DESC NULLS LAST ordering and trigram indexes for ILIKE '%x%'
+POSTGRES_INDEXES = {
+    "ix_jobs_posting_date_desc_id": [sa.text("posting_date DESC NULLS LAST"), sa.text("id DESC")],
+    "ix_jobs_job_type_posting_date_desc_id": [
+        "job_type", sa.text("posting_date DESC NULLS LAST"), sa.text("id DESC"),
+    ],
+}
+TRIGRAM_INDEXES = {
+    "ix_jobs_location_trgm": "location",
+    "ix_jobs_tags_trgm": "tags",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, cols in BTREE_INDEXES.items():
+        op.create_index(name, "jobs", cols)
+
+    if op.get_bind().dialect.name == "postgresql":
+        for name, cols in POSTGRES_INDEXES.items():
+            op.create_index(name, "jobs", cols)
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, col in TRIGRAM_INDEXES.items():
+            op.create_index(
+                name, "jobs", [col],
+                postgresql_using="gin", postgresql_ops={col: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for name in list(TRIGRAM_INDEXES) + list(POSTGRES_INDEXES):
+            op.drop_index(name, table_name="jobs")
+
+    for name in BTREE_INDEXES:
+        op.drop_index(name, table_name="jobs")
@@ -0,0 +1,31 @@
+"""add content_hash and source_url index
+
+Revision ID: f028967dcc25
+Revises: e87099ea847b
+Create Date: 2026-10-17 16:48:11.305027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f028967dcc25'
+down_revision: Union[str, Sequence[str], None] = 'e87099ea847b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("jobs", sa.Column("content_hash", sa.String(length=40), nullable=True))
+    op.create_index("ix_jobs_source_url", "jobs", ["source_url"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_source_url", table_name="jobs")
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("content_hash")
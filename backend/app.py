@@ -1,12 +1,17 @@
 # backend/app.py
 import os
+import time
 from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 from urllib.parse import urlsplit, urlunsplit
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
-from db import db
-from routes.job_routes import job_bp
+from cache import response_cache
+from db import database_url, db, engine_options, import_models, pool_stats
+from instrumentation import InstrumentationMiddleware, instrumentation
+from ratelimit import rate_limiter
 
 load_dotenv()  # local .env; Vercel uses project env vars
 
@@ -47,17 +52,15 @@ def create_app():
     app = Flask(__name__)
 
     # 1) Database URL (Neon/Supabase/etc) or fallback to sqlite
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        db_file = os.path.join(base_dir, "jobs.db").replace("\\", "/")
-        db_url = f"sqlite:///{db_file}"
+    db_url = database_url()
 
     app.config["SQLALCHEMY_DATABASE_URI"] = db_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Pool sizing / recycle / pre-ping (or NullPool) from DB_* env vars
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(db_url)
 
-    # Log masked DB URL
-    print("DB =", _mask_db_url(db_url))
+    # Masked DB URL, in the debug log only (not on every cold start's stdout)
+    app.logger.debug("DB = %s", _mask_db_url(db_url))
 
     # 2) CORS
     frontend_origin = os.getenv("FRONTEND_ORIGIN", "*")
@@ -69,21 +72,53 @@ def create_app():
         }
     )
 
-    # 3) DB init
+    # 3) DB init (SQLite: WAL + busy_timeout; Postgres: statement_timeout, set on the
+    #    engine as Flask-SQLAlchemy makes it, see db.py). Nothing connects until a request.
     db.init_app(app)
     if os.getenv("DB_AUTO_CREATE") == "1":
         with app.app_context():
+            import_models()
             db.create_all()
 
-    # 4) Register routes at '/jobs' (no '/api' inside Flask)
+    # 4) Response cache for the read endpoints (in-process LRU, or Redis via CACHE_URL; identical
+    #    concurrent misses share one render), behind a per-client token bucket (429 + Retry-After)
+    rate_limiter.init_app(app)
+    response_cache.init_app(app)
+
+    # 5) Opt-in request timing, SQL stats, Server-Timing and /metrics (METRICS_ENABLED=1)
+    instrumentation.init_app(app)
+
+    # 6) Register routes at '/jobs' (no '/api' inside Flask). Imported here, not at
+    #    module level, so tools that only need db.py / the models skip the route stack.
+    from routes.job_routes import job_bp
+    from suggest import suggest_index
+
     app.register_blueprint(job_bp, url_prefix="")
+    # in-memory autocomplete index; the first /jobs/suggest starts building it
+    suggest_index.init_app(app, db)
 
-    # 5) Health check (Vercel will expose it at /api/health)
+    # 7) Health check (Vercel will expose it at /api/health)
     @app.get("/health")
     def health():
         return jsonify(status="ok"), 200
 
-    # 6) Middleware to support '/api/*' paths seamlessly
+    @app.get("/health/cache")
+    def health_cache():
+        return jsonify(status="ok", cache=response_cache.stats(), rate_limit=rate_limiter.stats()), 200
+
+    @app.get("/health/db")
+    def health_db():
+        started = time.perf_counter()
+        try:
+            db.session.execute(text("SELECT 1"))
+        except SQLAlchemyError as e:
+            return jsonify(status="error", error=str(getattr(e, "orig", e)), pool=pool_stats(db.engine)), 503
+        latency_ms = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify(status="ok", latency_ms=latency_ms, pool=pool_stats(db.engine)), 200
+
+    # 8) Middleware: request timing (when enabled) inside '/api/*' prefix stripping
+    if instrumentation.enabled:
+        app.wsgi_app = InstrumentationMiddleware(app.wsgi_app, instrumentation)
     app.wsgi_app = StripAPIPrefixMiddleware(app.wsgi_app)
 
     return app
@@ -0,0 +1,165 @@
+# backend/asgi.py
+"""
+Optional async, read-only API for high-concurrency listing.
+
+Serves GET /jobs, /jobs/<id> and /health (also under /api) on SQLAlchemy's
+async engine, so one process can keep thousands of client connections open
+while queries wait on the database. Queries and JSON come from the same
+code as the Flask routes (listing.py, serializers.py); writes, facets and
+export stay on the Flask app.
+
+    pip install -r requirements-async.txt
+    uvicorn asgi:app --port 8001          # from backend/
+
+Env: the same DATABASE_URL (the driver is swapped for aiosqlite / asyncpg;
+set ASYNC_DATABASE_URL to choose it yourself), DB_* pool settings and
+FRONTEND_ORIGIN as the Flask app. No response cache here.
+"""
+import asyncio
+import os
+from urllib.parse import parse_qsl
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db import configure_connections, database_url, engine_options
+from listing import InvalidListArgs, job_list_body, plan_job_list
+from models.job import Job
+from read_model import detect_read_model
+from search import detect_search_backend
+from serializers import JOB_FIELDS, dumps, job_columns, rows_to_dicts
+
+load_dotenv()
+
+# sync driver -> async driver
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+asyncpg",
+}
+
+
+def async_database_url() -> str:
+    url = os.getenv("ASYNC_DATABASE_URL")
+    if url:
+        return url
+    url = database_url()
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+class NotFound(Exception):
+    pass
+
+
+class ReadAPI:
+    """A minimal ASGI app: three GET routes, JSON in and out."""
+
+    def __init__(self, url: str | None = None):
+        self.url = url or async_database_url()
+        self.engine = None
+        self.search = None  # full-text backend, probed once at startup
+        self.latest = False  # latest_jobs read model present
+        self.cors_origin = os.getenv("FRONTEND_ORIGIN", "*")
+        self._started = asyncio.Lock()
+
+    async def startup(self):
+        async with self._started:
+            if self.engine is not None:
+                return
+            engine = create_async_engine(self.url, **engine_options(self.url))
+            configure_connections(engine.sync_engine)
+            async with engine.connect() as conn:
+                self.search = await conn.run_sync(lambda c: detect_search_backend(c, c.dialect.name))
+                self.latest = await conn.run_sync(detect_read_model)
+            self.engine = engine
+
+    async def shutdown(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"]
+        if path == "/api" or path.startswith("/api/"):
+            path = path[4:] or "/"
+        path = path.rstrip("/") or "/"
+
+        if scope["method"] not in ("GET", "HEAD"):
+            status, body = 405, {"error": "read-only API: use the Flask app for writes"}
+        else:
+            try:
+                if self.engine is None:
+                    await self.startup()  # servers without lifespan support
+                status, body = await self._route(path, scope)
+            except NotFound as e:
+                status, body = 404, {"error": str(e)}
+            except InvalidListArgs as e:
+                status, body = 400, {"error": str(e)}
+
+        payload = dumps(body)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                (b"access-control-allow-origin", self.cors_origin.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else payload})
+
+    async def _route(self, path, scope):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/jobs":
+            args = dict(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)[::-1])
+            return 200, await self.list_jobs(args)
+        if path.startswith("/jobs/") and path[6:].isdigit():
+            return 200, await self.get_job(int(path[6:]))
+        raise NotFound("Not found")
+
+    async def list_jobs(self, args) -> dict:
+        """Same SQL and body as the Flask list_jobs."""
+        plan = plan_job_list(args, search=self.search, latest=self.latest)
+        async with self.engine.connect() as conn:
+            total = await conn.scalar(plan.count_query) if plan.count_query is not None else None
+            rows = (await conn.execute(plan.query)).all()
+            if not plan.complete(rows, total):
+                plan = plan.fallback
+                rows = (await conn.execute(plan.query)).all()
+        return job_list_body(plan, rows, total)
+
+    async def get_job(self, job_id: int) -> dict:
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(select(*job_columns(JOB_FIELDS)).where(Job.id == job_id))).all()
+        if not rows:
+            raise NotFound("Job not found")
+        return {"job": rows_to_dicts(rows, JOB_FIELDS)[0]}
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = ReadAPI()
@@ -0,0 +1,291 @@
+# backend/cache.py
+"""
+Response cache for the read endpoints.
+
+Entries are keyed on the path plus the normalized query string, so
+`?sort=posting_date_desc&page=1` and `?page=1&sort=posting_date_desc&q=`
+share one entry. The default backend is an in-process LRU with a TTL;
+set CACHE_URL=redis://... (and install `redis`) to share entries between
+workers and let the scraper's invalidations reach the web processes.
+
+Misses are single-flight: while one request renders a key, identical
+requests in the same process wait for it and get a copy of its response
+instead of running the same queries (also with the cache disabled). A write
+in this process starts a new flight, so a request that comes in after a
+write never gets a response rendered before it.
+
+Env:
+  CACHE_TTL            seconds an entry lives (default 30, 0 disables caching)
+  CACHE_MAX_ENTRIES    LRU size (default 512)
+  CACHE_URL            optional redis:// URL for the shared backend
+  CACHE_COALESCE       0 turns single-flight off (default 1)
+  CACHE_COALESCE_WAIT  seconds a request waits for another's render before running its own (default 10)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import make_response, request
+
+# query values that mean "no filter" and must not split the cache
+_EMPTY_VALUES = {"job_type": {"All"}}
+
+
+def normalize_query(args) -> str:
+    """Sorted query string without empty / no-op parameters."""
+    items = []
+    for key in sorted(args.keys()):
+        for value in sorted(args.getlist(key)):
+            if value == "" or value in _EMPTY_VALUES.get(key, ()):
+                continue
+            items.append((key, value))
+    return urlencode(items)
+
+
+class LRUBackend:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """
+    Shared backend. clear() bumps a generation counter instead of scanning
+    keys; entries from older generations simply expire.
+    """
+
+    def __init__(self, url: str, prefix: str = "jobs-cache"):
+        import redis  # optional dependency
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0
+
+    def _key(self, key):
+        gen = int(self.client.get(f"{self.prefix}:gen") or 0)
+        return f"{self.prefix}:{gen}:{key}"
+
+    def get(self, key):
+        raw = self.client.get(self._key(key))
+        return json.loads(raw) if raw else None
+
+    def set(self, key, value, ttl: float):
+        self.client.set(self._key(key), json.dumps(value), ex=max(1, int(ttl)))
+
+    def clear(self):
+        self.client.incr(f"{self.prefix}:gen")
+
+    def __len__(self):
+        return 0  # not tracked for the shared backend
+
+
+class _Flight:
+    __slots__ = ("done", "result", "ok")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.ok = False
+
+
+class SingleFlight:
+    """
+    At most one call per key at a time: callers that arrive while a call for
+    their key runs wait for it and share its result. If it fails (or takes
+    longer than `wait` seconds) they make their own call.
+    """
+
+    def __init__(self, wait: float = 10.0):
+        self.wait = wait
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        """(fn()'s result, whether it came from another caller's call)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            if flight.done.wait(self.wait) and flight.ok:
+                self.shared += 1
+                return flight.result, True
+            return fn(), False
+        try:
+            flight.result = fn()
+            flight.ok = True
+            return flight.result, False
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def __len__(self):
+        return len(self._flights)
+
+
+def _entry(resp) -> dict:
+    """What is kept of a response: body, status and the headers that describe the body."""
+    headers = {k: v for k, v in resp.headers.items()
+               if k in ("Content-Type", "ETag", "Last-Modified", "Cache-Control")}
+    return {"body": resp.get_data(as_text=True), "status": resp.status_code, "headers": headers}
+
+
+class ResponseCache:
+    def __init__(self):
+        self.backend = LRUBackend()
+        self.ttl = 30.0
+        self.flights = SingleFlight()
+        self.coalesce = True
+        self.hits = self.misses = self.invalidations = 0
+        self.generation = 0  # bumped by every invalidate(); part of the single-flight key
+        self.last_write = None  # last invalidation in this process (UTC)
+
+    def init_app(self, app):
+        self.configure(app.logger)
+        app.extensions["response_cache"] = self
+
+    def configure(self, logger=None):
+        """Settings from the environment; without a Flask app (scraper, CLIs) only invalidate() matters."""
+        self.ttl = float(os.getenv("CACHE_TTL", "30"))
+        max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+        url = os.getenv("CACHE_URL")
+        self.coalesce = os.getenv("CACHE_COALESCE", "1") != "0"
+        self.flights = SingleFlight(float(os.getenv("CACHE_COALESCE_WAIT", "10")))
+        self.backend = LRUBackend(max_entries)
+        if url:
+            try:
+                self.backend = RedisBackend(url)
+            except ImportError:
+                (logger or logging.getLogger(__name__)).warning(
+                    "CACHE_URL is set but `redis` is not installed; using the in-process cache")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def invalidate(self):
+        """Drop every cached response (call after any write to jobs)."""
+        self.backend.clear()
+        self.generation += 1
+        self.invalidations += 1
+        self.last_write = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl": self.ttl,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.backend.evictions,
+            "invalidations": self.invalidations,
+            "coalesced": self.flights.shared,
+            "in_flight": len(self.flights),
+        }
+
+    def cached(self, last_modified=None):
+        """
+        Cache a GET view's 200 responses. `last_modified` is an optional callable
+        returning the data's last change time, sent as Last-Modified on misses.
+        Responses get an ETag and answer If-None-Match / If-Modified-Since with 304.
+        Concurrent misses on one key share a single render (see SingleFlight).
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not (self.enabled or self.coalesce):
+                    resp = self._finish(make_response(view(*args, **kwargs)), last_modified)
+                    return resp.make_conditional(request)
+
+                key = f"{request.path}?{normalize_query(request.args)}"
+                if self.enabled:
+                    entry = self.backend.get(key)
+                    if entry is not None:
+                        self.hits += 1
+                        resp = make_response(entry["body"], entry["status"], entry["headers"])
+                        resp.headers["X-Cache"] = "HIT"
+                        return resp.make_conditional(request)
+                    self.misses += 1
+                generation = self.generation
+
+                def render():
+                    resp = self._finish(make_response(view(*args, **kwargs)), last_modified)
+                    entry = _entry(resp)
+                    # a write during the render may not be in it: don't keep it
+                    if self.enabled and resp.status_code == 200 and generation == self.generation:
+                        self.backend.set(key, entry, self.ttl)
+                    return resp, entry
+
+                if self.coalesce:
+                    (resp, entry), shared = self.flights.do((generation, key), render)
+                else:
+                    (resp, entry), shared = render(), False
+                if shared:
+                    # the response object belongs to the other request: build our own
+                    resp = make_response(entry["body"], entry["status"], entry["headers"])
+                    resp.headers["X-Cache"] = "COALESCED"
+                else:
+                    resp.headers["X-Cache"] = "MISS"
+                return resp.make_conditional(request)
+            return wrapper
+        return decorator
+
+    def _finish(self, resp, last_modified):
+        if resp.status_code != 200:
+            return resp
+        if "ETag" not in resp.headers:
+            resp.add_etag()
+        if last_modified is not None:
+            stamp = last_modified()
+            if stamp is not None and stamp.tzinfo is None:
+                stamp = stamp.replace(tzinfo=timezone.utc)
+            # deletes don't move max(updated_at), so also count our own writes
+            stamps = [s for s in (stamp, self.last_write) if s is not None]
+            if stamps:
+                resp.last_modified = max(stamps)
+        return resp
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,240 @@
+# backend/changes.py
+"""
+Change feed for GET /jobs/changes: jobs inserted, updated or deleted since
+a token, so clients and mirrors sync incrementally instead of re-reading
+the list.
+
+- Inserts and updates come from jobs.updated_at (index ix_jobs_updated_at_id).
+  A job appears once, in its current state, however often it changed.
+- Deletes come from job_tombstones. Triggers on jobs write a tombstone for
+  every deleted row (API, dedup merges, manual SQL) and clear it when the id
+  is inserted again.
+- The feed is one stream ordered by (time, upsert before delete, id). The
+  token holds the last position sent. Only changes older than
+  CHANGES_SETTLE_SECONDS (default 5) are served, so rows written by
+  transactions that were still open, or by writers whose clocks are a little
+  behind, are not skipped.
+- Tombstones older than CHANGES_RETENTION_DAYS (default 30) are pruned. A
+  token that old may have missed deletes, so it is refused (410) and the
+  client has to resync.
+
+    python changes.py           # prune old tombstones
+"""
+import base64
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import DDL, and_, delete, event, inspect, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import db
+from models.job import Job
+
+SETTLE = timedelta(seconds=float(os.getenv("CHANGES_SETTLE_SECONDS", "5")))
+RETENTION = timedelta(days=float(os.getenv("CHANGES_RETENTION_DAYS", "30")))
+MAX_LIMIT = 1000
+PRUNE_EVERY = 3600  # seconds between prunes per process
+
+UPSERT, DELETE = 0, 1  # order of the two kinds at the same instant
+
+job_tombstones = db.Table(
+    "job_tombstones",
+    db.Column("job_id", db.Integer, primary_key=True, autoincrement=False),  # jobs.id, no FK: the row is gone
+    db.Column("deleted_at", db.DateTime, nullable=False),
+    db.Index("ix_job_tombstones_deleted_at_job_id", "deleted_at", "job_id"),
+)
+# the triggers below live on jobs: create it first, drop it last
+job_tombstones.add_is_dependent_on(Job.__table__)
+
+# same text format SQLAlchemy stores SQLite DateTimes in (microseconds); %% because DDL() %-formats
+SQLITE_TOMBSTONE_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS jobs_tombstone_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO job_tombstones (job_id, deleted_at)
+        VALUES (old.id, strftime('%%Y-%%m-%%d %%H:%%M:%%f000', 'now'))
+        ON CONFLICT (job_id) DO UPDATE SET deleted_at = excluded.deleted_at;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_tombstone_ai AFTER INSERT ON jobs BEGIN
+        DELETE FROM job_tombstones WHERE job_id = new.id;
+    END""",
+]
+SQLITE_TOMBSTONE_DROP = ["DROP TRIGGER IF EXISTS jobs_tombstone_ai", "DROP TRIGGER IF EXISTS jobs_tombstone_ad"]
+
+POSTGRES_TOMBSTONE_DDL = [
+    """CREATE OR REPLACE FUNCTION job_tombstones_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO job_tombstones (job_id, deleted_at)
+            VALUES (OLD.id, clock_timestamp() AT TIME ZONE 'utc')
+            ON CONFLICT (job_id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+        ELSE
+            DELETE FROM job_tombstones WHERE job_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER jobs_tombstone AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION job_tombstones_sync()""",
+]
+POSTGRES_TOMBSTONE_DROP = ["DROP FUNCTION IF EXISTS job_tombstones_sync() CASCADE"]
+
+for _dialect, _create, _drop in (("sqlite", SQLITE_TOMBSTONE_DDL, SQLITE_TOMBSTONE_DROP),
+                                 ("postgresql", POSTGRES_TOMBSTONE_DDL, POSTGRES_TOMBSTONE_DROP)):
+    for _stmt in _create:
+        event.listen(job_tombstones, "after_create", DDL(_stmt).execute_if(dialect=_dialect))
+    for _stmt in _drop:
+        event.listen(job_tombstones, "before_drop", DDL(_stmt).execute_if(dialect=_dialect))
+
+
+# engine url -> bool
+_available_cache = {}
+
+
+def feed_available(session) -> bool:
+    """Whether the current database has job_tombstones and its triggers (SQLite / Postgres; cached per engine)."""
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key not in _available_cache:
+        _available_cache[key] = (bind.dialect.name in ("sqlite", "postgresql")
+                                 and inspect(session.connection()).has_table("job_tombstones"))
+    return _available_cache[key]
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class ExpiredToken(ValueError):
+    """The token is older than the tombstone retention: resync from scratch."""
+
+
+@dataclass(frozen=True)
+class Position:
+    at: datetime | None  # None = before everything
+    kind: int = UPSERT
+    id: int = 0
+    # when this client started from nothing; deletes before it cannot concern it
+    start: datetime | None = None
+
+    def encode(self) -> str:
+        payload = {"t": self.at.isoformat() if self.at else None, "k": self.kind, "i": self.id,
+                   "s": self.start.isoformat() if self.start else None}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def horizon() -> datetime:
+    """Newest instant the feed serves (changes after it may still be committing)."""
+    return datetime.utcnow() - SETTLE
+
+
+def parse_since(since: str | None) -> Position:
+    """
+    `since` -> Position: missing / empty = from the beginning (full sync),
+    "now" = from the current horizon on, else a token from a previous response.
+    """
+    if not since:
+        return Position(None, start=horizon())
+    if since == "now":
+        now = horizon()
+        return Position(now, DELETE, 0, start=now)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(since + "=" * (-len(since) % 4)))
+        at = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        start = datetime.fromisoformat(payload["s"]) if payload.get("s") else None
+        position = Position(at, int(payload["k"]), int(payload["i"]), start)
+    except (ValueError, TypeError, KeyError):
+        raise InvalidToken("since is not a token returned by this feed")
+    # deletes after max(at, start) must still be there
+    covered_from = max(d for d in (position.at, position.start, datetime.min) if d is not None)
+    if covered_from < datetime.utcnow() - RETENTION:
+        raise ExpiredToken("since is older than the change retention: reload the full list")
+    return position
+
+
+def _after(position: Position, kind: int, time_col, id_col):
+    """Rows of `kind` that come after `position` in (time, kind, id) order."""
+    if position.at is None:
+        return time_col.isnot(None)
+    if kind > position.kind:
+        return time_col >= position.at
+    if kind < position.kind:
+        return time_col > position.at
+    return or_(time_col > position.at, and_(time_col == position.at, id_col > position.id))
+
+
+def read_changes(session, position: Position, limit: int, columns):
+    """
+    Up to `limit` changes after `position`, oldest first, as
+    (kind, time, id, row); row is the selected `columns` for upserts, None for
+    deletes. Returns (changes, next position, more waiting?).
+    """
+    until = horizon()
+    upserts = session.execute(
+        select(Job.updated_at, Job.id, *columns)
+        .where(_after(position, UPSERT, Job.updated_at, Job.id), Job.updated_at <= until)
+        .order_by(Job.updated_at, Job.id).limit(limit + 1)
+    ).all()
+    t = job_tombstones.c
+    deleted = [_after(position, DELETE, t.deleted_at, t.job_id), t.deleted_at <= until]
+    if position.start is not None:
+        # gone before this client's first read: it never saw the job
+        deleted.append(t.deleted_at > position.start)
+    deletes = session.execute(
+        select(t.deleted_at, t.job_id).where(*deleted)
+        .order_by(t.deleted_at, t.job_id).limit(limit + 1)
+    ).all()
+
+    merged = sorted(
+        [(r[0], UPSERT, r[1], tuple(r[2:])) for r in upserts] + [(r[0], DELETE, r[1], None) for r in deletes],
+        key=lambda c: c[:3],
+    )
+    more = len(merged) > limit
+    merged = merged[:limit]
+    if merged:
+        at, kind, id_, _row = merged[-1]
+        position = Position(at, kind, id_, position.start)
+    elif position.at is None or position.at < until:
+        # nothing new: move up to the horizon so the next poll starts there
+        position = Position(until, DELETE, 0, position.start)
+    return [(kind, at, id_, row) for at, kind, id_, row in merged], position, more
+
+
+def prune(conn, before: datetime | None = None) -> int:
+    """Delete tombstones older than the retention (session or connection). Does not commit."""
+    before = before or datetime.utcnow() - RETENTION
+    return conn.execute(delete(job_tombstones).where(job_tombstones.c.deleted_at < before)).rowcount
+
+
+_prune_lock = threading.Lock()
+_pruned_at = 0.0
+
+
+def maybe_prune(engine, logger):
+    """prune() at most every PRUNE_EVERY seconds per process; meant to run after a response went out."""
+    global _pruned_at
+    if time.monotonic() - _pruned_at < PRUNE_EVERY or not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        _pruned_at = time.monotonic()
+        with engine.begin() as conn:
+            prune(conn)
+    except SQLAlchemyError as e:
+        logger.warning("tombstone prune failed: %s", getattr(e, "orig", e))
+    finally:
+        _prune_lock.release()
+
+
+def main():
+    from db import SessionFactory
+
+    with SessionFactory()() as session:
+        n = prune(session)
+        session.commit()
+    print(f"pruned {n} tombstones older than {RETENTION.days} days")
+
+
+if __name__ == "__main__":
+    main()
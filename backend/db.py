@@ -1,5 +1,9 @@
+import os
+
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Naming convention to support migrations later if needed
 metadata = MetaData(naming_convention={
@@ -10,9 +14,177 @@ metadata = MetaData(naming_convention={
     "pk": "pk_%(table_name)s"
 })
 
-db = SQLAlchemy(metadata=metadata)
+
+
+class _SQLAlchemy(SQLAlchemy):
+    """SQLAlchemy that applies configure_connections to every engine it makes."""
+
+    def _make_engine(self, bind_key, options, app):
+        # Flask-SQLAlchemy makes the engines in init_app (no connection is opened);
+        # hooking them here spares create_app an app context just to reach db.engine
+        engine = super()._make_engine(bind_key, options, app)
+        configure_connections(engine)
+        return engine
+
+
+db = _SQLAlchemy(metadata=metadata)
+
+def import_models():
+    """Import every module that puts tables or DDL on db.metadata (before create_all / autogenerate)."""
+    import changes, frontier, models.job, models.tag, read_model, search  # noqa: F401
+
+
+def dialect_insert(dialect: str):
+    """
+    The INSERT construct with ON CONFLICT for `dialect` ("sqlite" or
+    "postgresql"), else None. Imported here on first use: importing the
+    Postgres dialect takes ~70 ms, wasted on every SQLite start.
+    """
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
 
 def init_db(app):
     db.init_app(app)
     with app.app_context():
+        import_models()
         db.create_all()
+
+
+def database_url() -> str:
+    """DATABASE_URL (Neon/Supabase/etc), or the SQLite file jobs.db at the repo root."""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    return "sqlite:///" + os.path.join(base_dir, "jobs.db").replace("\\", "/")
+
+
+class SessionFactory:
+    """
+    Sessions on a plain engine, without a Flask app: for the scraper, the CLIs
+    and Alembic, which only need the database. The engine (same pool options
+    and per-connection settings as the app's) is created on first use.
+
+        Session = SessionFactory()
+        with Session() as sess:
+            ...
+    """
+
+    def __init__(self, url: str | None = None):
+        if url is None:
+            from dotenv import load_dotenv
+
+            load_dotenv()  # app.py does this on import; standalone tools don't import it
+        self.url = url or database_url()
+        self._engine = None
+        self._sessionmaker = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = create_engine(self.url, **engine_options(self.url))
+            configure_connections(self._engine)
+        return self._engine
+
+    def __call__(self, **kw):
+        if self._sessionmaker is None:
+            self._sessionmaker = sessionmaker(self.engine)
+        return self._sessionmaker(**kw)
+
+    def dispose(self):
+        if self._engine is not None:
+            self._engine.dispose()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    val = os.getenv(name)
+    if val is None or val == "":
+        return default
+    return val.lower() not in ("0", "false", "no", "off")
+
+
+def engine_options(db_url: str) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS from the environment.
+
+    Env (server databases; ignored for SQLite):
+      DB_POOL_SIZE        persistent connections per process (default 5)
+      DB_MAX_OVERFLOW     extra connections under load (default 10)
+      DB_POOL_TIMEOUT     seconds to wait for a free connection (default 30)
+      DB_POOL_RECYCLE     reconnect connections older than this, in seconds (default 300;
+                          Neon and most proxies drop idle connections after a few minutes)
+      DB_POOL_PRE_PING    test a connection before handing it out (default 1)
+      DB_NULLPOOL         1 = no client-side pool: open/close per checkout, for PgBouncer
+                          or a serverless pooler in front of the database (default 0)
+    """
+    if db_url.startswith("sqlite"):
+        return {}
+    options = {"pool_pre_ping": _env_flag("DB_POOL_PRE_PING", True)}
+    if _env_flag("DB_NULLPOOL", False):
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 300),
+    )
+    return options
+
+
+def configure_connections(engine):
+    """
+    Per-connection (SQLite) and per-transaction (Postgres) settings.
+
+    Env:
+      DB_STATEMENT_TIMEOUT_MS  Postgres statement_timeout (default 0 = off); sent as
+                               SET LOCAL when each transaction begins, so it also holds
+                               through transaction-mode poolers (PgBouncer, Neon)
+      DB_BUSY_TIMEOUT_MS       SQLite busy_timeout (default 5000)
+    SQLite connections also switch to WAL so readers don't block the scraper's writes.
+    """
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        busy_ms = _env_int("DB_BUSY_TIMEOUT_MS", 5000)
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute(f"PRAGMA busy_timeout={busy_ms}")
+            cur.execute("PRAGMA synchronous=NORMAL")  # safe with WAL, fewer fsyncs
+            cur.close()
+
+    elif dialect == "postgresql":
+        timeout_ms = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+        if timeout_ms > 0:
+            # not a session-level SET on connect: a transaction-mode pooler hands each
+            # transaction to whichever server connection is free, which never saw it
+            @event.listens_for(engine, "begin")
+            def _pg_statement_timeout(conn):
+                conn.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def pool_stats(engine) -> dict:
+    """Pool counters for /health/db (QueuePool exposes the most; NullPool almost nothing)."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[name] = fn()
+    return stats
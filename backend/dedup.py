@@ -0,0 +1,327 @@
+# backend/dedup.py
+"""
+Near-duplicate detection for jobs: reposts that differ only in spelling
+("Sr. Pricing Actuary" / "Senior Pricing Actuary"), company suffixes
+("Aviva plc" / "Aviva") or location detail ("London, UK" / "London").
+
+Titles, companies and locations are normalized first. Each job then gets a
+MinHash signature over its title words/word pairs plus its company, cut into
+LSH bands; every band hash is stored in job_lsh_buckets. Looking a job up is
+one indexed IN (...) over its band hashes, and only the few jobs sharing a
+band are compared exactly: same company, one location contained in the other
+and title Jaccard >= DEDUP_THRESHOLD (default 0.75). Jobs whose normalized
+title and company are identical always share every band.
+
+    python dedup.py                 # rebuild job_lsh_buckets, report duplicate groups
+    python dedup.py --merge         # ... and fold each duplicate into its oldest match
+
+Env: DEDUP_THRESHOLD, DEDUP_MAX_BUCKET (jobs per band hash considered, oldest first; default 100).
+"""
+import hashlib
+import os
+import re
+import struct
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import delete, insert, select, text
+
+from models.job import Job, content_hash, job_lsh_buckets
+from models.tag import clean_tag_names
+from read_model import refresh_latest
+
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.75"))
+MAX_BUCKET = int(os.getenv("DEDUP_MAX_BUCKET", "100"))
+LOAD_BATCH = 5000
+
+# 8 bands x 4 rows: pairs with Jaccard ~0.6 collide half the time, 0.75+ almost always
+BANDS, ROWS = 8, 4
+_LANES = struct.Struct(f"<{BANDS * ROWS}H")
+
+TITLE_ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "jnr": "junior",
+    "mgr": "manager", "mngr": "manager", "assoc": "associate", "asst": "assistant",
+    "dir": "director", "vp": "vice president", "svp": "senior vice president",
+    "avp": "assistant vice president", "exec": "executive", "spec": "specialist",
+    "&": "and",
+}
+COMPANY_SUFFIXES = {"inc", "incorporated", "ltd", "limited", "llc", "llp", "plc", "corp",
+                    "corporation", "co", "company", "gmbh", "ag", "sa", "nv", "se", "the"}
+COUNTRY_ALIASES = {
+    "uk": "united kingdom", "u k": "united kingdom", "gb": "united kingdom", "great britain": "united kingdom",
+    "us": "united states", "u s": "united states", "usa": "united states", "u s a": "united states",
+    "united states of america": "united states", "uae": "united arab emirates",
+}
+_WORD_RE = re.compile(r"[a-z0-9]+|&")
+
+
+def _words(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return _WORD_RE.findall(text.replace("'", ""))
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(TITLE_ABBREVIATIONS.get(w, w) for w in _words(title))
+
+
+def normalize_company(company: str) -> str:
+    words = [w for w in _words(company) if w != "&"]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    if len(words) > 1 and words[0] == "the":
+        words.pop(0)
+    return " ".join(words)
+
+
+def normalize_location(location: str) -> frozenset:
+    """Set of normalized comma-separated parts ("London, UK" -> {"london", "united kingdom"})."""
+    parts = (" ".join(_words(p)) for p in (location or "").split(","))
+    return frozenset(COUNTRY_ALIASES.get(p, p) for p in parts if p)
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """A job's raw key, its normalized forms and its LSH band hashes."""
+    key: tuple  # (title, company, location) as stored
+    company: str
+    title_shingles: frozenset
+    location: frozenset
+    buckets: tuple
+
+
+@lru_cache(maxsize=65536)
+def fingerprint(title: str, company: str, location: str) -> Fingerprint:
+    words = normalize_title(title).split()
+    shingles = frozenset(words) | frozenset(" ".join(p) for p in zip(words, words[1:]))
+    company_key = normalize_company(company)
+
+    # MinHash: each 16-bit lane of a shingle's blake2b digest is one hash function
+    lanes = [
+        _LANES.unpack(hashlib.blake2b(s.encode(), digest_size=_LANES.size).digest())
+        for s in shingles | {"@" + company_key}
+    ]
+    signature = list(map(min, *lanes)) if len(lanes) > 1 else list(lanes[0])
+    buckets = tuple(
+        _hash64(f"{band}:" + ",".join(map(str, signature[band * ROWS:(band + 1) * ROWS])))
+        for band in range(BANDS)
+    )
+    return Fingerprint((title, company, location), company_key, shingles, normalize_location(location), buckets)
+
+
+def is_duplicate(a: Fingerprint, b: Fingerprint, threshold: float = THRESHOLD) -> bool:
+    if a.company != b.company or not (a.location <= b.location or b.location <= a.location):
+        return False
+    union = len(a.title_shingles | b.title_shingles)
+    return union == 0 or len(a.title_shingles & b.title_shingles) / union >= threshold
+
+
+@lru_cache(maxsize=None)
+def _bucket_members_sql(n: int):
+    # plain SQL: building n Core subqueries per call costs more than running them
+    return text(" UNION ALL ".join(
+        f"SELECT * FROM (SELECT bucket, job_id FROM job_lsh_buckets WHERE bucket = :b{i} "
+        f"ORDER BY job_id LIMIT :limit) AS m{i}"
+        for i in range(n)
+    ))
+
+
+def _bucket_members(session, buckets) -> dict:
+    """
+    bucket -> the ids of its oldest MAX_BUCKET jobs. One LIMITed index range per
+    bucket (UNION ALL, 500 per statement), so crowded buckets cost no more than
+    MAX_BUCKET rows each.
+    """
+    buckets, members = list(buckets), defaultdict(list)
+    for start in range(0, len(buckets), 500):
+        chunk = buckets[start:start + 500]
+        params = {f"b{i}": bucket for i, bucket in enumerate(chunk)}
+        for bucket, job_id in session.execute(_bucket_members_sql(len(chunk)), {**params, "limit": MAX_BUCKET}):
+            members[bucket].append(job_id)
+    return members
+
+
+def find_duplicates(session, fingerprints, ids=None) -> list:
+    """
+    For each fingerprint, the (id, title, company, location) of the stored job it
+    duplicates, or None. A stored job with the very same key wins, then the oldest
+    match. With `ids` (the records' own ids) only older jobs count.
+    """
+    members = _bucket_members(session, {b for fp in fingerprints for b in fp.buckets})
+    ids_needed = list({job_id for bucket_ids in members.values() for job_id in bucket_ids})
+    stored = {}
+    for start in range(0, len(ids_needed), LOAD_BATCH):
+        for job_id, title, company, location in session.execute(
+            select(Job.id, Job.title, Job.company, Job.location).where(Job.id.in_(ids_needed[start:start + LOAD_BATCH]))
+        ):
+            stored[job_id] = fingerprint(title, company, location)
+
+    out = []
+    for n, fp in enumerate(fingerprints):
+        own_id = ids[n] if ids is not None else None
+        candidates = sorted(
+            {job_id for bucket in fp.buckets for job_id in members.get(bucket, ())
+             if job_id in stored and (own_id is None or job_id < own_id)},
+            key=lambda job_id: (stored[job_id].key != fp.key, job_id),
+        )
+        match = next((job_id for job_id in candidates if is_duplicate(fp, stored[job_id])), None)
+        out.append(None if match is None else (match, *stored[match].key))
+    return out
+
+
+def canonicalize(session, records) -> tuple[list[dict], list[bool]]:
+    """
+    Give every near-duplicate record (dicts with title/company/location) the key of
+    the job it duplicates, stored or earlier in `records`, so an upsert on the key
+    lands on that row. Returns (new records, whether each one was re-keyed); a
+    re-keyed record is to be combined with merge_values, not written over its target.
+    """
+    fingerprints = [fingerprint(r["title"], r["company"], r["location"]) for r in records]
+    matches = find_duplicates(session, fingerprints)
+
+    seen = defaultdict(list)  # bucket -> fingerprints already in this batch
+    out, rekeyed = [], []
+    for record, fp, match in zip(records, fingerprints, matches):
+        target = match[1:] if match is not None else None
+        if target is None:
+            target = next(
+                (other.key for bucket in fp.buckets for other in seen[bucket] if is_duplicate(fp, other)), None)
+        moved = target is not None and target != fp.key
+        if moved:
+            record = {**record, "title": target[0], "company": target[1], "location": target[2]}
+            fp = fingerprint(*target)
+        for bucket in fp.buckets:
+            seen[bucket].append(fp)
+        out.append(record)
+        rekeyed.append(moved)
+    return out, rekeyed
+
+
+def merge_values(kept: dict, dup: dict) -> dict:
+    """
+    `kept` with the near-duplicate `dup` folded in, by the same rules as --merge:
+    tags are united, the newest posting_date wins, job_type / source_url already
+    set are kept.
+    """
+    posting_dates = [d for d in (kept.get("posting_date"), dup.get("posting_date")) if d is not None]
+    return {
+        **kept,
+        "tags": clean_tag_names(clean_tag_names(kept.get("tags")) + clean_tag_names(dup.get("tags"))),
+        "posting_date": max(posting_dates) if posting_dates else None,
+        "job_type": kept.get("job_type") or dup.get("job_type"),
+        "source_url": kept.get("source_url") or dup.get("source_url"),
+    }
+
+
+def index_jobs(session, jobs):
+    """(Re)write the band hashes of `jobs`: (id, title, company, location) tuples or Job rows."""
+    jobs = [(j.id, j.title, j.company, j.location) if isinstance(j, Job) else tuple(j) for j in jobs]
+    if not jobs:
+        return
+    unindex_jobs(session, [j[0] for j in jobs])
+    session.execute(insert(job_lsh_buckets), [
+        {"bucket": bucket, "job_id": job_id}
+        for job_id, *key in jobs
+        for bucket in set(fingerprint(*key).buckets)
+    ])
+
+
+def unindex_jobs(session, job_ids):
+    session.execute(delete(job_lsh_buckets).where(job_lsh_buckets.c.job_id.in_(list(job_ids))))
+
+
+def rescan(session, merge: bool = False, batch: int = 1000) -> dict:
+    """
+    Rebuild job_lsh_buckets for the whole table, then look every job up against the
+    older ones. Returns {"scanned", "duplicates", "groups": {canonical id: [duplicate ids]}}.
+    With merge=True each duplicate's tags, newest posting_date and source_url are
+    folded into its canonical job and the duplicate is deleted. Does not commit.
+    """
+    session.execute(delete(job_lsh_buckets))
+    scanned, last_id = 0, 0
+    while True:
+        rows = session.execute(
+            select(Job.id, Job.title, Job.company, Job.location).where(Job.id > last_id).order_by(Job.id).limit(batch)
+        ).all()
+        if not rows:
+            break
+        session.execute(insert(job_lsh_buckets), [
+            {"bucket": bucket, "job_id": r.id} for r in rows for bucket in set(fingerprint(*r[1:]).buckets)
+        ])
+        scanned += len(rows)
+        last_id = rows[-1].id
+
+    canonical_of, groups, last_id = {}, defaultdict(list), 0
+    while True:
+        rows = session.execute(
+            select(Job.id, Job.title, Job.company, Job.location).where(Job.id > last_id).order_by(Job.id).limit(batch)
+        ).all()
+        if not rows:
+            break
+        matches = find_duplicates(session, [fingerprint(*r[1:]) for r in rows], ids=[r.id for r in rows])
+        for r, match in zip(rows, matches):
+            if match is not None:
+                canonical = canonical_of.get(match[0], match[0])  # a chain ends at its oldest job
+                canonical_of[r.id] = canonical
+                groups[canonical].append(r.id)
+        last_id = rows[-1].id
+
+    if merge:
+        for canonical_id, dup_ids in groups.items():
+            _merge_into(session, canonical_id, dup_ids)
+    return {"scanned": scanned, "duplicates": len(canonical_of), "groups": dict(groups)}
+
+
+def _merge_into(session, canonical_id: int, dup_ids: list[int]):
+    job = session.get(Job, canonical_id)
+    dups = session.scalars(select(Job).where(Job.id.in_(dup_ids)).order_by(Job.id)).all()
+    names = (job.tags or "").split(",")
+    for dup in dups:
+        names.extend((dup.tags or "").split(","))
+        if dup.posting_date and (job.posting_date is None or dup.posting_date > job.posting_date):
+            job.posting_date = dup.posting_date
+        job.source_url = job.source_url or dup.source_url
+        job.job_type = job.job_type or dup.job_type
+    job.set_tags(session, names)
+    job.content_hash = content_hash({
+        "title": job.title, "company": job.company, "location": job.location,
+        "posting_date": job.posting_date, "job_type": job.job_type, "tags": job.tags,
+    })
+    unindex_jobs(session, dup_ids)
+    for dup in dups:
+        session.delete(dup)
+    session.flush()
+    refresh_latest(session, [canonical_id, *dup_ids])
+
+
+def main():
+    import argparse  # CLI only: the API imports this module on every cold start
+
+    ap = argparse.ArgumentParser(description="Rebuild the near-duplicate index and report (or merge) duplicates.")
+    ap.add_argument("--merge", action="store_true", help="fold duplicates into their oldest match and delete them")
+    ap.add_argument("--show", type=int, default=20, help="duplicate groups to print")
+    args = ap.parse_args()
+
+    from cache import response_cache
+    from db import SessionFactory
+
+    response_cache.configure()
+    with SessionFactory()() as session:
+        result = rescan(session, merge=args.merge)
+        session.commit()
+        if args.merge and result["duplicates"]:
+            response_cache.invalidate()
+        for canonical_id, dup_ids in list(result["groups"].items())[:args.show]:
+            job = session.get(Job, canonical_id)
+            print(f"{canonical_id} {job.title} | {job.company} | {job.location} <- {dup_ids}")
+        print(f"scanned {result['scanned']} jobs: {result['duplicates']} duplicates in {len(result['groups'])} groups"
+              f"{' (merged)' if args.merge else ''}")
+
+
+if __name__ == "__main__":
+    main()
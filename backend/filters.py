@@ -0,0 +1,95 @@
+# backend/filters.py
+"""
+The filter parameters of GET /jobs, shared by every endpoint that accepts them
+(list, facets, ...). `args` is anything with .get(): request.args or a dict.
+"""
+from sqlalchemy import false, tuple_
+
+from geo import (
+    DEFAULT_RADIUS_KM, canonical_city, canonical_country, parse_bbox, parse_near, places_in_box, places_near,
+)
+from models.job import Job
+from models.tag import tag_filter
+from search import apply_keyword_filter, search_backend
+
+# structured location filters (besides the substring `location`)
+GEO_ARGS = ("country", "city", "remote", "near", "bbox")
+_FLAGS = {"1": True, "true": True, "yes": True, "0": False, "false": False, "no": False}
+
+
+class InvalidFilter(ValueError):
+    """Malformed filter value (near, bbox, radius_km, remote): answer 400."""
+
+
+def apply_job_filters(query, args, session=None, search=None):
+    """
+    Apply job_type, location, country/city/remote, near+radius_km or bbox,
+    tag/tag_mode and q to a Job query/select.
+    Returns (query, rank); rank orders by relevance when q hit a full-text index.
+    Raises InvalidFilter for values that cannot be parsed.
+
+    The full-text backend for q is looked up through `session`; callers without
+    a sync session (the async API) pass the already-known `search` backend instead.
+    """
+    job_type = args.get("job_type")
+    location = args.get("location")
+    tag = args.get("tag")
+    keyword = args.get("q")
+
+    if job_type and job_type != "All":
+        query = query.filter(Job.job_type == job_type)
+
+    if location:
+        query = query.filter(Job.location.ilike(f"%{location}%"))
+
+    query = _apply_geo_filters(query, args)
+
+    if tag:
+        # exact tag match via job_tags; "a,b" needs both unless tag_mode=any
+        match_all = args.get("tag_mode", "all") != "any"
+        query = query.filter(tag_filter(tag, match_all=match_all))
+
+    rank = None
+    if keyword:
+        # full-text index (FTS5 / tsvector) when available, ILIKE otherwise
+        if session is not None:
+            search = search_backend(session)
+        query, rank = apply_keyword_filter(query, search, keyword)
+
+    return query, rank
+
+
+def _apply_geo_filters(query, args):
+    country, city, remote = args.get("country"), args.get("city"), args.get("remote")
+    if country:
+        query = query.filter(Job.country == canonical_country(country))
+    if city:
+        query = query.filter(Job.city == canonical_city(city))
+    if remote:
+        if remote.lower() not in _FLAGS:
+            raise InvalidFilter("remote must be 1 or 0")
+        query = query.filter(Job.is_remote.is_(_FLAGS[remote.lower()]))
+
+    # radius / box: the gazetteer places inside (in-memory grid) -> indexed (country, city) IN (...)
+    near, bbox = args.get("near"), args.get("bbox")
+    places = None
+    try:
+        if near:
+            try:
+                radius_km = float(args.get("radius_km") or DEFAULT_RADIUS_KM)
+            except ValueError:
+                raise ValueError("radius_km must be a number")
+            if not radius_km > 0:
+                raise ValueError("radius_km must be positive")
+            places = places_near(*parse_near(near), radius_km)
+        elif bbox:
+            places = places_in_box(*parse_bbox(bbox))
+    except ValueError as e:
+        raise InvalidFilter(str(e))
+    if places is not None:
+        if not places:
+            return query.filter(false())
+        # city IN (...) lets SQLite seek ix_jobs_city_id; the pair test keeps same-named cities elsewhere out
+        query = query.filter(Job.city.in_({city for _country, city in places}),
+                             tuple_(Job.country, Job.city).in_(places))
+    return query
@@ -0,0 +1,208 @@
+# backend/frontier.py
+"""
+Durable crawl frontier for the scraper: every discovered detail URL is a
+crawl_frontier row, so a crash or a dead Chrome loses nothing and the next
+run (or another machine) picks up where this one stopped.
+
+States:
+  pending   discovered, waiting to be fetched (also after a retryable failure)
+  fetched   page fetched and parsed; the record is kept in `payload` until written
+  parsed    record written to jobs
+  failed    gave up after max_attempts (last_error says why)
+
+Work is claimed in batches under a lease: claim() marks rows with a claim
+token and lease_expires_at, using SELECT ... FOR UPDATE SKIP LOCKED on
+Postgres so concurrent scrapers never take the same rows (SQLite serializes
+writers anyway). Rows whose lease ran out (their process died) are
+claimable again. A failed fetch goes back to pending with exponential
+backoff, reusing lease_expires_at as "not before".
+
+    python frontier.py              # counts per state
+    python frontier.py --retry-failed
+"""
+import argparse
+import json
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, or_, select, update
+
+from db import SessionFactory, db, dialect_insert
+
+PENDING, FETCHED, PARSED, FAILED = "pending", "fetched", "parsed", "failed"
+STATES = (PENDING, FETCHED, PARSED, FAILED)
+
+crawl_frontier = db.Table(
+    "crawl_frontier",
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("url", db.String(500), nullable=False, unique=True),
+    db.Column("state", db.String(20), nullable=False, default=PENDING),
+    db.Column("attempts", db.Integer, nullable=False, default=0),
+    db.Column("leased_by", db.String(100), nullable=True),  # claim token
+    db.Column("lease_expires_at", db.DateTime, nullable=True),
+    db.Column("last_error", db.Text, nullable=True),
+    db.Column("payload", db.Text, nullable=True),  # parsed record (JSON) while fetched
+    db.Column("discovered_at", db.DateTime, default=datetime.utcnow),
+    db.Column("updated_at", db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow),
+    db.Index("ix_crawl_frontier_state_lease", "state", "lease_expires_at", "id"),
+)
+
+@dataclass(frozen=True)
+class Claim:
+    id: int
+    url: str
+    attempts: int  # including this one
+    payload: dict | None = None  # set for fetched rows
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+class CrawlFrontier:
+    """
+    Queue of detail URLs in the table above, on `engine` (the app database, or
+    e.g. a local SQLite file). Each call runs in its own short transaction.
+    """
+
+    def __init__(self, engine, lease_seconds: float = 600, max_attempts: int = 3, retry_delay: float = 60,
+                 worker: str | None = None):
+        self.engine = engine
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        self.tokens = set()  # claims made by this process (for release())
+        crawl_frontier.create(engine, checkfirst=True)
+
+    def enqueue(self, urls) -> int:
+        """Queue `urls`: new ones as pending, finished (parsed / failed) ones again. Returns how many."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return 0
+        t, now = crawl_frontier, datetime.utcnow()
+        with self.engine.begin() as conn:
+            existing = dict(conn.execute(select(t.c.url, t.c.state).where(t.c.url.in_(urls))).all())
+            new = [{"url": u, "state": PENDING, "attempts": 0, "discovered_at": now, "updated_at": now}
+                   for u in urls if u not in existing]
+            queued = 0
+            if new:
+                make_insert = dialect_insert(conn.dialect.name)
+                if make_insert is not None:
+                    # another scraper may be walking the same listing
+                    queued += conn.execute(make_insert(t).on_conflict_do_nothing(index_elements=["url"]), new).rowcount
+                else:
+                    queued += conn.execute(insert(t), new).rowcount
+            again = [u for u in urls if existing.get(u) in (PARSED, FAILED)]
+            if again:
+                queued += conn.execute(
+                    update(t).where(t.c.url.in_(again), t.c.state.in_((PARSED, FAILED)))
+                    .values(state=PENDING, attempts=0, leased_by=None, lease_expires_at=None,
+                            last_error=None, payload=None, updated_at=now)
+                ).rowcount
+        return queued
+
+    def claim(self, n: int, state: str = PENDING) -> list[Claim]:
+        """
+        Lease up to `n` rows in `state` (oldest first) whose lease is free or
+        expired. Fetched rows come back with their payload, for writing.
+        """
+        t, now = crawl_frontier, datetime.utcnow()
+        token = f"{self.worker}:{uuid.uuid4().hex[:8]}"
+        claimable = (t.c.state == state) & or_(t.c.lease_expires_at.is_(None), t.c.lease_expires_at < now)
+        pick = select(t.c.id).where(claimable).order_by(t.c.id).limit(n).with_for_update(skip_locked=True)
+        values = {"leased_by": token, "lease_expires_at": now + self.lease, "updated_at": now}
+        if state == PENDING:
+            values["attempts"] = t.c.attempts + 1
+        with self.engine.begin() as conn:
+            # re-check `claimable`: on SQLite the subquery takes no row locks
+            conn.execute(update(t).where(t.c.id.in_(pick.scalar_subquery()), claimable).values(**values))
+            rows = conn.execute(
+                select(t.c.id, t.c.url, t.c.attempts, t.c.payload).where(t.c.leased_by == token).order_by(t.c.id)
+            ).all()
+        if rows:
+            self.tokens.add(token)
+        return [Claim(r.id, r.url, r.attempts, json.loads(r.payload) if r.payload else None) for r in rows]
+
+    def _finish(self, claims, **values):
+        """Update the rows of `claims` this process still holds (a lost lease is left alone)."""
+        ids = [c.id for c in claims]
+        if not ids:
+            return
+        t = crawl_frontier
+        values.setdefault("updated_at", datetime.utcnow())
+        with self.engine.begin() as conn:
+            conn.execute(update(t).where(t.c.id.in_(ids), t.c.leased_by.in_(self.tokens)).values(**values))
+
+    def fetched(self, claim: Claim, record: dict):
+        """Checkpoint a parsed page: a crash before the write only needs the write redone."""
+        self._finish([claim], state=FETCHED, payload=json.dumps(record, default=_json_default),
+                     last_error=None, lease_expires_at=datetime.utcnow() + self.lease)
+
+    def parsed(self, claims):
+        """The records of `claims` are in jobs (committed)."""
+        self._finish(claims, state=PARSED, payload=None, leased_by=None, lease_expires_at=None)
+
+    def failed(self, claim: Claim, error, retry: bool = True):
+        """Back to pending after a backoff, or failed for good (after max_attempts, or retry=False)."""
+        now = datetime.utcnow()
+        if not retry or claim.attempts >= self.max_attempts:
+            state, not_before = FAILED, None
+        else:
+            state, not_before = PENDING, now + timedelta(seconds=self.retry_delay * 2 ** (claim.attempts - 1))
+        self._finish([claim], state=state, lease_expires_at=not_before, leased_by=None,
+                     last_error=str(error)[:2000], payload=None, updated_at=now)
+
+    def release(self):
+        """Hand back everything this process claimed but did not finish (on exit)."""
+        if not self.tokens:
+            return
+        t = crawl_frontier
+        with self.engine.begin() as conn:
+            held = t.c.leased_by.in_(self.tokens)
+            conn.execute(update(t).where(held, t.c.state == PENDING)
+                         .values(attempts=t.c.attempts - 1, leased_by=None, lease_expires_at=None))
+            conn.execute(update(t).where(held, t.c.state == FETCHED).values(lease_expires_at=None))
+        self.tokens.clear()
+
+    def has_work(self) -> bool:
+        """Whether anything is pending or fetched (resumable), leased or not."""
+        t = crawl_frontier
+        with self.engine.connect() as conn:
+            return conn.scalar(select(t.c.id).where(t.c.state.in_((PENDING, FETCHED))).limit(1)) is not None
+
+    def counts(self) -> dict:
+        t = crawl_frontier
+        with self.engine.connect() as conn:
+            found = dict(conn.execute(select(t.c.state, func.count()).group_by(t.c.state)).all())
+        return {state: found.get(state, 0) for state in STATES}
+
+    def retry_failed(self) -> int:
+        t = crawl_frontier
+        with self.engine.begin() as conn:
+            return conn.execute(
+                update(t).where(t.c.state == FAILED)
+                .values(state=PENDING, attempts=0, lease_expires_at=None, updated_at=datetime.utcnow())
+            ).rowcount
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=os.getenv("FRONTIER_DATABASE_URL"),
+                    help="frontier database URL (default: the app database)")
+    ap.add_argument("--retry-failed", action="store_true", help="put failed URLs back to pending")
+    args = ap.parse_args()
+
+    frontier = CrawlFrontier(SessionFactory(args.db).engine)
+    if args.retry_failed:
+        print(f"requeued {frontier.retry_failed()} failed URLs")
+    print(" ".join(f"{state}={n}" for state, n in frontier.counts().items()))
+
+
+if __name__ == "__main__":
+    main()
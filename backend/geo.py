@@ -0,0 +1,347 @@
+# backend/geo.py
+"""
+Structured locations: the free-text jobs.location ("London, UK", "Remote,
+United States", "Hartford, CT") resolved to city, country and is_remote with
+an offline gazetteer, gazetteer.csv (city, country, lat, lon, aliases). Set
+GEO_GAZETTEER to use a larger file with the same columns, such as a GeoNames
+cities export.
+
+- Country names and aliases ("UK", "U.S.A.", "Holland"), US states, Canadian
+  provinces and Australian states resolve to a country. City names and
+  aliases ("NYC", "Bombay", "Zürich") resolve to the gazetteer's spelling.
+  Once the country is known, an unknown city keeps the spelling it was
+  written with. A location nothing can be made of stays NULL / NULL.
+- Radius and bounding-box searches run against an in-memory grid of the
+  gazetteer's places (GRID_DEGREES cells). The places inside become an
+  indexed (country, city) IN (...) filter, so jobs carry no coordinates.
+
+Writers fill the columns with place_columns(location): ingest, the API
+routes and the benchmark seed.
+
+    python geo.py        # backfill city / country / is_remote for every job
+"""
+import csv
+import math
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import bindparam, func, select, update
+
+from models.job import Job
+
+GAZETTEER_PATH = os.getenv("GEO_GAZETTEER") or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "gazetteer.csv")
+GRID_DEGREES = 1.0  # must divide 360
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_RADIUS_KM = 50.0
+MAX_RADIUS_KM = 2000.0
+BACKFILL_BATCH = 5000
+
+COUNTRY_ALIASES = {
+    "uk": "United Kingdom", "u k": "United Kingdom", "gb": "United Kingdom", "great britain": "United Kingdom",
+    "britain": "United Kingdom", "england": "United Kingdom", "scotland": "United Kingdom",
+    "wales": "United Kingdom", "northern ireland": "United Kingdom",
+    "us": "United States", "u s": "United States", "usa": "United States", "u s a": "United States",
+    "united states of america": "United States", "america": "United States",
+    "uae": "United Arab Emirates", "u a e": "United Arab Emirates",
+    "holland": "Netherlands", "the netherlands": "Netherlands", "czechia": "Czech Republic",
+    "republic of ireland": "Ireland", "eire": "Ireland", "korea": "South Korea", "republic of korea": "South Korea",
+    "hk": "Hong Kong", "hong kong sar": "Hong Kong", "prc": "China", "mainland china": "China",
+    "ksa": "Saudi Arabia", "nz": "New Zealand", "deutschland": "Germany", "schweiz": "Switzerland",
+    "suisse": "Switzerland", "espana": "Spain", "italia": "Italy", "brasil": "Brazil",
+}
+# "<name> <code>" per state / province; they only count after a city ("Hartford, CT", "Perth, WA")
+REGIONS = {
+    "United States": (
+        "alabama al|alaska ak|arizona az|arkansas ar|california ca|colorado co|connecticut ct|delaware de|"
+        "district of columbia dc|florida fl|georgia ga|hawaii hi|idaho id|illinois il|indiana in|iowa ia|"
+        "kansas ks|kentucky ky|louisiana la|maine me|maryland md|massachusetts ma|michigan mi|minnesota mn|"
+        "mississippi ms|missouri mo|montana mt|nebraska ne|nevada nv|new hampshire nh|new jersey nj|"
+        "new mexico nm|new york ny|north carolina nc|north dakota nd|ohio oh|oklahoma ok|oregon or|"
+        "pennsylvania pa|rhode island ri|south carolina sc|south dakota sd|tennessee tn|texas tx|utah ut|"
+        "vermont vt|virginia va|washington wa|west virginia wv|wisconsin wi|wyoming wy"
+    ),
+    "Canada": (
+        "alberta ab|british columbia bc|manitoba mb|new brunswick nb|newfoundland and labrador nl|"
+        "nova scotia ns|ontario on|prince edward island pe|quebec qc|saskatchewan sk"
+    ),
+    "Australia": (
+        "australian capital territory act|new south wales nsw|northern territory nt|queensland qld|"
+        "south australia sa|tasmania tas|victoria vic|western australia wa"
+    ),
+}
+_REMOTE_RE = re.compile(r"\b(?:fully remote|remote|anywhere|work from home|wfh|home based|homeworking|telecommute)\b")
+_NOISE_RE = re.compile(r"\b(?:hybrid|on ?site|in office|office based|flexible)\b")
+_SPLIT_RE = re.compile(r"[,;/|()\[\]]| - |\s+or\s+", re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _key(text: str) -> str:
+    """Lowercase ASCII words ("Zürich" -> "zurich", "U.S.A." -> "u s a")."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return _NON_WORD_RE.sub(" ", text.replace("'", "")).strip()
+
+
+@dataclass(frozen=True)
+class Place:
+    city: str | None
+    country: str | None
+    is_remote: bool = False
+    lat: float | None = None  # gazetteer coordinates of the city, when it is known
+    lon: float | None = None
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat: float, lon: float) -> tuple[int, int]:
+    return math.floor(lat / GRID_DEGREES), math.floor(((lon + 180) % 360 - 180) / GRID_DEGREES)
+
+
+class Gazetteer:
+    """Name lookups and a grid of GRID_DEGREES cells over the places."""
+
+    def __init__(self, rows):
+        self.cities = defaultdict(list)  # name / alias key -> [Place], in file order
+        self.countries = {}              # name / alias key -> country
+        self.regions = defaultdict(list)  # state / province name or code -> [country]
+        self.grid = defaultdict(list)    # cell -> [Place]
+        for row in rows:
+            place = Place(row["city"].strip(), row["country"].strip(), False, float(row["lat"]), float(row["lon"]))
+            for name in [place.city] + (row.get("aliases") or "").split("|"):
+                if _key(name):
+                    self.cities[_key(name)].append(place)
+            self.countries[_key(place.country)] = place.country
+            self.grid[_cell(place.lat, place.lon)].append(place)
+        for alias, country in COUNTRY_ALIASES.items():
+            self.countries.setdefault(alias, country)
+        for country, entries in REGIONS.items():
+            for entry in entries.split("|"):
+                name, code = entry.rsplit(" ", 1)
+                self.regions[name].append(country)
+                self.regions[code].append(country)
+
+    def city(self, key: str, countries=None) -> Place | None:
+        """The gazetteer place called `key` (in one of `countries`, when given)."""
+        for place in self.cities.get(key, ()):
+            if countries is None or place.country in countries:
+                return place
+        return None
+
+    def _cells(self, south, north, west, east):
+        rows = range(math.floor(max(-90.0, south) / GRID_DEGREES), math.floor(min(90.0, north) / GRID_DEGREES) + 1)
+        if east - west >= 360:
+            west, east = -180.0, 180.0 - GRID_DEGREES
+        cols = {_cell(0.0, west + i * GRID_DEGREES)[1] for i in range(math.floor((east - west) / GRID_DEGREES) + 1)}
+        cols.add(_cell(0.0, east)[1])
+        for r in rows:
+            for c in cols:
+                yield r, c
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[Place]:
+        """Places at most `radius_km` from (lat, lon), nearest first."""
+        angle = radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angle)
+        cos_lat = math.cos(math.radians(lat))
+        # widest longitude span of the circle; near the poles it covers every longitude
+        dlon = 360.0 if math.sin(angle) >= cos_lat else math.degrees(math.asin(math.sin(angle) / cos_lat))
+        hits = []
+        for cell in self._cells(lat - dlat, lat + dlat, lon - dlon, lon + dlon):
+            for place in self.grid.get(cell, ()):
+                distance = haversine_km(lat, lon, place.lat, place.lon)
+                if distance <= radius_km:
+                    hits.append((distance, place))
+        return [place for _, place in sorted(hits, key=lambda h: h[0])]
+
+    def in_box(self, west: float, south: float, east: float, north: float) -> list[Place]:
+        """Places inside the box; west > east crosses the antimeridian."""
+        span = east - west if east >= west else east + 360 - west
+        hits = []
+        for cell in self._cells(south, north, west, west + span):
+            for place in self.grid.get(cell, ()):
+                if south <= place.lat <= north and (place.lon - west) % 360 <= span:
+                    hits.append(place)
+        return hits
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        return Gazetteer(csv.DictReader(f))
+
+
+def _parts(location: str):
+    """(key, spelling) per comma-separated part, with remote/hybrid words taken out; and is_remote."""
+    parts, is_remote = [], False
+    for raw in _SPLIT_RE.split(location or ""):
+        key = _key(raw)
+        if _REMOTE_RE.search(key):
+            is_remote = True
+            key = _REMOTE_RE.sub(" ", key)
+        cleaned = " ".join(_NOISE_RE.sub(" ", key).split())
+        if cleaned:
+            # keep the original spelling unless words were removed from it
+            parts.append((cleaned, raw.strip() if cleaned == _key(raw) else cleaned.title()))
+    return parts, is_remote
+
+
+@lru_cache(maxsize=8192)
+def resolve(location: str) -> Place:
+    """City, country and is_remote of a free-text location (see the module docstring)."""
+    g = gazetteer()
+    parts, is_remote = _parts(location)
+    country, region_countries, rest = None, None, []
+    for i, (key, spelling) in enumerate(parts):
+        if i and region_countries is None and key in g.regions:
+            region_countries = g.regions[key]
+        elif key in g.countries and (i or len(parts) == 1 or not g.cities.get(key)):
+            country = country or g.countries[key]
+        else:
+            rest.append((key, spelling))
+
+    candidates = (country,) if country else region_countries
+    for key, _spelling in rest:
+        place = g.city(key, candidates)
+        if place is not None:
+            return Place(place.city, place.country, is_remote, place.lat, place.lon)
+
+    if country is None and region_countries:
+        country = region_countries[0]
+    if country is None:
+        return Place(None, None, is_remote)
+    if rest:
+        return Place(rest[0][1], country, is_remote)
+    # city-states: "Singapore", "Hong Kong"
+    place = g.city(_key(country), (country,))
+    if place is not None:
+        return Place(place.city, country, is_remote, place.lat, place.lon)
+    return Place(None, country, is_remote)
+
+
+def place_columns(location: str) -> dict:
+    """The jobs columns derived from `location` (write them next to it)."""
+    place = resolve(location)
+    return {"city": place.city, "country": place.country, "is_remote": place.is_remote}
+
+
+def canonical_country(name: str) -> str:
+    """Stored spelling of a country name or alias ("uk" -> "United Kingdom"); unknown names as given."""
+    return gazetteer().countries.get(_key(name), (name or "").strip())
+
+
+def canonical_city(name: str) -> str:
+    """Stored spelling of a city name or alias ("nyc" -> "New York"); unknown names as given."""
+    place = gazetteer().city(_key(name))
+    return place.city if place is not None else (name or "").strip()
+
+
+def _coordinates(lat, lon) -> tuple[float, float]:
+    lat, lon = float(lat), float(lon)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or math.isnan(lat) or math.isnan(lon):
+        raise ValueError("latitude must be within [-90, 90] and longitude within [-180, 180]")
+    return lat, lon
+
+
+def parse_near(value: str) -> tuple[float, float]:
+    """`near=51.5,-0.12` or `near=London` -> (lat, lon). Raises ValueError."""
+    parts = value.split(",")
+    if len(parts) == 2:
+        try:
+            return _coordinates(*parts)
+        except ValueError as e:
+            if any(c.isdigit() for c in value):
+                raise ValueError(f"near: {e}")
+    place = resolve(value)
+    if place.lat is None:
+        raise ValueError(f"near: unknown place {value!r} (use near=lat,lon)")
+    return place.lat, place.lon
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    """`bbox=west,south,east,north` (GeoJSON order) -> floats. Raises ValueError."""
+    try:
+        west, south, east, north = (float(p) for p in value.split(","))
+        _coordinates(south, west)
+        _coordinates(north, east)
+    except ValueError:
+        raise ValueError("bbox must be west,south,east,north in degrees")
+    if south > north:
+        raise ValueError("bbox: south is above north")
+    return west, south, east, north
+
+
+def places_near(lat: float, lon: float, radius_km: float) -> list[tuple[str, str]]:
+    """(country, city) of every gazetteer place within `radius_km` (capped at MAX_RADIUS_KM)."""
+    return [(p.country, p.city) for p in gazetteer().within(lat, lon, min(radius_km, MAX_RADIUS_KM))]
+
+
+def places_in_box(west: float, south: float, east: float, north: float) -> list[tuple[str, str]]:
+    return [(p.country, p.city) for p in gazetteer().in_box(west, south, east, north)]
+
+
+def backfill(session, batch: int = BACKFILL_BATCH) -> dict:
+    """
+    Recompute city / country / is_remote of every job from its location, in id
+    order, writing only the rows that change (updated_at is kept). Does not commit.
+    """
+    jobs = Job.__table__
+    stmt = (
+        update(jobs).where(jobs.c.id == bindparam("b_id"))
+        # an explicit updated_at keeps the column's onupdate from bumping it
+        .values(city=bindparam("b_city"), country=bindparam("b_country"), is_remote=bindparam("b_is_remote"),
+                updated_at=jobs.c.updated_at)
+    )
+    stats, last_id = {"scanned": 0, "updated": 0}, 0
+    while True:
+        rows = session.execute(
+            select(jobs.c.id, jobs.c.location, jobs.c.city, jobs.c.country, jobs.c.is_remote)
+            .where(jobs.c.id > last_id).order_by(jobs.c.id).limit(batch)
+        ).all()
+        if not rows:
+            return stats
+        params = []
+        for row in rows:
+            cols = place_columns(row.location)
+            if (row.city, row.country, bool(row.is_remote)) != (cols["city"], cols["country"], cols["is_remote"]):
+                params.append({"b_id": row.id, "b_city": cols["city"], "b_country": cols["country"],
+                               "b_is_remote": cols["is_remote"]})
+        if params:
+            session.execute(stmt, params)
+        stats["scanned"] += len(rows)
+        stats["updated"] += len(params)
+        last_id = rows[-1].id
+
+
+def main():
+    from cache import response_cache
+    from db import SessionFactory
+    from read_model import read_model_available, rebuild
+
+    response_cache.configure()
+    with SessionFactory()() as session:
+        stats = backfill(session)
+        if stats["updated"] and read_model_available(session):
+            rebuild(session)  # latest_jobs carries copies of the columns
+        session.commit()
+        if stats["updated"]:
+            response_cache.invalidate()
+        print(f"scanned {stats['scanned']} jobs, updated {stats['updated']}")
+        unplaced = session.execute(
+            select(Job.location, func.count()).where(Job.country.is_(None), Job.is_remote.is_(False))
+            .group_by(Job.location).order_by(func.count().desc()).limit(10)
+        ).all()
+        if unplaced:
+            print("most common locations without a country (add them to the gazetteer):")
+            for location, n in unplaced:
+                print(f"  {n:6}  {location}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# backend/ingest.py
+"""
+Batched job ingestion: validate records, then write them in chunks with the
+database's native upsert (INSERT ... ON CONFLICT DO UPDATE) on the
+(title, company, location) unique constraint.
+
+Near-duplicates of a stored job (or of an earlier record in the same chunk)
+are re-keyed to that job first and combined with it (tags united, newest
+posting_date, job_type / source_url kept), so the upsert merges them into
+it instead of overwriting it; see dedup.py.
+
+Used by the scraper and by POST /jobs/bulk.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import and_, delete, func, insert, or_, select, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+
+from db import dialect_insert
+from dedup import canonicalize, index_jobs, merge_values
+from geo import place_columns
+from models.job import Job, content_hash
+from models.tag import Tag, clean_tag_names, job_tags, tag_slug
+from read_model import refresh_latest
+
+KEY_FIELDS = ("title", "company", "location")
+
+def job_fields_from_payload(data: dict) -> dict:
+    """
+    Validate an incoming job (API payload or scraped record) and return the
+    column values. Raises ValueError with a client-facing message.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("each job must be a JSON object")
+
+    title = (data.get("title") or "").strip()
+    company = (data.get("company") or "").strip()
+    location = (data.get("location") or "").strip()
+    if not title or not company or not location:
+        raise ValueError("title, company, and location are required")
+
+    posting_date = data.get("posting_date")
+    if isinstance(posting_date, datetime):
+        posting_date = posting_date.date()
+    elif not isinstance(posting_date, date):
+        posting_date_str = (posting_date or "").strip()
+        posting_date = None
+        if posting_date_str:
+            try:
+                posting_date = datetime.fromisoformat(posting_date_str).date()
+            except Exception:
+                raise ValueError("posting_date must be a valid date (YYYY-MM-DD)")
+
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "posting_date": posting_date,
+        "job_type": (data.get("job_type") or "").strip() or None,
+        "tags": clean_tag_names(data.get("tags")),
+        "source_url": (data.get("source_url") or "").strip() or None,
+    }
+
+
+def bulk_upsert_jobs(session, records, chunk_size: int = 500, dedup: bool = True) -> dict:
+    """
+    Insert or update `records` (dicts) in chunks. Bad rows are reported, not fatal:
+    returns {"inserted", "updated", "unchanged", "merged", "errors": [{"index", "error"}]}
+    ("merged": near-duplicates written to an existing job's row instead of a new one).
+    A record repeating the title/company/location of a later one in the same
+    chunk is replaced by it and listed in "errors". Rows whose content_hash and
+    source_url are unchanged are left untouched. Does not commit.
+    """
+    result = {"inserted": 0, "updated": 0, "unchanged": 0, "merged": 0, "errors": []}
+
+    rows = []  # (index, values)
+    for i, data in enumerate(records):
+        try:
+            rows.append((i, job_fields_from_payload(data)))
+        except ValueError as e:
+            result["errors"].append({"index": i, "error": str(e)})
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            with session.begin_nested():
+                _upsert_chunk(session, chunk, result, dedup)
+        except SQLAlchemyError:
+            # isolate the bad row(s): retry this chunk one row per savepoint
+            for i, values in chunk:
+                try:
+                    with session.begin_nested():
+                        _upsert_chunk(session, [(i, values)], result, dedup)
+                except SQLAlchemyError as e:
+                    result["errors"].append({"index": i, "error": str(getattr(e, "orig", e))})
+
+    result["errors"].sort(key=lambda e: e["index"])
+    return result
+
+
+def _upsert_chunk(session, chunk, result, dedup=True):
+    values_list = [values for _i, values in chunk]
+    rekeyed = [False] * len(values_list)
+    if dedup:
+        values_list, rekeyed = canonicalize(session, values_list)
+
+    # the same key twice in one statement is an error for ON CONFLICT: a repeat of a key
+    # wins (the record it replaces is reported), a near-duplicate re-keyed onto it is merged in
+    by_key, merged_keys, index_of, replaced = {}, set(), {}, []
+    for (i, _values), values, is_dup in zip(chunk, values_list, rekeyed):
+        key = tuple(values[f] for f in KEY_FIELDS)
+        if is_dup:
+            merged_keys.add(key)
+            if key in by_key:
+                values = merge_values(by_key[key], values)
+        elif key in by_key:
+            replaced.append({"index": index_of[key],
+                             "error": f"same title, company and location as record {i}, which replaced it"})
+        by_key[key] = values
+        index_of[key] = i
+
+    stored = {
+        (r.title, r.company, r.location): r
+        for r in session.execute(
+            select(Job.title, Job.company, Job.location, Job.posting_date, Job.job_type, Job.tags,
+                   Job.source_url, Job.content_hash)
+            .where(tuple_(Job.title, Job.company, Job.location).in_(list(by_key)))
+        )
+    }
+    # near-duplicates of a stored job add to it instead of replacing it
+    for key in merged_keys & stored.keys():
+        by_key[key] = merge_values(stored[key]._asdict(), by_key[key])
+    values_list = list(by_key.values())
+
+    # resolve every tag name in the chunk at once (canonical names + ids)
+    tags = {t.slug: t for t in Tag.resolve(session, [n for v in values_list for n in v["tags"]])}
+    session.flush()
+
+    now = datetime.utcnow()
+    params = []
+    for v in values_list:
+        names = [tags[tag_slug(n)].name for n in v["tags"]]
+        params.append({
+            "title": v["title"],
+            "company": v["company"],
+            "location": v["location"],
+            **place_columns(v["location"]),
+            "posting_date": v["posting_date"],
+            "job_type": v["job_type"],
+            "tags": ",".join(names) or None,
+            "source_url": v["source_url"],
+            "content_hash": content_hash({**v, "tags": names}),
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    # classify before writing: new key -> insert, same hash -> unchanged, else update
+    # (source_url is not hashed: a record without one keeps the stored URL, so only a new URL is a change)
+    existing = {key: row.content_hash for key, row in stored.items()}
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "merged": sum(rekeyed)}
+    for p in params:
+        key = (p["title"], p["company"], p["location"])
+        if key not in existing:
+            counts["inserted"] += 1
+        elif existing[key] == p["content_hash"] and p["source_url"] in (None, stored[key].source_url):
+            counts["unchanged"] += 1
+        else:
+            counts["updated"] += 1
+
+    dialect = session.get_bind().dialect.name
+    make_insert = dialect_insert(dialect)
+    if make_insert is None:
+        written = _upsert_rows_orm(session, params)
+    else:
+        jobs = Job.__table__
+        stmt = make_insert(jobs)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(KEY_FIELDS),
+            set_={
+                # same location, but the gazetteer may place it differently by now
+                "city": excluded.city,
+                "country": excluded.country,
+                "is_remote": excluded.is_remote,
+                "posting_date": excluded.posting_date,
+                "job_type": excluded.job_type,
+                "tags": excluded.tags,
+                "source_url": func.coalesce(excluded.source_url, jobs.c.source_url),
+                "content_hash": excluded.content_hash,
+                "updated_at": excluded.updated_at,
+            },
+            # identical rows are skipped entirely (no write, no RETURNING row)
+            where=or_(
+                jobs.c.content_hash.is_distinct_from(excluded.content_hash),
+                and_(excluded.source_url.isnot(None), jobs.c.source_url.is_distinct_from(excluded.source_url)),
+            ),
+        ).returning(jobs.c.id, jobs.c.title, jobs.c.company, jobs.c.location)
+        written = {(r.title, r.company, r.location): r.id for r in session.execute(stmt, params)}
+
+    # rewrite job_tags for every row that was inserted or changed
+    if written:
+        ids = list(written.values())
+        session.execute(delete(job_tags).where(job_tags.c.job_id.in_(ids)))
+        links = [
+            {"job_id": written[key], "tag_id": tags[tag_slug(n)].id}
+            for key, v in by_key.items() if key in written
+            for n in v["tags"]
+        ]
+        if links:
+            session.execute(insert(job_tags), links)
+
+    # updates keep their key (and so their band hashes): only new rows need indexing
+    index_jobs(session, [(written[key], *key) for key in written if key not in existing])
+    refresh_latest(session, written.values())
+
+    for k, n in counts.items():
+        result[k] += n
+    result["errors"].extend(replaced)
+
+
+def _upsert_rows_orm(session, params) -> dict:
+    """Portable fallback for databases without ON CONFLICT (e.g. MySQL): one lookup per row."""
+    written = {}
+    for p in params:
+        key = tuple(p[f] for f in KEY_FIELDS)
+        job = session.scalar(
+            select(Job).where(Job.title == p["title"], Job.company == p["company"], Job.location == p["location"])
+        )
+        if job is None:
+            job = Job(**p)
+            session.add(job)
+        elif job.content_hash == p["content_hash"] and p["source_url"] in (None, job.source_url):
+            continue
+        else:
+            for field in ("posting_date", "job_type", "tags", "content_hash", "updated_at"):
+                setattr(job, field, p[field])
+            job.source_url = p["source_url"] or job.source_url
+        session.flush()
+        written[key] = job.id
+    return written
@@ -0,0 +1,230 @@
+# backend/instrumentation.py
+"""
+Opt-in request timing and SQL instrumentation (METRICS_ENABLED=1).
+
+- WSGI middleware timing every request end to end (including streamed
+  bodies), kept as latency histograms per route
+- before/after_cursor_execute hooks counting queries and their time per
+  request; queries slower than SLOW_QUERY_MS are logged with their EXPLAIN
+- a Server-Timing header (db time + query count, app time) on every response
+- GET /metrics in the Prometheus text format
+
+Metrics live in process memory: with several gunicorn workers each one
+reports its own numbers (scrape them per worker or aggregate downstream).
+
+Env:
+  METRICS_ENABLED     1 to turn everything on (default off)
+  SLOW_QUERY_MS       log queries slower than this (default 200, 0 = off)
+  SLOW_QUERY_EXPLAIN  1 to log the EXPLAIN of slow SELECTs (default 1)
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from werkzeug.wsgi import ClosingIterator
+
+# seconds; Prometheus' default buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ROUTE_KEY = "instrumentation.route"
+_DB_KEY = "instrumentation.db"
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, labels, buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for label_values, series in items:
+            labels = _labels(self.labels, label_values)
+            running = 0
+            for bound, n in zip(self.buckets + ("+Inf",), series):
+                running += n
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {running}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {running}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            labels = _labels(self.labels, label_values)
+            lines.append(f"{self.name}{{{labels}}} {value}" if labels else f"{self.name} {value}")
+        return lines
+
+
+def _labels(names, values):
+    def escape(v):
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{n}="{escape(v)}"' for n, v in zip(names, values))
+
+
+class InstrumentationMiddleware:
+    """
+    Times each request from the first byte in to the last byte out, so streamed
+    responses (e.g. /jobs/export) count in full. Sits inside StripAPIPrefixMiddleware.
+    """
+    def __init__(self, app, instrumentation):
+        self.app = app
+        self.instrumentation = instrumentation
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        status = ["500"]
+
+        def _start_response(status_line, headers, exc_info=None):
+            status[0] = status_line.split(" ", 1)[0]
+            return start_response(status_line, headers, exc_info)
+
+        def _done():
+            self.instrumentation.record_request(environ, status[0], time.perf_counter() - started)
+
+        return ClosingIterator(self.app(environ, _start_response), _done)
+
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 200.0
+        self.explain = True
+        self.logger = None
+        self.requests = Histogram(
+            "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status"))
+        self.db_time = Histogram(
+            "http_request_db_seconds", "Time spent in SQL per request, by route.", ("route",))
+        self.db_queries = Counter(
+            "http_request_db_queries_total", "SQL statements executed while serving requests.", ("route",))
+        self.slow_queries = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+
+    def init_app(self, app):
+        """
+        Hook `app` (Flask) and the SQL cursor events; the WSGI middleware is
+        added by create_app. The cursor hooks listen on the Engine class, so
+        they need no engine (or app context) here and cover the app's engine
+        whenever it is made.
+        """
+        self.enabled = os.getenv("METRICS_ENABLED") == "1"
+        if not self.enabled:
+            return
+        self.slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "200"))
+        self.explain = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+        self.logger = app.logger
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view)
+
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        app.extensions["instrumentation"] = self
+
+    # --- Flask request hooks ---
+
+    def _before_request(self):
+        g._instr_started = time.perf_counter()
+        request.environ[_DB_KEY] = [0, 0.0]  # queries, seconds
+        request.environ[_ROUTE_KEY] = request.url_rule.rule if request.url_rule else "unmatched"
+
+    def _after_request(self, resp):
+        started = g.get("_instr_started")
+        if started is None:
+            return resp
+        queries, db_seconds = request.environ.get(_DB_KEY, (0, 0.0))
+        app_ms = (time.perf_counter() - started) * 1000
+        resp.headers.add(
+            "Server-Timing",
+            f'db;dur={db_seconds * 1000:.1f};desc="{queries} queries", app;dur={app_ms:.1f}',
+        )
+        return resp
+
+    def record_request(self, environ, status, seconds):
+        route = environ.get(_ROUTE_KEY, "unmatched")
+        self.requests.observe((environ.get("REQUEST_METHOD", "GET"), route, status), seconds)
+        queries, db_seconds = environ.get(_DB_KEY, (0, 0.0))
+        if queries:
+            self.db_queries.inc((route,), queries)
+            self.db_time.observe((route,), db_seconds)
+
+    # --- SQLAlchemy cursor hooks ---
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_instr_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_instr_started")
+        if not stack:
+            return
+        seconds = time.perf_counter() - stack.pop()
+        if conn.info.get("_instr_explaining"):
+            return
+
+        if has_request_context():
+            stats = request.environ.get(_DB_KEY)
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += seconds
+
+        if self.slow_query_ms and seconds * 1000 >= self.slow_query_ms:
+            self.slow_queries.inc()
+            plan = self._explain(conn, statement, parameters) if self.explain and not executemany else None
+            self.logger.warning(
+                "slow query (%.1f ms): %s%s", seconds * 1000, " ".join(statement.split()),
+                f"\n{plan}" if plan else "",
+            )
+
+    def _explain(self, conn, statement, parameters):
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        conn.info["_instr_explaining"] = True
+        try:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+            return "\n".join(" | ".join(str(v) for v in row) for row in rows)
+        except Exception as e:  # diagnostics must never break the request
+            return f"(EXPLAIN failed: {e})"
+        finally:
+            conn.info["_instr_explaining"] = False
+
+    # --- /metrics ---
+
+    def metrics_view(self):
+        lines = []
+        for metric in (self.requests, self.db_queries, self.db_time, self.slow_queries):
+            lines.extend(metric.render())
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+instrumentation = Instrumentation()
@@ -0,0 +1,163 @@
+# backend/listing.py
+"""
+GET /jobs as data: turn the query string into the SQL to run (plan_job_list)
+and the rows it returns into the response body (job_list_body).
+
+Shared by the Flask route and the async read API (asgi.py), so both give the
+same results in the same JSON shape; only the execution differs.
+"""
+from dataclasses import dataclass, replace
+
+from sqlalchemy import func, select
+
+from filters import GEO_ARGS, InvalidFilter, apply_job_filters
+from models.job import Job
+from pagination import (
+    KEYSET_SORTS, InvalidCursor, apply_keyset, cursor_for_row, decode_cursor, encode_cursor,
+)
+from read_model import (
+    LATEST_JOBS_SIZE, count_query as latest_count_query, latest_jobs, newest_first, read_model_available,
+)
+from serializers import InvalidFields, job_columns, parse_fields, rows_to_dicts
+
+MAX_PAGE_SIZE = 50
+
+
+class InvalidListArgs(ValueError):
+    """Bad query string (unknown field, malformed cursor): answer 400."""
+
+
+@dataclass
+class JobListPlan:
+    query: object            # page SELECT
+    count_query: object      # SELECT count(*) or None when the total is not wanted
+    fields: tuple
+    sort: str
+    page: int
+    page_size: int
+    offset: int
+    cursor: str | None       # None = page mode, "" or token = cursor mode
+    fallback: "JobListPlan | None" = None  # the base-table plan, when this one reads latest_jobs
+
+    def complete(self, rows, total) -> bool:
+        """False when a latest_jobs page ran out of snapshot rows: run self.fallback instead."""
+        return self.fallback is None or len(rows) == self.page_size or self.offset + len(rows) >= total
+
+
+def plan_job_list(args, session=None, search=None, latest=None) -> JobListPlan:
+    """
+    Build the list query for `args` (request.args or a dict-like with .get()).
+    `session` / `search` are passed through to apply_job_filters. Newest-first
+    pages without other filters than job_type read the latest_jobs snapshot when
+    the database has it (looked up through `session`, or given as `latest`).
+    """
+    # Sparse fieldsets: ?fields=id,title,company
+    try:
+        fields = parse_fields(args.get("fields"))
+    except InvalidFields as e:
+        raise InvalidListArgs(str(e))
+
+    keyword = args.get("q")
+
+    # Sorting (keyword searches default to relevance; id breaks ties so pages are stable)
+    sort = args.get("sort") or ("relevance" if keyword else "posting_date_desc")
+    if sort != "relevance" and sort not in KEYSET_SORTS:
+        sort = "posting_date_desc"
+
+    # Select only the returned columns (plus the cursor key) instead of whole Job entities
+    sort_col = KEYSET_SORTS.get(sort, KEYSET_SORTS["posting_date_desc"])[0]
+    columns = job_columns(fields, extra=("id", sort_col.key))
+
+    # Filters
+    try:
+        query, rank = apply_job_filters(select(*columns), args, session=session, search=search)
+    except InvalidFilter as e:
+        raise InvalidListArgs(str(e))
+    if sort == "relevance" and rank is None:
+        sort = "posting_date_desc"
+
+    # Pagination
+    try:
+        page = int(args.get("page", 1))
+        page_size = min(MAX_PAGE_SIZE, max(1, int(args.get("page_size", 10))))
+    except (TypeError, ValueError):
+        page, page_size = 1, 10
+
+    # Cursor mode: ?cursor= (empty for the first page) seeks instead of OFFSET
+    cursor = args.get("cursor")
+    default_total = "0" if cursor is not None else "1"
+    include_total = args.get("include_total", default_total) not in ("0", "false")
+    count_query = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+
+    offset = (page - 1) * page_size
+    if cursor:
+        try:
+            payload = decode_cursor(cursor, sort)
+            if sort == "relevance":
+                offset = max(0, int(payload.get("o", 0)))
+            else:
+                offset = 0
+                query = apply_keyset(query, sort, payload)
+        except (InvalidCursor, TypeError, ValueError) as e:
+            raise InvalidListArgs(f"invalid cursor: {e}")
+    elif cursor is not None:
+        offset = 0
+
+    if sort == "relevance":
+        query = query.order_by(rank, Job.posting_date.desc().nulls_last(), Job.id.desc())
+    else:
+        col, desc, _nullable = KEYSET_SORTS[sort]
+        if desc:
+            query = query.order_by(col.desc().nulls_last(), Job.id.desc())
+        else:
+            query = query.order_by(col.asc().nulls_last(), Job.id.asc())
+
+    # cursor pages fetch one extra row to learn whether another page exists
+    limit = page_size if cursor is None else page_size + 1
+    query = query.offset(offset).limit(limit)
+
+    plan = JobListPlan(query, count_query, fields, sort, page, page_size, offset, cursor)
+
+    if session is not None:
+        latest = read_model_available(session)
+    if latest and _latest_serves(args, plan):
+        job_type = args.get("job_type")
+        job_type = job_type if job_type and job_type != "All" else None
+        snapshot = select(*(latest_jobs.c[col.key] for col in columns))
+        if job_type is not None:
+            snapshot = snapshot.where(latest_jobs.c.job_type == job_type)
+        snapshot = snapshot.order_by(*newest_first(latest_jobs)).offset(offset).limit(page_size)
+        plan = replace(plan, query=snapshot, count_query=latest_count_query(job_type), fallback=plan)
+    return plan
+
+
+def _latest_serves(args, plan: JobListPlan) -> bool:
+    """The landing request: newest first, page mode with its total, no filter but job_type."""
+    return (
+        plan.sort == "posting_date_desc" and plan.cursor is None and plan.count_query is not None
+        and not any(args.get(name) for name in ("location", "tag", "q") + GEO_ARGS)
+        and plan.page >= 1 and plan.offset + plan.page_size <= LATEST_JOBS_SIZE
+    )
+
+
+def job_list_body(plan: JobListPlan, rows, total) -> dict:
+    """The JSON body for `rows` (the result of plan.query) and `total` (of plan.count_query)."""
+    if plan.cursor is None:
+        jobs = rows_to_dicts(rows, plan.fields)
+        return {"jobs": jobs, "page": plan.page, "page_size": plan.page_size, "total": total}
+
+    has_more = len(rows) > plan.page_size
+    rows = rows[:plan.page_size]
+    next_cursor = None
+    if has_more:
+        if plan.sort == "relevance":
+            next_cursor = encode_cursor({"s": plan.sort, "o": plan.offset + plan.page_size})
+        else:
+            next_cursor = cursor_for_row(rows[-1], plan.sort)
+
+    body = {"jobs": rows_to_dicts(rows, plan.fields), "page_size": plan.page_size, "next_cursor": next_cursor}
+    if plan.count_query is not None:
+        body["total"] = total
+    return body
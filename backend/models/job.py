@@ -1,9 +1,30 @@
 # backend/models/job.py
-from datetime import datetime
+import hashlib
+import json
+from datetime import date, datetime
+from sqlalchemy import DDL, event, false
 # RIGHT
 from db import db
+from models.tag import Tag, job_tags
 
 
+def content_hash(data: dict) -> str:
+    """
+    Stable fingerprint of a job record's scraped fields. source_url is left out:
+    a record without one keeps the stored URL, so ingest compares it on its own.
+    """
+    pd = data.get("posting_date")
+    if isinstance(pd, date):
+        pd = pd.isoformat()
+    tags = data.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    payload = [
+        data.get("title"), data.get("company"), data.get("location"), pd,
+        data.get("job_type"), [t.strip() for t in tags if t and t.strip()],
+    ]
+    return hashlib.sha1(json.dumps(payload, separators=(",", ":")).encode()).hexdigest()
+
 
 class Job(db.Model):
     __tablename__ = "jobs"
@@ -12,19 +33,48 @@ class Job(db.Model):
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200), nullable=False)
+    # structured copy of location from the gazetteer (geo.place_columns); NULL when it can't be placed
+    city = db.Column(db.String(100), nullable=True)
+    country = db.Column(db.String(100), nullable=True)
+    is_remote = db.Column(db.Boolean, nullable=False, default=False, server_default=false())
     posting_date = db.Column(db.Date, nullable=True)
     job_type = db.Column(db.String(100), nullable=True)
-    tags = db.Column(db.Text, nullable=True)             # comma-separated
+    tags = db.Column(db.Text, nullable=True)             # comma-separated copy of tag_items, for display/FTS
     source_url = db.Column(db.String(500), nullable=True)
+    content_hash = db.Column(db.String(40), nullable=True)  # see content_hash(); lets re-scrapes skip no-op writes
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # avoid exact duplicates
+    # normalized tags (indexed, exact match); write through set_tags()
+    tag_items = db.relationship(Tag, secondary=job_tags, lazy="select")
+
+    # avoid exact duplicates; the other indexes follow the filter/sort paths of list_jobs
+    # (id is the keyset tiebreaker, job_type is the only equality filter)
     __table_args__ = (
         db.UniqueConstraint("title", "company", "location", name="uq_jobs_title_company_location"),
+        db.Index("ix_jobs_posting_date_id", "posting_date", "id"),
+        db.Index("ix_jobs_title_id", "title", "id"),
+        db.Index("ix_jobs_company_id", "company", "id"),
+        db.Index("ix_jobs_job_type_posting_date_id", "job_type", "posting_date", "id"),
+        db.Index("ix_jobs_job_type_title_id", "job_type", "title", "id"),
+        db.Index("ix_jobs_job_type_company_id", "job_type", "company", "id"),
+        # max(updated_at) for cache validators
+        db.Index("ix_jobs_updated_at_id", "updated_at", "id"),
+        # incremental scraping looks jobs up by their detail page URL
+        db.Index("ix_jobs_source_url", "source_url"),
+        # exact country / city / remote filters; radius searches are (country, city) IN (...)
+        db.Index("ix_jobs_country_city_id", "country", "city", "id"),
+        db.Index("ix_jobs_city_id", "city", "id"),
+        db.Index("ix_jobs_is_remote_posting_date_id", "is_remote", "posting_date", "id"),
     )
 
+    def set_tags(self, session, names):
+        """Replace this job's tags (list or comma-separated string) in both representations."""
+        tags = Tag.resolve(session, names)
+        self.tag_items = tags
+        self.tags = ",".join(t.name for t in tags) or None
+
     def to_dict(self):
         """Serialize for API responses."""
         return {
@@ -32,6 +82,9 @@ class Job(db.Model):
             "title": self.title,
             "company": self.company,
             "location": self.location,
+            "city": self.city,
+            "country": self.country,
+            "is_remote": bool(self.is_remote),
             "posting_date": self.posting_date.isoformat() if self.posting_date else None,
             "job_type": self.job_type,
             "tags": self.tags.split(",") if self.tags else [],
@@ -39,3 +92,37 @@ class Job(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# Postgres sorts NULLs first on DESC, so "posting_date DESC NULLS LAST" needs its own
+# index there (SQLite's default DESC order already puts NULLs last).
+db.Index(
+    "ix_jobs_posting_date_desc_id", Job.posting_date.desc().nulls_last(), Job.id.desc()
+).ddl_if(dialect="postgresql")
+db.Index(
+    "ix_jobs_job_type_posting_date_desc_id", Job.job_type, Job.posting_date.desc().nulls_last(), Job.id.desc()
+).ddl_if(dialect="postgresql")
+
+# Trigram indexes serve the substring (ILIKE '%x%') filters on location and tags. Raw
+# DDL rather than db.Index(postgresql_using=...): dialect keyword arguments make
+# SQLAlchemy import its whole Postgres dialect, ~70 ms of every SQLite cold start.
+event.listen(
+    Job.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+TRIGRAM_INDEXES = {"ix_jobs_location_trgm": "location", "ix_jobs_tags_trgm": "tags"}
+for _name, _column in TRIGRAM_INDEXES.items():
+    event.listen(
+        Job.__table__, "after_create",
+        DDL(f"CREATE INDEX IF NOT EXISTS {_name} ON jobs USING gin ({_column} gin_trgm_ops)")
+        .execute_if(dialect="postgresql"),
+    )
+
+# LSH band hashes of each job's title+company MinHash signature (see dedup.py);
+# the primary key serves bucket -> jobs lookups, the index the rewrites per job
+job_lsh_buckets = db.Table(
+    "job_lsh_buckets",
+    db.Column("bucket", db.BigInteger, primary_key=True),
+    db.Column("job_id", db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_job_lsh_buckets_job_id", "job_id"),
+)
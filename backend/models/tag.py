@@ -0,0 +1,93 @@
+# backend/models/tag.py
+from sqlalchemy import distinct, func, select
+from db import db, dialect_insert
+
+TAG_MAX_LENGTH = 100  # tags.name / tags.slug are String(100)
+
+
+def tag_slug(name: str) -> str:
+    """Case/whitespace-insensitive key used for exact tag matching."""
+    return " ".join((name or "").split()).lower()
+
+
+def clean_tag_names(names) -> list[str]:
+    """
+    Accept a list or a comma-separated string; strip, cut to TAG_MAX_LENGTH,
+    drop blanks, dedupe by slug (keep order).
+    """
+    if isinstance(names, str):
+        names = names.split(",")
+    out, seen = [], set()
+    for name in names or []:
+        name = " ".join(str(name).split())[:TAG_MAX_LENGTH].rstrip()
+        slug = tag_slug(name)
+        if slug and slug not in seen:
+            seen.add(slug)
+            out.append(name)
+    return out
+
+
+job_tags = db.Table(
+    "job_tags",
+    db.Column("job_id", db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("tag_id", db.Integer, db.ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # the primary key serves job -> tags; this one serves tag -> jobs lookups
+    db.Index("ix_job_tags_tag_id_job_id", "tag_id", "job_id"),
+)
+
+
+class Tag(db.Model):
+    __tablename__ = "tags"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    slug = db.Column(db.String(100), nullable=False, unique=True)
+
+    @classmethod
+    def resolve(cls, session, names) -> list["Tag"]:
+        """
+        Return Tag rows for `names`, creating the missing ones (one SELECT for the
+        lookup). New tags are inserted with ON CONFLICT DO NOTHING and selected
+        again, so a request creating the same tag at the same time is not an error.
+        """
+        names = clean_tag_names(names)
+        if not names:
+            return []
+
+        def lookup(slugs):
+            return {t.slug: t for t in session.scalars(select(cls).where(cls.slug.in_(slugs)))}
+
+        by_slug = lookup([tag_slug(n) for n in names])
+        missing = {}
+        for name in names:
+            slug = tag_slug(name)
+            if slug not in by_slug:
+                missing.setdefault(slug, name)
+        if missing:
+            make_insert = dialect_insert(session.get_bind().dialect.name)
+            rows = [{"name": name, "slug": slug} for slug, name in missing.items()]
+            if make_insert is None:
+                session.add_all(cls(**row) for row in rows)
+                session.flush()
+            else:
+                session.execute(make_insert(cls.__table__).on_conflict_do_nothing(index_elements=["slug"]), rows)
+            by_slug.update(lookup(list(missing)))
+        return [by_slug[tag_slug(n)] for n in names]
+
+
+def tag_filter(names, match_all: bool = True):
+    """
+    WHERE clause for jobs carrying the given tags (exact, case-insensitive).
+    match_all=True -> every tag must be present (AND); False -> any of them (OR).
+    """
+    from models.job import Job
+
+    slugs = [tag_slug(n) for n in clean_tag_names(names)]
+    sub = (
+        select(job_tags.c.job_id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .where(Tag.slug.in_(slugs))
+    )
+    if match_all and len(slugs) > 1:
+        sub = sub.group_by(job_tags.c.job_id).having(func.count(distinct(job_tags.c.tag_id)) == len(slugs))
+    return Job.id.in_(sub)
@@ -0,0 +1,79 @@
+# backend/pagination.py
+"""
+Keyset (cursor) pagination for GET /jobs.
+
+A cursor is an opaque, URL-safe token holding the sort name and the
+(sort value, id) of the last row on the previous page. The next page is
+fetched with a WHERE clause on that pair instead of OFFSET, so page N costs
+the same as page 1.
+"""
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import and_, or_
+
+from models.job import Job
+
+# sort name -> (column, descending?, nullable?)
+KEYSET_SORTS = {
+    "posting_date_desc": (Job.posting_date, True, True),
+    "posting_date_asc": (Job.posting_date, False, True),
+    "title_asc": (Job.title, False, False),
+    "company_asc": (Job.company, False, False),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: str) -> dict:
+    """Decode a cursor and check it belongs to the requested sort."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("cursor is malformed")
+    if not isinstance(payload, dict) or payload.get("s") != sort:
+        raise InvalidCursor("cursor does not match the requested sort")
+    return payload
+
+
+def cursor_for_row(job, sort: str) -> str:
+    """Build the cursor that continues after `job`."""
+    col, _desc, _nullable = KEYSET_SORTS[sort]
+    value = getattr(job, col.key)
+    if isinstance(value, date):
+        value = value.isoformat()
+    return encode_cursor({"s": sort, "v": value, "id": job.id})
+
+
+def apply_keyset(query, sort: str, payload: dict):
+    """Add the seek predicate for rows strictly after the cursor position."""
+    col, desc, nullable = KEYSET_SORTS[sort]
+    value, last_id = payload.get("v"), payload.get("id")
+    if not isinstance(last_id, int):
+        raise InvalidCursor("cursor is malformed")
+    if value is not None and col.key == "posting_date":
+        try:
+            value = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor("cursor is malformed")
+
+    after_id = Job.id < last_id if desc else Job.id > last_id
+
+    # NULLs sort last in both directions: once we're in the NULL tail only id moves on
+    if value is None:
+        return query.filter(col.is_(None), after_id)
+
+    after_value = col < value if desc else col > value
+    conds = [after_value, and_(col == value, after_id)]
+    if nullable:
+        conds.append(col.is_(None))
+    return query.filter(or_(*conds))
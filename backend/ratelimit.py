@@ -0,0 +1,113 @@
+# backend/ratelimit.py
+"""
+Per-client rate limiting for the API: a token bucket per (client IP, route).
+
+A bucket holds up to RATE_LIMIT_BURST requests and refills at
+RATE_LIMIT_PER_SECOND. A request takes one token; with none left it gets a
+429 with Retry-After (seconds until the next token) and never reaches the
+view, so a burst from one client cannot take every pooled connection.
+Routes have separate buckets, so paging through /jobs does not use up the
+budget for /jobs/suggest. Health checks, /metrics and CORS preflights are
+not limited.
+
+Off unless RATE_LIMIT_PER_SECOND is set. Buckets live in process memory:
+each worker limits on its own (N workers let a client through up to N
+times the rate). Behind a reverse proxy (Render, Vercel, nginx) the peer
+address is the proxy's, so every visitor would share one bucket: set
+RATE_LIMIT_TRUSTED_PROXIES to the number of proxies that append to
+X-Forwarded-For so the client's address is used.
+
+Env:
+  RATE_LIMIT_PER_SECOND       refill rate per client and route (default 0 = off; e.g. 10)
+  RATE_LIMIT_BURST            bucket size (default 40)
+  RATE_LIMIT_MAX_CLIENTS      buckets kept; the least recently used are dropped (default 10000)
+  RATE_LIMIT_TRUSTED_PROXIES  proxies in front of the app (default 0)
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify, request
+
+EXEMPT_ENDPOINTS = {"health", "health_cache", "health_db", "metrics", "static"}
+
+
+class TokenBuckets:
+    """Thread-safe in-memory token buckets, LRU-bounded."""
+
+    def __init__(self, rate: float, burst: float, max_entries: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()  # key -> (tokens, monotonic time of that count)
+        self._lock = threading.Lock()
+
+    def take(self, key) -> float:
+        """Take a token for `key`: 0.0 if allowed, else the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, at = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - at) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets = None  # None = disabled
+        self.trusted_proxies = 0
+        self.limited = 0
+
+    def init_app(self, app):
+        rate = float(os.getenv("RATE_LIMIT_PER_SECOND") or 0)
+        burst = float(os.getenv("RATE_LIMIT_BURST") or 40)
+        self.trusted_proxies = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES") or 0)
+        self.buckets = None
+        if rate > 0:
+            self.buckets = TokenBuckets(rate, max(1.0, burst), int(os.getenv("RATE_LIMIT_MAX_CLIENTS") or 10000))
+            app.before_request(self.check)
+        app.extensions["rate_limiter"] = self
+
+    def client_ip(self) -> str:
+        """The caller's address: the peer, or the entry the trusted proxies added to X-Forwarded-For."""
+        if self.trusted_proxies:
+            forwarded = [a.strip() for a in request.headers.get("X-Forwarded-For", "").split(",") if a.strip()]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        return request.remote_addr or "-"
+
+    def check(self):
+        """before_request hook: None to go on, or the 429 response."""
+        if request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS:
+            return None
+        wait = self.buckets.take((self.client_ip(), request.endpoint or "-"))
+        if not wait:
+            return None
+        self.limited += 1
+        retry_after = max(1, math.ceil(wait))
+        resp = jsonify(error="too many requests, slow down", retry_after=retry_after)
+        resp.status_code = 429
+        resp.headers["Retry-After"] = str(retry_after)
+        return resp
+
+    def stats(self) -> dict:
+        if self.buckets is None:
+            return {"enabled": False}
+        return {"enabled": True, "rate": self.buckets.rate, "burst": self.buckets.burst,
+                "clients": len(self.buckets), "limited": self.limited}
+
+
+rate_limiter = RateLimiter()
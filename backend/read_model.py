@@ -0,0 +1,228 @@
+# backend/read_model.py
+"""
+Precomputed read model for the landing request: GET /jobs, newest first,
+page mode, no filters except job_type.
+
+- latest_jobs: a copy of the newest LATEST_JOBS_SIZE jobs (default 500) in
+  the list order (posting_date DESC NULLS LAST, id DESC). Writers call
+  refresh_latest(session, ids) before committing; it re-reads only those
+  jobs, then trims the snapshot (or rebuilds it if rows dropped out).
+- job_type_counts: jobs per job_type ('' = none) and their newest
+  updated_at, kept exact by triggers on jobs, so the page total and
+  Last-Modified need no scan.
+
+The snapshot is always a prefix of the full newest-first order, and so is
+any job_type slice of it: a page it fills completely is exact. A page it
+cannot fill is re-run on the base table (JobListPlan.fallback). Databases
+without the tables (not migrated yet) always use the base table.
+
+    python read_model.py        # rebuild both tables from jobs
+"""
+import os
+
+from sqlalchemy import DDL, delete, event, false, func, inspect, insert, literal_column, select, text
+
+from db import SessionFactory, db
+from models.job import Job
+
+LATEST_JOBS_SIZE = int(os.getenv("LATEST_JOBS_SIZE", "500"))
+
+latest_jobs = db.Table(
+    "latest_jobs",
+    db.Column("id", db.Integer, primary_key=True, autoincrement=False),  # jobs.id
+    db.Column("title", db.String(200), nullable=False),
+    db.Column("company", db.String(200), nullable=False),
+    db.Column("location", db.String(200), nullable=False),
+    db.Column("city", db.String(100), nullable=True),
+    db.Column("country", db.String(100), nullable=True),
+    db.Column("is_remote", db.Boolean, nullable=False, default=False, server_default=false()),
+    db.Column("posting_date", db.Date, nullable=True),
+    db.Column("job_type", db.String(100), nullable=True),
+    db.Column("tags", db.Text, nullable=True),
+    db.Column("source_url", db.String(500), nullable=True),
+    db.Column("created_at", db.DateTime),
+    db.Column("updated_at", db.DateTime),
+)
+LATEST_COLUMNS = tuple(c.name for c in latest_jobs.c)
+
+job_type_counts = db.Table(
+    "job_type_counts",
+    db.Column("job_type", db.String(100), primary_key=True),
+    db.Column("n", db.Integer, nullable=False),
+    db.Column("last_updated_at", db.DateTime, nullable=True),
+)
+# the triggers below live on jobs: create it first, drop it last
+job_type_counts.add_is_dependent_on(Job.__table__)
+latest_jobs.add_is_dependent_on(Job.__table__)
+
+_NO_TYPE = literal_column("''")
+
+SQLITE_COUNTS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS jobs_counts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO job_type_counts (job_type, n, last_updated_at)
+        VALUES (coalesce(new.job_type, ''), 1, new.updated_at)
+        ON CONFLICT (job_type) DO UPDATE SET n = n + 1, last_updated_at = CASE
+            WHEN last_updated_at IS NULL OR excluded.last_updated_at > last_updated_at
+            THEN excluded.last_updated_at ELSE last_updated_at END;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_counts_ad AFTER DELETE ON jobs BEGIN
+        UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(old.job_type, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS jobs_counts_au AFTER UPDATE OF job_type, updated_at ON jobs BEGIN
+        UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(old.job_type, '');
+        INSERT INTO job_type_counts (job_type, n, last_updated_at)
+        VALUES (coalesce(new.job_type, ''), 1, new.updated_at)
+        ON CONFLICT (job_type) DO UPDATE SET n = n + 1, last_updated_at = CASE
+            WHEN last_updated_at IS NULL OR excluded.last_updated_at > last_updated_at
+            THEN excluded.last_updated_at ELSE last_updated_at END;
+    END""",
+]
+SQLITE_COUNTS_DROP = ["DROP TRIGGER IF EXISTS jobs_counts_au", "DROP TRIGGER IF EXISTS jobs_counts_ad",
+                      "DROP TRIGGER IF EXISTS jobs_counts_ai"]
+
+POSTGRES_COUNTS_DDL = [
+    """CREATE OR REPLACE FUNCTION job_type_counts_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE job_type_counts SET n = n - 1 WHERE job_type = coalesce(OLD.job_type, '');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO job_type_counts (job_type, n, last_updated_at)
+            VALUES (coalesce(NEW.job_type, ''), 1, NEW.updated_at)
+            ON CONFLICT (job_type) DO UPDATE SET n = job_type_counts.n + 1,
+                last_updated_at = greatest(job_type_counts.last_updated_at, EXCLUDED.last_updated_at);
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER jobs_counts AFTER INSERT OR DELETE OR UPDATE OF job_type, updated_at ON jobs
+        FOR EACH ROW EXECUTE FUNCTION job_type_counts_sync()""",
+]
+POSTGRES_COUNTS_DROP = ["DROP FUNCTION IF EXISTS job_type_counts_sync() CASCADE"]
+
+# fill from the rows already there (create_all on an existing jobs table)
+COUNTS_BACKFILL = """INSERT INTO job_type_counts (job_type, n, last_updated_at)
+    SELECT coalesce(job_type, ''), count(*), max(updated_at) FROM jobs GROUP BY coalesce(job_type, '')"""
+
+for _dialect, _create, _drop in (("sqlite", SQLITE_COUNTS_DDL, SQLITE_COUNTS_DROP),
+                                 ("postgresql", POSTGRES_COUNTS_DDL, POSTGRES_COUNTS_DROP)):
+    for _stmt in _create + [COUNTS_BACKFILL]:
+        event.listen(job_type_counts, "after_create", DDL(_stmt).execute_if(dialect=_dialect))
+    for _stmt in _drop:
+        event.listen(job_type_counts, "before_drop", DDL(_stmt).execute_if(dialect=_dialect))
+
+# and copy the newest jobs in
+event.listen(latest_jobs, "after_create", lambda target, conn, **kw: _rebuild_latest(conn))
+
+# engine url -> bool
+_available_cache = {}
+
+
+def detect_read_model(conn) -> bool:
+    """Probe a (sync) connection for both tables (the counts triggers exist for SQLite / Postgres only)."""
+    if conn.dialect.name not in ("sqlite", "postgresql"):
+        return False
+    insp = inspect(conn)
+    return insp.has_table("latest_jobs") and insp.has_table("job_type_counts")
+
+
+def read_model_available(session) -> bool:
+    """Whether the current database has the read model (cached per engine)."""
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key not in _available_cache:
+        _available_cache[key] = detect_read_model(session.connection())
+    return _available_cache[key]
+
+
+def newest_first(table):
+    """ORDER BY of GET /jobs?sort=posting_date_desc for `table` (jobs or latest_jobs)."""
+    return table.c.posting_date.desc().nulls_last(), table.c.id.desc()
+
+
+def _sort_key(row):
+    return row.posting_date is not None, row.posting_date, row.id
+
+
+def rebuild(conn):
+    """Recompute both tables from jobs (after bulk loads that bypass refresh_latest). Does not commit."""
+    job_type = func.coalesce(Job.job_type, _NO_TYPE)
+    conn.execute(delete(job_type_counts))
+    conn.execute(insert(job_type_counts).from_select(
+        ["job_type", "n", "last_updated_at"],
+        select(job_type, func.count(), func.max(Job.updated_at)).group_by(job_type),
+    ))
+    _rebuild_latest(conn)
+
+
+def _rebuild_latest(conn):
+    jobs = Job.__table__
+    conn.execute(delete(latest_jobs))
+    conn.execute(insert(latest_jobs).from_select(
+        list(LATEST_COLUMNS),
+        select(*(jobs.c[name] for name in LATEST_COLUMNS)).order_by(*newest_first(jobs)).limit(LATEST_JOBS_SIZE),
+    ))
+
+
+def refresh_latest(session, ids):
+    """
+    Bring latest_jobs up to date after the jobs `ids` were inserted, updated or
+    deleted in this transaction (flushed). Call before committing.
+    """
+    ids = list(ids)
+    if not ids or not read_model_available(session):
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        # one refresher at a time, until commit; SQLite writers are serialized already
+        session.execute(text("SELECT pg_advisory_xact_lock(hashtext('latest_jobs'))"))
+
+    t = latest_jobs
+    size = session.scalar(select(func.count()).select_from(t))
+    cutoff = None
+    if size >= LATEST_JOBS_SIZE:
+        cutoff = session.execute(
+            select(t.c.posting_date, t.c.id).order_by(*newest_first(t)).offset(LATEST_JOBS_SIZE - 1).limit(1)
+        ).first()
+
+    # drop the old copies, then copy back the ones that still sort inside the snapshot
+    size -= session.execute(delete(t).where(t.c.id.in_(ids))).rowcount
+    rows = session.execute(select(*(Job.__table__.c[name] for name in LATEST_COLUMNS)).where(Job.id.in_(ids))).all()
+    rows = [r for r in rows if cutoff is None or _sort_key(r) >= _sort_key(cutoff)]
+    if rows:
+        session.execute(insert(t), [r._asdict() for r in rows])
+        size += len(rows)
+
+    if size > LATEST_JOBS_SIZE:
+        extra = session.scalars(select(t.c.id).order_by(*newest_first(t)).offset(LATEST_JOBS_SIZE)).all()
+        session.execute(delete(t).where(t.c.id.in_(extra)))
+    elif size < min(LATEST_JOBS_SIZE, total_jobs(session)):
+        # rows left (or the size grew): refill from the base table, one index scan of N rows
+        _rebuild_latest(session)
+
+
+def total_jobs(session, job_type=None) -> int:
+    return session.scalar(count_query(job_type))
+
+
+def count_query(job_type=None):
+    """SELECT of the number of jobs (of `job_type`), from job_type_counts."""
+    query = select(func.coalesce(func.sum(job_type_counts.c.n), 0))
+    if job_type is not None:
+        query = query.where(job_type_counts.c.job_type == job_type)
+    return query
+
+
+def jobs_last_modified(session):
+    """Newest updated_at ever written (deleted jobs included), from job_type_counts."""
+    return session.scalar(select(func.max(job_type_counts.c.last_updated_at)))
+
+
+def main():
+    with SessionFactory()() as session:
+        rebuild(session)
+        session.commit()
+        print(f"latest_jobs: {session.scalar(select(func.count()).select_from(latest_jobs))} rows, "
+              f"job_type_counts: {total_jobs(session)} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,306 @@
 # backend/routes/job_routes.py
-from flask import Blueprint, request, jsonify, abort
+import os
+import time
+import zlib
+from flask import Blueprint, Response, current_app, request, jsonify, abort, stream_with_context
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import String, cast, func, literal, null, select, union_all
+from sqlalchemy.exc import IntegrityError
 # RIGHT
+from cache import response_cache
+from changes import (
+    DELETE, MAX_LIMIT as CHANGES_MAX_LIMIT, ExpiredToken, InvalidToken, Position, feed_available, maybe_prune,
+    parse_since, read_changes,
+)
 from db import db
-from models.job import Job
+from models.job import Job, content_hash
+from models.tag import Tag, job_tags
+from dedup import find_duplicates, fingerprint, index_jobs, merge_values, unindex_jobs
+from filters import InvalidFilter, apply_job_filters
+from geo import place_columns
+from ingest import bulk_upsert_jobs, job_fields_from_payload
+from listing import InvalidListArgs, job_list_body, plan_job_list
+from read_model import jobs_last_modified, read_model_available, refresh_latest
+from serializers import (
+    InvalidFields, csv_chunks, dumps, job_columns, json_response, ndjson_chunks, parse_fields, rows_to_dicts,
+)
+from suggest import (
+    FIELDS as SUGGEST_FIELDS, MAX_LIMIT as SUGGEST_MAX_LIMIT, MAX_PREFIX_LENGTH as SUGGEST_MAX_PREFIX, snapshot,
+    suggest_index,
+)
 
 
 job_bp = Blueprint("job_bp", __name__)
 
+
+def _jobs_last_modified():
+    """Newest updated_at in the table (Last-Modified for cached reads)."""
+    if read_model_available(db.session):
+        return jobs_last_modified(db.session)
+    return db.session.scalar(select(func.max(Job.updated_at)))
+
+
 @job_bp.get("/jobs")
+@response_cache.cached(last_modified=_jobs_last_modified)
 def list_jobs():
-    query = Job.query
-
-    # Filters
-    job_type = request.args.get("job_type")
-    location = request.args.get("location")
-    tag = request.args.get("tag")
-    keyword = request.args.get("q")
-
-    if job_type and job_type != "All":
-        query = query.filter(Job.job_type == job_type)
-
-    if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
-
-    if tag:
-        query = query.filter(Job.tags.ilike(f"%{tag}%"))
-
-    if keyword:
-        like = f"%{keyword}%"
-        query = query.filter(
-            or_(
-                Job.title.ilike(like),
-                Job.company.ilike(like),
-                Job.location.ilike(like),
-                Job.job_type.ilike(like),
-                Job.tags.ilike(like),
-            )
-        )
-
-    # Sorting
-    sort = request.args.get("sort", "posting_date_desc")
-    if sort == "posting_date_asc":
-        query = query.order_by(Job.posting_date.asc().nulls_last())
-    elif sort == "title_asc":
-        query = query.order_by(Job.title.asc())
-    elif sort == "company_asc":
-        query = query.order_by(Job.company.asc())
-    else:
-        query = query.order_by(Job.posting_date.desc().nulls_last())
-
-    # Pagination
+    # Query string -> SQL (filters, sort, page or cursor, fields); see listing.py
     try:
-        page = int(request.args.get("page", 1))
-        page_size = min(50, max(1, int(request.args.get("page_size", 10))))
+        plan = plan_job_list(request.args, session=db.session)
+    except InvalidListArgs as e:
+        abort(400, description=str(e))
+
+    total = db.session.scalar(plan.count_query) if plan.count_query is not None else None
+    rows = db.session.execute(plan.query).all()
+    if not plan.complete(rows, total):
+        plan = plan.fallback
+        rows = db.session.execute(plan.query).all()
+    return json_response(job_list_body(plan, rows, total))
+
+
+FACET_FIELDS = ("job_type", "location", "tag")
+# query args that filter on each facet's own field
+FACET_ARGS = {"job_type": ("job_type",), "location": ("location",), "tag": ("tag", "tag_mode")}
+
+
+def _facet_ids(name):
+    """
+    CTE of the ids matching the request's filters, minus facet `name`'s own
+    (None: all of them). Counting a facet without its own filter keeps the
+    other values listed once one is selected.
+    """
+    args = request.args
+    if name is not None:
+        if not any(args.get(a) for a in FACET_ARGS[name]):
+            return None  # nothing to drop: the facet shares the full filter
+        args = args.copy()
+        for a in FACET_ARGS[name]:
+            args.poplist(a)
+    filtered, _rank = apply_job_filters(select(Job.id), args, db.session)
+    return filtered.cte(f"filtered_jobs_{name}" if name else "filtered_jobs")
+
+
+@job_bp.get("/jobs/facets")
+@response_cache.cached(last_modified=_jobs_last_modified)
+def job_facets():
+    """
+    Per-value counts for job_type, location and tag: `total` under every
+    current filter, each facet under every filter except its own.
+    """
+    try:
+        limit = min(100, max(1, int(request.args.get("limit", 20))))
     except (TypeError, ValueError):
-        page, page_size = 1, 10
+        limit = 20
+
+    try:
+        ids = _facet_ids(None)
+        own = {f: _facet_ids(f) for f in FACET_FIELDS}
+    except InvalidFilter as e:
+        abort(400, description=str(e))
+    type_ids, location_ids, tag_ids = (own[f] if own[f] is not None else ids for f in FACET_FIELDS)
+
+    # one round trip: every facet is a GROUP BY branch of the same UNION ALL
+    facet, value, n = "facet", "value", "n"
+    stmt = union_all(
+        select(literal("total").label(facet), cast(null(), String).label(value), func.count().label(n))
+        .select_from(ids),
+        select(literal("job_type"), Job.job_type, func.count())
+        .join(type_ids, type_ids.c.id == Job.id)
+        .where(Job.job_type.isnot(None))
+        .group_by(Job.job_type),
+        select(literal("location"), Job.location, func.count())
+        .join(location_ids, location_ids.c.id == Job.id)
+        .group_by(Job.location),
+        select(literal("tag"), Tag.name, func.count())
+        .select_from(job_tags)
+        .join(tag_ids, tag_ids.c.id == job_tags.c.job_id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .group_by(Tag.id, Tag.name),
+    )
+
+    total = 0
+    facets = {f: [] for f in FACET_FIELDS}
+    for row in db.session.execute(stmt):
+        if row.facet == "total":
+            total = row.n
+        else:
+            facets[row.facet].append({"value": row.value, "count": row.n})
+    for f in FACET_FIELDS:
+        facets[f] = sorted(facets[f], key=lambda x: (-x["count"], x["value"]))[:limit]
 
-    total = query.count()
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
-    jobs = [j.to_dict() for j in items]
-    return jsonify(jobs=jobs, page=page, page_size=page_size, total=total), 200
+    resp = jsonify(total=total, facets=facets)
+    # sidebar data: let browsers/CDNs reuse it briefly and revalidate with the ETag
+    resp.headers["Cache-Control"] = "public, max-age=60"
+    return resp
+
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", ndjson_chunks),
+    "csv": ("text/csv; charset=utf-8", csv_chunks),
+}
+EXPORT_YIELD_PER = 1000
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@job_bp.get("/jobs/export")
+def export_jobs():
+    """
+    Stream every job matching the list filters as NDJSON (default) or CSV, in id
+    order. Rows come from a server-side cursor in batches, so memory stays flat;
+    the body is gzipped when the client accepts it. Not cached.
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        abort(400, description=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except InvalidFields as e:
+        abort(400, description=str(e))
+
+    try:
+        query, _rank = apply_job_filters(select(*job_columns(fields)), request.args, db.session)
+    except InvalidFilter as e:
+        abort(400, description=str(e))
+    query = query.order_by(Job.id).execution_options(yield_per=EXPORT_YIELD_PER)
+
+    mimetype, encode = EXPORT_FORMATS[fmt]
+
+    def generate():
+        rows = db.session.execute(query)
+        try:
+            yield from encode(rows, fields, batch=EXPORT_YIELD_PER)
+        finally:
+            rows.close()
+
+    body = generate()
+    headers = {
+        "Content-Disposition": f'attachment; filename="jobs.{fmt}"',
+        "Vary": "Accept-Encoding",
+    }
+    if "gzip" in request.accept_encodings:
+        body = _gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
+@job_bp.get("/jobs/suggest")
+def suggest_values():
+    """Autocomplete for ?field=company|location|title&prefix=..., from memory (see suggest.py)."""
+    field = request.args.get("field", "")
+    if field not in SUGGEST_FIELDS:
+        abort(400, description=f"field must be one of: {', '.join(SUGGEST_FIELDS)}")
+    prefix = request.args.get("prefix", "")
+    if len(prefix) > SUGGEST_MAX_PREFIX:
+        abort(400, description=f"prefix must be at most {SUGGEST_MAX_PREFIX} characters")
+    try:
+        limit = min(SUGGEST_MAX_LIMIT, max(1, int(request.args.get("limit", 10))))
+    except (TypeError, ValueError):
+        limit = 10
+
+    matches = suggest_index.lookup(field, prefix, limit)
+    resp = jsonify(field=field, prefix=prefix, suggestions=[{"value": v, "count": n} for v, n in matches])
+    # pick up other processes' writes once the response is out
+    resp.call_on_close(suggest_index.maintain)
+    return resp, 200
+
+
+def _changes_request(since):
+    """Validate a change feed request: (position, fields), or abort with 400 / 410 / 503."""
+    if not feed_available(db.session):
+        abort(503, description="change feed not set up: run alembic upgrade head")
+    try:
+        return parse_since(since), parse_fields(request.args.get("fields"))
+    except ExpiredToken as e:
+        abort(410, description=str(e))
+    except (InvalidToken, InvalidFields) as e:
+        abort(400, description=str(e))
+
+
+def _change_body(kind, at, job_id, row, fields) -> dict:
+    body = {"op": "delete" if kind == DELETE else "upsert", "id": job_id, "at": at.isoformat()}
+    if row is not None:
+        body["job"] = rows_to_dicts([row], fields)[0]
+    return body
+
+
+@job_bp.get("/jobs/changes")
+def job_changes():
+    """
+    Jobs inserted, updated or deleted since ?since=<token> (see changes.py):
+    {"changes": [{"op": "upsert"|"delete", "id", "at", "job"?}], "next", "has_more"}.
+    Omit since for everything, since=now to only follow what happens next.
+    """
+    position, fields = _changes_request(request.args.get("since"))
+    try:
+        limit = min(CHANGES_MAX_LIMIT, max(1, int(request.args.get("limit", 100))))
+    except (TypeError, ValueError):
+        limit = 100
+
+    changes, position, more = read_changes(db.session, position, limit, job_columns(fields))
+    resp = json_response({
+        "changes": [_change_body(*change, fields) for change in changes],
+        "next": position.encode(),
+        "has_more": more,
+    })
+    resp.headers["Cache-Control"] = "no-store"
+    resp.call_on_close(lambda engine=db.engine, logger=current_app.logger: maybe_prune(engine, logger))
+    return resp
+
+
+CHANGES_STREAM_SECONDS = float(os.getenv("CHANGES_STREAM_SECONDS", "300"))
+CHANGES_POLL_SECONDS = float(os.getenv("CHANGES_POLL_SECONDS", "2"))
+CHANGES_HEARTBEAT_SECONDS = 15
+
+
+@job_bp.get("/jobs/changes/stream")
+def stream_job_changes():
+    """
+    The change feed as Server-Sent Events: one `upsert` / `delete` event per
+    change, its id being the token to resume from (browsers resend it as
+    Last-Event-ID on reconnect), and a `checkpoint` when idle. The server polls
+    every CHANGES_POLL_SECONDS and ends the stream after CHANGES_STREAM_SECONDS
+    so a worker is not held forever; EventSource reconnects by itself.
+    """
+    position, fields = _changes_request(request.headers.get("Last-Event-ID") or request.args.get("since"))
+    columns = job_columns(fields)
+
+    def events():
+        nonlocal position
+        yield f"retry: {int(CHANGES_POLL_SECONDS * 1000)}\n\n"
+        deadline = time.monotonic() + CHANGES_STREAM_SECONDS
+        checkpoint_due = 0.0
+        while True:
+            changes, position, more = read_changes(db.session, position, CHANGES_MAX_LIMIT, columns)
+            db.session.rollback()  # don't keep a read transaction open between polls
+            for kind, at, job_id, row in changes:
+                token = Position(at, kind, job_id, position.start).encode()
+                data = dumps(_change_body(kind, at, job_id, row, fields)).decode()
+                yield f"id: {token}\nevent: {'delete' if kind == DELETE else 'upsert'}\ndata: {data}\n\n"
+            now = time.monotonic()
+            if changes:
+                checkpoint_due = now + CHANGES_HEARTBEAT_SECONDS
+            elif now >= checkpoint_due:
+                # moves Last-Event-ID up to the horizon (and keeps proxies from closing an idle stream)
+                yield f"id: {position.encode()}\nevent: checkpoint\ndata: {{}}\n\n"
+                checkpoint_due = now + CHANGES_HEARTBEAT_SECONDS
+            if now >= deadline:
+                return
+            if not more:
+                time.sleep(CHANGES_POLL_SECONDS)
+
+    headers = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}  # nginx: don't buffer the stream
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers=headers)
 
 
 @job_bp.get("/jobs/<int:job_id>")
+@response_cache.cached(last_modified=_jobs_last_modified)
 def get_job(job_id):
     job = Job.query.get(job_id)
     if not job:
@@ -72,44 +308,100 @@ def get_job(job_id):
     return jsonify(job=job.to_dict()), 200
 
 
+def _same_key_id(fields):
+    """Id of the stored job with exactly this (title, company, location), if any."""
+    return db.session.scalar(select(Job.id).where(
+        Job.title == fields["title"], Job.company == fields["company"], Job.location == fields["location"]))
+
+
+def _merge_new_job(job, fields):
+    """Fold a posted job into the stored `job` it duplicates, the way ingestion merges (dedup.merge_values)."""
+    before = snapshot(job)
+    merged = merge_values({"posting_date": job.posting_date, "job_type": job.job_type,
+                           "tags": job.tags, "source_url": job.source_url}, fields)
+    job.posting_date, job.job_type, job.source_url = merged["posting_date"], merged["job_type"], merged["source_url"]
+    job.set_tags(db.session, merged["tags"])
+    job.content_hash = content_hash(job.to_dict())
+    db.session.flush()
+    refresh_latest(db.session, [job.id])
+    db.session.commit()
+    response_cache.invalidate()
+    suggest_index.job_changed(before, job)
+    return jsonify(job=job.to_dict(), merged_into=job.id), 200
+
+
 @job_bp.post("/jobs")
 def create_job():
+    """
+    Create a job. One that repeats a stored job's title/company/location, or is
+    a near-duplicate of one (see dedup.py), is refused with 409 and
+    `duplicate_of`, so a person entering it by hand can decide; `?merge=1`
+    folds it into that job instead (200, `merged_into`), and
+    `?allow_duplicate=1` keeps near-duplicates as separate jobs.
+    """
     data = request.get_json() or {}
-    title = (data.get("title") or "").strip()
-    company = (data.get("company") or "").strip()
-    location = (data.get("location") or "").strip()
+    try:
+        fields = job_fields_from_payload(data)
+    except ValueError as e:
+        abort(400, description=str(e))
 
-    if not title or not company or not location:
-        abort(400, description="title, company, and location are required")
+    match_id, error = _same_key_id(fields), "this job already exists"
+    if match_id is None and request.args.get("allow_duplicate") != "1":
+        match = find_duplicates(db.session, [fingerprint(fields["title"], fields["company"], fields["location"])])[0]
+        match_id, error = (match[0] if match is not None else None), "a near-duplicate of this job already exists"
+    if match_id is not None:
+        if request.args.get("merge") == "1":
+            return _merge_new_job(db.session.get(Job, match_id), fields)
+        return jsonify(error=error, duplicate_of=match_id), 409
 
-    posting_date = None
-    posting_date_str = (data.get("posting_date") or "").strip()
-    if posting_date_str:
-        try:
-            posting_date = datetime.fromisoformat(posting_date_str).date()
-        except Exception:
-            abort(400, description="posting_date must be a valid date (YYYY-MM-DD)")
-
-    job = Job(
-        title=title,
-        company=company or "Unknown",
-        location=location or "Unknown",
-        posting_date=posting_date,
-        job_type=(data.get("job_type") or "").strip() or None,
-        tags=",".join(data.get("tags") or []) if isinstance(data.get("tags"), list) else (data.get("tags") or None),
-        source_url=(data.get("source_url") or "").strip() or None,
-    )
+    tags = fields.pop("tags")
+    job = Job(**fields, **place_columns(fields["location"]))
+    job.set_tags(db.session, tags)
+    # same fingerprint ingestion compares, so a later scrape of this job is "unchanged"
+    job.content_hash = content_hash(job.to_dict())
     db.session.add(job)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # the same key was inserted concurrently
+        db.session.rollback()
+        return jsonify(error="this job already exists", duplicate_of=_same_key_id(fields)), 409
+    index_jobs(db.session, [job])
+    refresh_latest(db.session, [job.id])
     db.session.commit()
+    response_cache.invalidate()
+    suggest_index.job_added(job)
     return jsonify(job=job.to_dict()), 201
 
 
+BULK_MAX_JOBS = 1000
+
+
+@job_bp.post("/jobs/bulk")
+def bulk_create_jobs():
+    """Upsert many jobs at once; per-row errors are reported, the rest is saved."""
+    data = request.get_json(silent=True)
+    records = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(records, list) or not records:
+        abort(400, description="body must be a non-empty list of jobs (or {\"jobs\": [...]})")
+    if len(records) > BULK_MAX_JOBS:
+        abort(400, description=f"at most {BULK_MAX_JOBS} jobs per request")
+
+    result = bulk_upsert_jobs(db.session, records)
+    db.session.commit()
+    if result["inserted"] or result["updated"]:
+        response_cache.invalidate()
+        suggest_index.catch_up()
+    return jsonify(result), 200
+
+
 @job_bp.put("/jobs/<int:job_id>")
 @job_bp.patch("/jobs/<int:job_id>")
 def update_job(job_id):
     job = Job.query.get(job_id)
     if not job:
         abort(404, description="Job not found")
+    before = snapshot(job)
 
     data = request.get_json() or {}
 
@@ -130,6 +422,8 @@ def update_job(job_id):
         if not data["location"]:
             abort(400, description="location cannot be empty")
         job.location = data["location"].strip()
+        for column, value in place_columns(job.location).items():
+            setattr(job, column, value)
 
     if "posting_date" in data:
         val = (data.get("posting_date") or "").strip()
@@ -145,13 +439,16 @@ def update_job(job_id):
         job.job_type = (data.get("job_type") or "").strip() or None
 
     if "tags" in data:
-        tags = data.get("tags")
-        if isinstance(tags, list):
-            job.tags = ",".join(tags)
-        else:
-            job.tags = tags or None
+        job.set_tags(db.session, data.get("tags"))
 
+    if data.keys() & {"title", "company", "location"}:
+        index_jobs(db.session, [job])
+    job.content_hash = content_hash(job.to_dict())
+    db.session.flush()
+    refresh_latest(db.session, [job.id])
     db.session.commit()
+    response_cache.invalidate()
+    suggest_index.job_changed(before, job)
     return jsonify(job=job.to_dict()), 200
 
 
@@ -160,6 +457,12 @@ def delete_job(job_id):
     job = Job.query.get(job_id)
     if not job:
         abort(404, description="Job not found")
+    before = snapshot(job)
+    unindex_jobs(db.session, [job_id])
     db.session.delete(job)
+    db.session.flush()
+    refresh_latest(db.session, [job_id])
     db.session.commit()
+    response_cache.invalidate()
+    suggest_index.job_removed(before)
     return jsonify(message="Job deleted"), 200
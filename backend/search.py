@@ -0,0 +1,139 @@
+# backend/search.py
+"""
+Full-text search for the `q` parameter of GET /jobs.
+
+- SQLite: an external-content FTS5 table `jobs_fts`, kept in sync with
+  `jobs` by triggers, ranked with bm25().
+- Postgres: a generated `jobs.search_vector` tsvector column with a GIN
+  index, ranked with ts_rank_cd().
+
+The DDL is attached to the `jobs` table so `db.create_all()` builds it too;
+existing databases get it from the Alembic migration. When neither is
+present (e.g. MySQL, or an un-migrated DB) we fall back to ILIKE.
+"""
+import re
+
+from sqlalchemy import DDL, event, func, literal_column, or_, table, column, text
+
+from models.job import Job
+
+FTS_TABLE = "jobs_fts"
+
+# Column weights for bm25(): title, company, location, job_type, tags
+BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 3.0)
+
+SQLITE_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, company, location, job_type, tags,
+        content='jobs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, job_type, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.job_type, new.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, job_type, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.job_type, old.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au
+        AFTER UPDATE OF title, company, location, job_type, tags ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, location, job_type, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.job_type, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, location, job_type, tags)
+        VALUES (new.id, new.title, new.company, new.location, new.job_type, new.tags);
+    END""",
+]
+
+POSTGRES_FTS_DDL = [
+    """ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(tags, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(location, '') || ' ' || coalesce(job_type, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)",
+]
+
+for _stmt in SQLITE_FTS_DDL:
+    event.listen(Job.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in POSTGRES_FTS_DDL:
+    event.listen(Job.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_fts = table(FTS_TABLE, column("rowid"))
+_search_vector = literal_column("jobs.search_vector")
+
+# engine url -> "sqlite" | "postgresql" | None
+_backend_cache = {}
+
+
+def detect_search_backend(conn, dialect: str) -> str | None:
+    """Probe a (sync) session or connection for the FTS5 table / tsvector column."""
+    if dialect == "sqlite":
+        found = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        return "sqlite" if found else None
+    if dialect == "postgresql":
+        found = conn.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'jobs' AND column_name = 'search_vector'"
+        )).first()
+        return "postgresql" if found else None
+    return None
+
+
+def search_backend(session) -> str | None:
+    """Which full-text backend the current database supports (cached per engine)."""
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key not in _backend_cache:
+        _backend_cache[key] = detect_search_backend(session, bind.dialect.name)
+    return _backend_cache[key]
+
+
+def search_tokens(keyword: str) -> list[str]:
+    """Split a free-text query into lowercase word tokens."""
+    return _TOKEN_RE.findall((keyword or "").lower())
+
+
+def apply_keyword_filter(query, backend: str | None, keyword: str):
+    """
+    Restrict `query` (a Job query/select) to rows matching `keyword`, using the
+    full-text `backend` from search_backend() ("sqlite", "postgresql" or None).
+    Returns (query, rank) where `rank` is an ORDER BY clause for relevance,
+    or None when only the ILIKE fallback is available.
+    """
+    tokens = search_tokens(keyword)
+    if not tokens:
+        backend = None
+
+    if backend == "sqlite":
+        # prefix match every token: "act"* "pric"*  (implicit AND)
+        match = " ".join(f'"{t}"*' for t in tokens)
+        query = query.join(_fts, _fts.c.rowid == Job.id).filter(
+            literal_column(FTS_TABLE).op("MATCH")(match)
+        )
+        rank = func.bm25(literal_column(FTS_TABLE), *BM25_WEIGHTS).asc()
+        return query, rank
+
+    if backend == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in tokens))
+        query = query.filter(_search_vector.op("@@")(tsquery))
+        rank = func.ts_rank_cd(_search_vector, tsquery).desc()
+        return query, rank
+
+    like = f"%{keyword}%"
+    query = query.filter(
+        or_(
+            Job.title.ilike(like),
+            Job.company.ilike(like),
+            Job.location.ilike(like),
+            Job.job_type.ilike(like),
+            Job.tags.ilike(like),
+        )
+    )
+    return query, None
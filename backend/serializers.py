@@ -0,0 +1,115 @@
+# backend/serializers.py
+"""
+Fast path for list responses: select only the columns the API returns and
+turn result rows straight into JSON, skipping ORM entity hydration and
+Job.to_dict(). Uses orjson when it is installed (dates are encoded natively),
+the stdlib json module otherwise. Output matches Job.to_dict().
+"""
+import csv
+import io
+import json
+from datetime import date
+
+from flask import Response
+
+from models.job import Job
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+# public fields, in to_dict() order
+JOB_FIELDS = (
+    "id", "title", "company", "location", "city", "country", "is_remote", "posting_date", "job_type",
+    "tags", "source_url", "created_at", "updated_at",
+)
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def parse_fields(raw: str | None) -> tuple:
+    """`fields=id,title` -> ("id", "title"); None/empty -> every field."""
+    if not raw:
+        return JOB_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown:
+        raise InvalidFields(f"unknown field(s): {', '.join(unknown)}")
+    return fields or JOB_FIELDS
+
+
+def job_columns(fields, extra=()):
+    """Columns to select: the requested fields, then any extra ones (e.g. cursor keys)."""
+    names = list(fields) + [c for c in extra if c not in fields]
+    return [getattr(Job, name) for name in names]
+
+
+def rows_to_dicts(rows, fields) -> list[dict]:
+    """Rows selected with job_columns(fields, ...) -> API dicts (extra columns dropped)."""
+    split_tags = "tags" in fields
+    out = []
+    for row in rows:
+        d = dict(zip(fields, row))
+        if split_tags:
+            tags = d["tags"]
+            d["tags"] = tags.split(",") if tags else []
+        out.append(d)
+    return out
+
+
+def _default(obj):
+    if isinstance(obj, date):  # date and datetime
+        return obj.isoformat()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode()
+
+
+def json_response(obj, status: int = 200) -> Response:
+    return Response(dumps(obj), status=status, mimetype="application/json")
+
+
+def ndjson_chunks(rows, fields, batch: int = 1000):
+    """Rows -> NDJSON text, one chunk per `batch` rows (one JSON object per line)."""
+    buf = []
+    for row in rows:
+        d = dict(zip(fields, row))
+        if "tags" in d:
+            d["tags"] = d["tags"].split(",") if d["tags"] else []
+        buf.append(dumps(d))
+        if len(buf) >= batch:
+            yield b"\n".join(buf) + b"\n"
+            buf = []
+    if buf:
+        yield b"\n".join(buf) + b"\n"
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(rows, fields, batch: int = 1000):
+    """Rows -> CSV with a header line; tags stay comma-separated in one quoted cell."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    n = 0
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row[:len(fields)]])
+        n += 1
+        if n % batch == 0:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue().encode()
@@ -0,0 +1,281 @@
+# backend/suggest.py
+"""
+Autocomplete for company, location and title (GET /jobs/suggest), served
+from memory.
+
+Each field keeps the distinct values in the jobs table with their job
+counts, and a sorted list of lookup keys: the normalized value and every
+word-start suffix of it, so "pric" finds "Senior Pricing Actuary". A prefix
+is a bisect into that list. When it matches fewer than `limit` values, every
+spelling one edit away (deletion, insertion, substitution, transposition) is
+looked up too, so "aviav" and "londno" still complete. That pass only runs
+for prefixes of FUZZY_MIN_LENGTH to FUZZY_MAX_LENGTH characters: the number
+of variants grows with the square of the length. Results are ranked
+exact-prefix first, then by job count.
+
+The first lookup starts building the index in a background thread (app
+startup does not touch the database); until it is ready lookups return
+nothing rather than scanning the table on the request path (a failed build
+is retried by a later lookup, at most every SUGGEST_REFRESH seconds).
+Lookups and updates hold one lock, so a lookup never sees the sorted lists
+half-updated. The write routes apply their own changes to it right after
+committing. Writes from other processes (the scraper, other workers) are
+picked up after a suggest response has been sent: every SUGGEST_REFRESH
+seconds (default 10) rows with a newer updated_at are added, and every
+SUGGEST_REBUILD seconds (default 300) the index is rebuilt, which also drops
+values that were deleted elsewhere and corrects the counts.
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from models.job import Job
+
+FIELDS = ("company", "location", "title")
+MAX_LIMIT = 50
+MAX_SCAN = 1000  # keys read per prefix; very short prefixes rank only the first ones
+FUZZY_MIN_LENGTH = 3  # shorter prefixes are too ambiguous to correct
+FUZZY_MAX_LENGTH = 30  # one-edit variants grow with the square of the length; longer prefixes match exactly
+MAX_PREFIX_LENGTH = 100  # the route refuses longer prefixes
+MAX_WORD_STARTS = 6
+# catch-up re-reads this far behind the watermark (commits land out of updated_at order)
+CATCH_UP_OVERLAP = timedelta(seconds=60)
+
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789 "
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII words separated by single spaces ("Zürich, CH" -> "zurich ch")."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return _NON_WORD_RE.sub(" ", text.replace("'", "")).strip()
+
+
+def _keys(value: str) -> set:
+    words = normalize(value).split()
+    return {" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_STARTS))}
+
+
+def _edits(text: str) -> set:
+    """Every string one deletion, transposition, substitution or insertion away."""
+    splits = [(text[:i], text[i:]) for i in range(len(text) + 1)]
+    edits = {a + b[1:] for a, b in splits if b}
+    edits |= {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+    edits |= {a + c + b[1:] for a, b in splits if b for c in _ALPHABET}
+    edits |= {a + c + b for a, b in splits for c in _ALPHABET}
+    edits.discard(text)
+    return {e.strip() for e in edits if e.strip()}
+
+
+class FieldIndex:
+    """One field's distinct values (value -> job count) and their sorted lookup keys."""
+
+    def __init__(self, counts: dict):
+        self.counts = dict(counts)
+        entries = sorted((key, value) for value in self.counts for key in _keys(value))
+        self.keys = [key for key, _ in entries]
+        self.values = [value for _, value in entries]
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, value: str, n: int = 1):
+        if not value:
+            return
+        if value not in self.counts:
+            self.counts[value] = 0
+            for key in _keys(value):
+                i = bisect_left(self.keys, key)
+                self.keys.insert(i, key)
+                self.values.insert(i, value)
+        self.counts[value] += n
+
+    def discard(self, value: str, n: int = 1):
+        if value not in self.counts:
+            return
+        self.counts[value] -= n
+        if self.counts[value] > 0:
+            return
+        del self.counts[value]
+        for key in _keys(value):
+            i = bisect_left(self.keys, key)
+            while i < len(self.keys) and self.keys[i] == key:
+                if self.values[i] == value:
+                    del self.keys[i], self.values[i]
+                    break
+                i += 1
+
+    def _scan(self, prefix: str, found: set, cap: int):
+        keys, values = self.keys, self.values
+        i = bisect_left(keys, prefix)
+        end = min(len(keys), i + cap)
+        while i < end and keys[i].startswith(prefix):
+            found.add(values[i])
+            i += 1
+
+    def lookup(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        """Up to `limit` (value, count): prefix matches, then one-edit matches."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        def rank(value):
+            return -self.counts.get(value, 0), value.lower()
+
+        exact = set()
+        self._scan(prefix, exact, MAX_SCAN)
+        results = sorted(exact, key=rank)[:limit]
+        if len(results) < limit and FUZZY_MIN_LENGTH <= len(prefix) <= FUZZY_MAX_LENGTH:
+            fuzzy = set()
+            for variant in _edits(prefix):
+                self._scan(variant, fuzzy, limit * 4)
+            results += sorted(fuzzy - exact, key=rank)[:limit - len(results)]
+        return [(v, self.counts.get(v, 0)) for v in results]
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.db = None
+        self.engine = None
+        self.logger = None
+        self.fields = {}
+        self.refresh_every = 10.0
+        self.rebuild_every = 300.0
+        self.built_at = self.synced_at = 0.0
+        self.watermark = None  # newest jobs.updated_at seen
+        self._build_started = None  # monotonic time of the last background build
+        self._build_lock = threading.Lock()  # one build / refresh at a time
+        self._lock = threading.Lock()  # guards the FieldIndex lists: lookups and updates
+
+    def init_app(self, app, db):
+        """Configure only: nothing touches the database until the first lookup (see start)."""
+        self.db = db
+        self.logger = app.logger
+        self.refresh_every = float(os.getenv("SUGGEST_REFRESH", "10"))
+        self.rebuild_every = float(os.getenv("SUGGEST_REBUILD", "300"))
+        app.extensions["suggest_index"] = self
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.fields)
+
+    def start(self):
+        """Build the index in a background thread, unless built or a build started within SUGGEST_REFRESH."""
+        if self.ready or (self._build_started is not None
+                          and time.monotonic() - self._build_started < self.refresh_every):
+            return
+        if self.engine is None:
+            self.engine = self.db.engine  # called from a request: the app context is there
+        self._build_started = time.monotonic()
+        threading.Thread(target=self._build, name="suggest-index", daemon=True).start()
+
+    def _build(self):
+        if not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            if not self.ready:
+                self.rebuild()
+        except SQLAlchemyError as e:
+            self.logger.warning("suggest index build failed: %s", getattr(e, "orig", e))
+        finally:
+            self._build_lock.release()
+
+    def lookup(self, field: str, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        """Up to `limit` (value, count) for `prefix`; nothing while the index is still being built."""
+        if not self.ready:
+            self.start()
+            return []
+        with self._lock:
+            return self.fields[field].lookup(prefix, limit)
+
+    # -- changes made by this process (call after committing) --
+
+    def job_added(self, job):
+        self._apply(None, snapshot(job))
+
+    def job_changed(self, before: dict, job):
+        self._apply(before, snapshot(job))
+
+    def job_removed(self, before: dict):
+        self._apply(before, None)
+
+    def _apply(self, old, new):
+        if not self.ready:
+            return  # the build reads the committed change from the table
+        with self._lock:
+            for field, index in self.fields.items():
+                if old and new and old[field] == new[field]:
+                    continue
+                if old:
+                    index.discard(old[field])
+                if new:
+                    index.add(new[field])
+
+    # -- everything else, from the database --
+
+    def rebuild(self):
+        """Recount every field from the jobs table and swap the new index in."""
+        started = time.monotonic()
+        fields = {}
+        with self.engine.connect() as conn:
+            watermark = conn.scalar(select(func.max(Job.updated_at)))
+            for field in FIELDS:
+                column = getattr(Job, field)
+                fields[field] = FieldIndex(dict(conn.execute(select(column, func.count()).group_by(column)).all()))
+        with self._lock:
+            self.fields, self.watermark = fields, watermark
+        self.built_at = self.synced_at = started
+
+    def catch_up(self):
+        """Add the values of jobs written since the watermark (counts are fixed by the next rebuild)."""
+        if not self.ready:
+            return
+        started = time.monotonic()
+        query = select(Job.updated_at, *(getattr(Job, f) for f in FIELDS))
+        if self.watermark is not None:
+            query = query.where(Job.updated_at >= self.watermark - CATCH_UP_OVERLAP)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        with self._lock:
+            for updated_at, *values in rows:
+                for field, value in zip(FIELDS, values):
+                    if value not in self.fields[field].counts:
+                        self.fields[field].add(value)
+                if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+                    self.watermark = updated_at
+        self.synced_at = started
+
+    def maintain(self):
+        """Catch up or rebuild when due; meant to run after a response went out."""
+        if not self.ready or not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if now - self.built_at >= self.rebuild_every:
+                self.rebuild()
+            elif now - self.synced_at >= self.refresh_every:
+                self.catch_up()
+        except SQLAlchemyError as e:
+            self.synced_at = time.monotonic()  # retry on the next interval, not on every request
+            self.logger.warning("suggest index refresh failed: %s", getattr(e, "orig", e))
+        finally:
+            self._build_lock.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {field: {"values": len(index), "keys": len(index.keys)} for field, index in self.fields.items()}
+
+
+def snapshot(job) -> dict:
+    """The suggest fields of `job` (take it before changing the job)."""
+    return {field: getattr(job, field) for field in FIELDS}
+
+
+suggest_index = SuggestIndex()
@@ -0,0 +1,49 @@
+# backend/tests/conftest.py
+"""
+Backend tests on a fresh SQLite file per test (no server, no network).
+
+    python -m pytest -q backend/tests
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)  # backend/ modules import each other as top-level names
+
+from db import SessionFactory, db, import_models  # noqa: E402
+
+import_models()
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return "sqlite:///" + str(tmp_path / "jobs.db")
+
+
+@pytest.fixture
+def session(db_url):
+    """A session on an empty database with every table, trigger and FTS index created."""
+    factory = SessionFactory(db_url)
+    db.metadata.create_all(factory.engine)
+    with factory() as sess:
+        yield sess
+    factory.dispose()
+
+
+@pytest.fixture
+def client(db_url, monkeypatch):
+    """Test client of an app on its own empty database (response cache off)."""
+    monkeypatch.setenv("DATABASE_URL", db_url)
+    monkeypatch.setenv("DB_AUTO_CREATE", "1")
+    monkeypatch.setenv("CACHE_TTL", "0")
+    monkeypatch.delenv("CACHE_URL", raising=False)
+    monkeypatch.delenv("RATE_LIMIT_PER_SECOND", raising=False)
+    from app import create_app
+
+    app = create_app()
+    yield app.test_client()
+    with app.app_context():
+        db.engine.dispose()
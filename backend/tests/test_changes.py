@@ -0,0 +1,89 @@
+# backend/tests/test_changes.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, update
+
+import changes
+from changes import DELETE, UPSERT, ExpiredToken, InvalidToken, Position, parse_since, read_changes
+from models.job import Job
+
+
+@pytest.fixture(autouse=True)
+def no_settle(monkeypatch):
+    monkeypatch.setattr(changes, "SETTLE", timedelta(0))
+
+
+def write(session, *titles):
+    jobs = [Job(title=t, company="Aviva", location="London") for t in titles]
+    session.add_all(jobs)
+    session.commit()
+    return [j.id for j in jobs]
+
+
+def drain(session, position, limit=2):
+    """Every change after `position`, `limit` per page: ([(kind, id)], last position)."""
+    out, more = [], True
+    while more:
+        page, position, more = read_changes(session, position, limit, [Job.title])
+        out += [(kind, id_) for kind, _at, id_, _row in page]
+    return out, position
+
+
+def test_token_round_trip():
+    at = datetime.utcnow().replace(microsecond=0)
+    position = Position(at, DELETE, 42, start=at - timedelta(hours=1))
+    assert parse_since(position.encode()) == position
+
+
+def test_bad_and_expired_tokens():
+    with pytest.raises(InvalidToken):
+        parse_since("bogus")
+    old = datetime.utcnow() - changes.RETENTION - timedelta(days=1)
+    with pytest.raises(ExpiredToken):
+        parse_since(Position(old, UPSERT, 1, start=old).encode())
+
+
+def test_full_sync_then_incremental(session):
+    a, b, c = write(session, "A", "B", "C")
+    seen, position = drain(session, parse_since(None))
+    assert seen == [(UPSERT, a), (UPSERT, b), (UPSERT, c)]
+    assert drain(session, position)[0] == []
+
+    # an update moves a job to the end; a delete leaves a tombstone after it
+    session.execute(update(Job).where(Job.id == a).values(title="A2", updated_at=datetime.utcnow()))
+    session.commit()
+    session.execute(delete(Job).where(Job.id == b))
+    session.commit()
+    (d,) = write(session, "D")
+    seen, position = drain(session, position)
+    assert seen == [(UPSERT, a), (DELETE, b), (UPSERT, d)]
+    assert drain(session, position)[0] == []
+
+
+def test_same_instant_orders_upsert_before_delete_then_id(session):
+    a, b, c = write(session, "A", "B", "C")
+    start = parse_since(None)
+    session.execute(delete(Job).where(Job.id.in_([a, c])))
+    session.commit()
+    # pin everything to one instant: the feed breaks ties on (kind, id)
+    at = datetime.utcnow()  # after the full sync started, so its deletes concern it
+    session.execute(update(Job).values(updated_at=at))
+    session.execute(update(changes.job_tombstones).values(deleted_at=at))
+    session.commit()
+    for limit in (1, 2, 10):  # page boundaries inside the tie
+        assert drain(session, start, limit)[0] == [(UPSERT, b), (DELETE, a), (DELETE, c)]
+
+
+def test_deletes_before_a_full_sync_are_not_sent(session):
+    (a,) = write(session, "A")
+    session.execute(delete(Job).where(Job.id == a))
+    session.commit()
+    assert drain(session, parse_since(None))[0] == []
+
+
+def test_since_now_only_follows_new_changes(session):
+    write(session, "A")
+    position = parse_since("now")
+    (b,) = write(session, "B")
+    assert drain(session, position)[0] == [(UPSERT, b)]
@@ -0,0 +1,121 @@
+# backend/tests/test_dedup.py
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from dedup import (
+    canonicalize, find_duplicates, fingerprint, index_jobs, is_duplicate, merge_values, normalize_company,
+    normalize_location, normalize_title, rescan,
+)
+from models.job import Job
+
+
+def add_jobs(session, *keys, **values):
+    """Insert jobs (title, company, location) in order and index them like the write paths do."""
+    jobs = [Job(title=t, company=c, location=loc, **values) for t, c, loc in keys]
+    session.add_all(jobs)
+    session.flush()
+    index_jobs(session, jobs)
+    return jobs
+
+
+def test_normalization():
+    assert normalize_title("Sr. Mgr, Risk & Pricing") == "senior manager risk and pricing"
+    assert normalize_company("The Hartford Insurance Co") == "hartford insurance"
+    assert normalize_company("Smith & Co Ltd") == "smith"
+    assert normalize_location("London, UK") == {"london", "united kingdom"}
+    # parts are comma-separated: without the comma it is one unknown place
+    assert normalize_location("London UK") == {"london uk"}
+
+
+def test_fingerprint_buckets_ignore_location():
+    # band hashes come from title + company only; location is checked in is_duplicate
+    a = fingerprint("Senior Pricing Actuary", "Aviva", "London")
+    assert a.buckets == fingerprint("Senior Pricing Actuary", "Aviva", "Leeds").buckets
+    assert a.buckets == fingerprint("Sr Pricing Actuary", "Aviva plc", "London, UK").buckets
+    assert a.buckets != fingerprint("Senior Pricing Actuary", "Allianz", "London").buckets
+
+
+@pytest.mark.parametrize("other, expected", [
+    (("Sr Pricing Actuary", "Aviva plc", "London, UK"), True),  # abbreviation, suffix, wider location
+    (("Senior Pricing Actuary", "Aviva", "Paris"), False),  # disjoint locations
+    (("Senior Pricing Actuary", "Allianz", "London"), False),  # other company
+    (("Senior Pricing Actuary Life", "Aviva", "London"), False),  # Jaccard 5/7 < 0.75
+    (("Valuation Analyst", "Aviva", "London"), False),
+])
+def test_is_duplicate(other, expected):
+    base = fingerprint("Senior Pricing Actuary", "Aviva", "London")
+    assert is_duplicate(base, fingerprint(*other)) is expected
+    assert is_duplicate(fingerprint(*other), base) is expected
+
+
+def test_is_duplicate_threshold():
+    a = fingerprint("Senior Pricing Actuary", "Aviva", "London")
+    b = fingerprint("Senior Pricing Actuary Life", "Aviva", "London")
+    assert not is_duplicate(a, b, threshold=0.75)
+    assert is_duplicate(a, b, threshold=0.7)
+
+
+def test_find_duplicates_prefers_exact_key_then_oldest(session):
+    old, exact = add_jobs(session, ("Sr Pricing Actuary", "Aviva", "London"),
+                          ("Senior Pricing Actuary", "Aviva", "London"))
+    fp = fingerprint("Senior Pricing Actuary", "Aviva", "London")
+    assert find_duplicates(session, [fp])[0] == (exact.id, *fp.key)
+    near = fingerprint("Senior Pricing Actuary", "Aviva plc", "London, UK")
+    assert find_duplicates(session, [near])[0][0] == old.id
+    # with ids, only older jobs count
+    assert find_duplicates(session, [fp], ids=[old.id]) == [None]
+    assert find_duplicates(session, [fingerprint("Valuation Analyst", "QBE", "Remote")]) == [None]
+
+
+def test_canonicalize_against_stored_and_within_batch(session):
+    (stored,) = add_jobs(session, ("Senior Pricing Actuary", "Aviva", "London"))
+    records = [
+        {"title": "Sr Pricing Actuary", "company": "Aviva plc", "location": "London, UK"},  # stored job
+        {"title": "Valuation Analyst", "company": "QBE", "location": "Remote"},  # new
+        {"title": "Valuation Analyst", "company": "QBE Ltd", "location": "Remote"},  # the record before it
+        {"title": "Senior Pricing Actuary", "company": "Aviva", "location": "London"},  # exact key: not re-keyed
+    ]
+    out, rekeyed = canonicalize(session, records)
+    assert rekeyed == [True, False, True, False]
+    key = lambda r: (r["title"], r["company"], r["location"])  # noqa: E731
+    assert key(out[0]) == (stored.title, stored.company, stored.location)
+    assert key(out[2]) == ("Valuation Analyst", "QBE", "Remote")
+    assert out[1] is records[1] and out[3] is records[3]
+
+
+def test_merge_values():
+    kept = {"title": "T", "tags": ["SQL", "Life"], "posting_date": date(2025, 1, 5), "job_type": None,
+            "source_url": "http://a/1"}
+    dup = {"title": "X", "tags": "life, Python", "posting_date": date(2025, 2, 1), "job_type": "Actuary",
+           "source_url": "http://b/2"}
+    merged = merge_values(kept, dup)
+    assert merged == {"title": "T", "tags": ["SQL", "Life", "Python"], "posting_date": date(2025, 2, 1),
+                      "job_type": "Actuary", "source_url": "http://a/1"}
+    assert merge_values({"tags": None, "posting_date": None}, {"tags": [], "posting_date": None})["posting_date"] is None
+
+
+def test_rescan_reports_and_merges(session):
+    canonical, dup, chained, other = [
+        Job(title="Senior Pricing Actuary", company="Aviva", location="London", tags="SQL",
+            posting_date=date(2025, 1, 1)),
+        Job(title="Sr Pricing Actuary", company="Aviva plc", location="London, UK", tags="Python",
+            posting_date=date(2025, 3, 1), source_url="http://dup/1", job_type="Actuary"),
+        Job(title="Senior Pricing Actuary", company="Aviva Ltd", location="London", tags="SQL,Life"),
+        Job(title="Valuation Analyst", company="QBE", location="Remote"),
+    ]
+    session.add_all([canonical, dup, chained, other])
+    session.flush()
+
+    report = rescan(session)
+    assert report == {"scanned": 4, "duplicates": 2, "groups": {canonical.id: [dup.id, chained.id]}}
+    assert session.scalar(select(func.count()).select_from(Job)) == 4
+
+    rescan(session, merge=True)
+    session.expire_all()
+    assert session.scalars(select(Job.id).order_by(Job.id)).all() == [canonical.id, other.id]
+    job = session.get(Job, canonical.id)
+    assert job.tags == "SQL,Python,Life"
+    assert job.posting_date == date(2025, 3, 1)
+    assert (job.source_url, job.job_type) == ("http://dup/1", "Actuary")
@@ -0,0 +1,105 @@
+# backend/tests/test_ingest.py
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from ingest import bulk_upsert_jobs, job_fields_from_payload
+from models.job import Job, content_hash
+from models.tag import TAG_MAX_LENGTH, Tag, clean_tag_names
+from read_model import latest_jobs
+
+
+def job(title="Senior Pricing Actuary", company="Aviva", location="London, UK", **fields):
+    return {"title": title, "company": company, "location": location, **fields}
+
+
+def stored(session, title):
+    session.expire_all()
+    return session.scalars(select(Job).where(Job.title == title)).one()
+
+
+def test_job_fields_from_payload():
+    fields = job_fields_from_payload(job(title="  Actuary ", posting_date="2025-10-03", tags="SQL, sql,Life",
+                                         source_url=" "))
+    assert fields["title"] == "Actuary"
+    assert fields["posting_date"] == date(2025, 10, 3)
+    assert fields["tags"] == ["SQL", "Life"]
+    assert fields["source_url"] is None
+    with pytest.raises(ValueError):
+        job_fields_from_payload(job(company=""))
+
+
+def test_insert_update_unchanged_counts(session):
+    record = job(job_type="Actuary", tags=["SQL"], posting_date="2025-10-03")
+    assert bulk_upsert_jobs(session, [record, job(title="Valuation Analyst")]) == {
+        "inserted": 2, "updated": 0, "unchanged": 0, "merged": 0, "errors": []}
+    row = stored(session, "Senior Pricing Actuary")
+    assert row.content_hash == content_hash({**record, "posting_date": date(2025, 10, 3)})
+    assert (row.city, row.country) == ("London", "United Kingdom")
+
+    assert bulk_upsert_jobs(session, [record])["unchanged"] == 1
+    assert bulk_upsert_jobs(session, [{**record, "tags": ["SQL", "Python"]}])["updated"] == 1
+    assert stored(session, "Senior Pricing Actuary").tags == "SQL,Python"
+    assert session.scalar(select(func.count()).select_from(latest_jobs)) == 2
+
+
+def test_bad_rows_are_reported_not_fatal(session):
+    result = bulk_upsert_jobs(session, [job(), job(title=""), job(title="Valuation Analyst", posting_date="soon")])
+    assert result["inserted"] == 1
+    assert [e["index"] for e in result["errors"]] == [1, 2]
+
+
+def test_repeated_key_in_one_batch_is_reported(session):
+    result = bulk_upsert_jobs(session, [job(job_type="A"), job(title="Other"), job(job_type="B")])
+    assert (result["inserted"], result["updated"]) == (2, 0)
+    assert result["errors"] == [
+        {"index": 0, "error": "same title, company and location as record 2, which replaced it"}]
+    assert stored(session, "Senior Pricing Actuary").job_type == "B"
+
+
+def test_new_source_url_is_an_update(session):
+    bulk_upsert_jobs(session, [job(source_url="http://a/1")])
+    assert bulk_upsert_jobs(session, [job(source_url="http://a/2")])["updated"] == 1
+    assert stored(session, "Senior Pricing Actuary").source_url == "http://a/2"
+    # a record without a URL keeps the stored one and changes nothing
+    assert bulk_upsert_jobs(session, [job()])["unchanged"] == 1
+    assert stored(session, "Senior Pricing Actuary").source_url == "http://a/2"
+
+
+def test_near_duplicates_merge_into_stored_job(session):
+    bulk_upsert_jobs(session, [job(tags=["SQL"], posting_date="2025-01-01", source_url="http://a/1")])
+    result = bulk_upsert_jobs(session, [
+        job(title="Sr Pricing Actuary", company="Aviva plc", tags=["Python"], posting_date="2025-02-01",
+            job_type="Actuary", source_url="http://b/1"),
+    ])
+    assert (result["merged"], result["inserted"], result["updated"]) == (1, 0, 1)
+    assert session.scalar(select(func.count()).select_from(Job)) == 1
+    row = stored(session, "Senior Pricing Actuary")
+    assert row.tags == "SQL,Python"
+    assert row.posting_date == date(2025, 2, 1)
+    assert (row.job_type, row.source_url) == ("Actuary", "http://a/1")
+
+
+def test_near_duplicates_within_batch(session):
+    result = bulk_upsert_jobs(session, [
+        job(tags=["SQL"]),
+        job(title="Sr Pricing Actuary", company="Aviva Ltd", tags=["Life"]),
+    ])
+    assert (result["inserted"], result["merged"], result["errors"]) == (1, 1, [])
+    assert stored(session, "Senior Pricing Actuary").tags == "SQL,Life"
+
+
+def test_dedup_off_keeps_near_duplicates(session):
+    result = bulk_upsert_jobs(session, [job(), job(title="Sr Pricing Actuary")], dedup=False)
+    assert (result["inserted"], result["merged"]) == (2, 0)
+
+
+def test_long_tags_are_cut_to_the_column(session):
+    long_tag = "x" * (TAG_MAX_LENGTH + 50)
+    assert clean_tag_names([long_tag]) == ["x" * TAG_MAX_LENGTH]
+    assert bulk_upsert_jobs(session, [job(tags=[long_tag, "SQL"])])["inserted"] == 1
+    assert {len(t.name) for t in session.scalars(select(Tag))} == {TAG_MAX_LENGTH, 3}
+    # an existing tag is reused, not inserted again
+    bulk_upsert_jobs(session, [job(title="Valuation Analyst", tags=["sql"])])
+    assert session.scalar(select(func.count()).select_from(Tag)) == 2
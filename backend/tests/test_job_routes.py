@@ -0,0 +1,60 @@
+# backend/tests/test_job_routes.py
+from db import db
+from ingest import bulk_upsert_jobs
+from models.job import Job, content_hash
+
+JOB = {"title": "Senior Pricing Actuary", "company": "Aviva", "location": "London, UK", "tags": ["SQL"],
+       "job_type": "Full-time", "posting_date": "2025-01-01", "source_url": "http://a/1"}
+
+
+def test_exact_and_near_duplicates_get_409(client):
+    job_id = client.post("/jobs", json=JOB).get_json()["job"]["id"]
+    resp = client.post("/jobs", json=JOB)
+    assert resp.status_code == 409
+    assert resp.get_json() == {"error": "this job already exists", "duplicate_of": job_id}
+
+    near = {**JOB, "title": "Sr Pricing Actuary", "company": "Aviva plc"}
+    assert client.post("/jobs", json=near).get_json()["duplicate_of"] == job_id
+    # allow_duplicate keeps a near-duplicate, never an exact repeat
+    assert client.post("/jobs?allow_duplicate=1", json=JOB).status_code == 409
+    assert client.post("/jobs?allow_duplicate=1", json=near).status_code == 201
+
+
+def test_merge_folds_into_the_existing_job(client):
+    job_id = client.post("/jobs", json=JOB).get_json()["job"]["id"]
+    near = {**JOB, "title": "Sr Pricing Actuary", "tags": ["Python"], "posting_date": "2025-02-01",
+            "source_url": "http://b/1"}
+    resp = client.post("/jobs?merge=1", json=near)
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["merged_into"] == job_id
+    assert body["job"]["title"] == JOB["title"]
+    assert body["job"]["tags"] == ["SQL", "Python"]
+    assert body["job"]["posting_date"] == "2025-02-01"
+    assert body["job"]["source_url"] == "http://a/1"
+
+
+def test_api_writes_keep_content_hash_current(client):
+    job_id = client.post("/jobs", json=JOB).get_json()["job"]["id"]
+    client.patch(f"/jobs/{job_id}", json={"job_type": "Contract"})
+    with client.application.app_context():
+        # ingesting what the API stored is a no-op
+        result = bulk_upsert_jobs(db.session, [{**JOB, "job_type": "Contract"}])
+        assert result["unchanged"] == 1
+        job = db.session.get(Job, job_id)
+        assert job.content_hash == content_hash(job.to_dict())
+
+
+def test_facets_ignore_their_own_filter(client):
+    for n, job_type in enumerate(["Full-time", "Contract", "Full-time"]):
+        client.post("/jobs?allow_duplicate=1", json={**JOB, "title": f"Job {n}", "company": f"Co {n}",
+                                                     "job_type": job_type})
+    body = client.get("/jobs/facets?job_type=Full-time").get_json()
+    assert body["total"] == 2
+    assert {f["value"]: f["count"] for f in body["facets"]["job_type"]} == {"Full-time": 2, "Contract": 1}
+
+
+def test_suggest_rejects_long_prefixes(client):
+    assert client.get("/jobs/suggest?field=title&prefix=" + "x" * 101).status_code == 400
+    assert client.get("/jobs/suggest?field=title&prefix=" + "x" * 100).status_code == 200
+    assert client.get("/jobs/suggest?field=salary&prefix=a").status_code == 400
@@ -0,0 +1,35 @@
+# backend/tests/test_ratelimit.py
+from flask import Flask
+
+from ratelimit import RateLimiter, TokenBuckets
+
+
+def test_token_bucket_refills(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("ratelimit.time.monotonic", lambda: now[0])
+    buckets = TokenBuckets(rate=2, burst=2)
+    assert buckets.take("a") == buckets.take("a") == 0.0
+    assert buckets.take("a") == 0.5
+    assert buckets.take("b") == 0.0  # keys have their own buckets
+    now[0] += 1
+    assert buckets.take("a") == 0.0
+
+
+def test_empty_settings_mean_defaults(monkeypatch):
+    for name in ("RATE_LIMIT_PER_SECOND", "RATE_LIMIT_BURST", "RATE_LIMIT_TRUSTED_PROXIES", "RATE_LIMIT_MAX_CLIENTS"):
+        monkeypatch.setenv(name, "")
+    limiter = RateLimiter()
+    limiter.init_app(Flask(__name__))
+    assert limiter.stats() == {"enabled": False}
+
+    monkeypatch.setenv("RATE_LIMIT_PER_SECOND", "5")
+    limiter.init_app(Flask(__name__))
+    assert limiter.stats()["burst"] == 40
+    assert limiter.buckets.max_entries == 10000
+
+
+def test_app_starts_with_an_empty_rate(client, monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_PER_SECOND", "")
+    from app import create_app
+
+    assert create_app().test_client().get("/jobs").status_code == 200
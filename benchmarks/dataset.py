@@ -0,0 +1,136 @@
+# benchmarks/dataset.py
+"""
+Synthetic jobs data for the benchmarks.
+
+Distributions are skewed the way the real listing is: a few large employers
+and hubs carry most postings (Zipf-like weights), junior roles outnumber
+senior ones, postings cluster in the last few weeks, and a handful of tags
+are on most jobs. Job types are the scraper's JOB_TYPE_TERMS. Rows get
+tags in both forms (jobs.tags and tags/job_tags), a source_url, a
+content_hash and city / country / is_remote, like the scraper writes them.
+
+    from dataset import seed
+    seed(engine, 100_000)        # appends; deterministic for a given rng_seed
+"""
+import datetime as dt
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for _p in (os.path.join(BASE_DIR, "backend"), os.path.join(BASE_DIR, "Scraper")):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+from sqlalchemy import func, insert, select
+
+from geo import place_columns
+from models.job import Job, content_hash
+from models.tag import Tag, job_tags, tag_slug
+from read_model import job_type_counts, latest_jobs, rebuild as rebuild_read_model
+from scrape import JOB_TYPE_TERMS
+
+COMPANIES = ["Acme Re", "Aviva", "AIG", "QBE", "Swiss Re", "Munich Re", "Liberty Mutual",
+             "Milliman", "WTW", "Aon", "Zurich", "Allianz", "Prudential", "MetLife",
+             "Lloyd's", "Hannover Re", "Chubb", "Travelers", "Legal & General", "Mercer",
+             "Deloitte", "EY", "KPMG", "PwC", "Barnett Waddingham", "Hymans Robertson",
+             "Lane Clark & Peacock", "Oliver Wyman", "Guy Carpenter", "Gallagher Re"]
+LOCATIONS = ["London, United Kingdom", "New York, United States", "Remote", "Chicago, United States",
+             "Toronto, Canada", "Zurich, Switzerland", "Hartford, United States", "Sydney, Australia",
+             "Dublin, Ireland", "Singapore, Singapore", "Munich, Germany", "Hong Kong, Hong Kong",
+             "Philadelphia, United States", "Edinburgh, United Kingdom", "Boston, United States",
+             "Paris, France", "Johannesburg, South Africa", "Mumbai, India", "Bermuda", "Remote, United States"]
+TITLES = ["Pricing Actuary", "Valuation Analyst", "Reserving Actuary", "Capital Modelling Lead",
+          "Actuarial Intern", "Pensions Consultant", "Risk Analyst", "Actuarial Analyst",
+          "Senior Pricing Actuary", "Life Actuary", "Health Actuary", "IFRS 17 Specialist",
+          "Catastrophe Modeller", "Data Scientist (Actuarial)", "Chief Actuary"]
+TAGS = ["Life", "Health", "Property", "Casualty", "Pensions", "Reinsurance", "Python", "SQL",
+        "R", "SAS", "Excel", "Pricing", "Reserving", "Risk", "Valuation", "Modelling",
+        "IFRS 17", "Solvency II", "Capital", "Investment", "Consulting", "Hybrid"]
+# share of postings per JOB_TYPE_TERMS entry (juniors dominate the board)
+JOB_TYPE_WEIGHTS = [0.12, 0.30, 0.22, 0.18, 0.12, 0.06]
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class JobGenerator:
+    """Deterministic stream of job dicts (column values + a list of tag names)."""
+
+    def __init__(self, rng_seed: int = 42, today: dt.date | None = None):
+        self.rnd = random.Random(rng_seed)
+        self.today = today or dt.date.today()
+        self.company_w = zipf_weights(len(COMPANIES))
+        self.location_w = zipf_weights(len(LOCATIONS), 0.9)
+        self.title_w = zipf_weights(len(TITLES), 0.7)
+        self.tag_w = zipf_weights(len(TAGS), 0.8)
+
+    def job(self, i: int) -> dict:
+        rnd = self.rnd
+        title = rnd.choices(TITLES, self.title_w)[0]
+        company = rnd.choices(COMPANIES, self.company_w)[0]
+        # most postings are recent: exponential age with a ~3 week mean, capped at a year
+        posting_date = None
+        if rnd.random() >= 0.02:
+            posting_date = self.today - dt.timedelta(days=min(365, int(rnd.expovariate(1 / 21))))
+        n_tags = min(len(TAGS), max(1, int(rnd.gauss(3, 1.2))))
+        tags = []
+        while len(tags) < n_tags:
+            tag = rnd.choices(TAGS, self.tag_w)[0]
+            if tag not in tags:
+                tags.append(tag)
+        return {
+            "title": f"{title} #{i}",
+            "company": company,
+            "location": rnd.choices(LOCATIONS, self.location_w)[0],
+            "posting_date": posting_date,
+            "job_type": rnd.choices(JOB_TYPE_TERMS, JOB_TYPE_WEIGHTS)[0],
+            "tags": tags,
+            "source_url": f"https://www.actuarylist.com/actuarial-jobs/{i}-{company.lower().replace(' ', '-')}",
+        }
+
+
+def seed(engine, rows: int, chunk: int = 20000, rng_seed: int = 42):
+    """
+    Append `rows` synthetic jobs (with job_tags links) to the database behind
+    `engine`, then rebuild the read model. Creates the tags and read-model tables
+    if they are missing; the jobs table must exist.
+    """
+    for table in (Tag.__table__, job_tags, job_type_counts, latest_jobs):
+        table.create(engine, checkfirst=True)
+
+    gen = JobGenerator(rng_seed)
+    now = dt.datetime.utcnow()
+    jobs = Job.__table__
+    with engine.begin() as conn:
+        tag_ids = {slug: id_ for id_, slug in conn.execute(select(Tag.id, Tag.slug))}
+        missing = [t for t in TAGS if tag_slug(t) not in tag_ids]
+        if missing:
+            conn.execute(insert(Tag.__table__), [{"name": t, "slug": tag_slug(t)} for t in missing])
+            tag_ids = {slug: id_ for id_, slug in conn.execute(select(Tag.id, Tag.slug))}
+
+        # explicit ids so job_tags can be written without reading the jobs back
+        next_id = (conn.scalar(select(func.max(jobs.c.id))) or 0) + 1
+        for start in range(0, rows, chunk):
+            batch, links = [], []
+            for _ in range(start, min(rows, start + chunk)):
+                data = gen.job(next_id)
+                batch.append({
+                    **data,
+                    "id": next_id,
+                    **place_columns(data["location"]),
+                    "tags": ",".join(data["tags"]),
+                    "content_hash": content_hash(data),
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                links.extend({"job_id": next_id, "tag_id": tag_ids[tag_slug(t)]} for t in data["tags"])
+                next_id += 1
+            conn.execute(insert(jobs), batch)
+            conn.execute(insert(job_tags), links)
+
+        if conn.dialect.name == "postgresql":
+            # ids were explicit: move the serial past them for later inserts
+            conn.exec_driver_sql("SELECT setval(pg_get_serial_sequence('jobs', 'id'), (SELECT max(id) FROM jobs))")
+        rebuild_read_model(conn)
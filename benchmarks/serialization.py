@@ -0,0 +1,83 @@
+# benchmarks/serialization.py
+"""
+Requests/sec of GET /jobs?page_size=50: column projection + direct JSON
+(the current list_jobs) against the previous path (full Job entities,
+to_dict() and jsonify), both through the Flask test client with the
+response cache off.
+
+    python benchmarks/serialization.py --rows 20000 --seconds 5
+"""
+import argparse, os, sys, tempfile, time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(BASE_DIR, "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from dataset import seed
+
+
+def build_app(db_path: str):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DB_AUTO_CREATE"] = "1"
+    os.environ["CACHE_TTL"] = "0"
+    os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+
+    from flask import jsonify
+    from app import create_app
+    from models.job import Job
+
+    app = create_app()
+
+    @app.get("/bench/orm-jobs")
+    def orm_jobs():
+        # the pre-projection list_jobs: ORM entities -> to_dict() -> jsonify
+        query = Job.query.order_by(Job.posting_date.desc().nulls_last(), Job.id.desc())
+        total = query.count()
+        items = query.offset(0).limit(50).all()
+        return jsonify(jobs=[j.to_dict() for j in items], page=1, page_size=50, total=total), 200
+
+    return app
+
+
+def measure(client, url: str, seconds: float) -> float:
+    client.get(url)  # warm up
+    n, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        resp = client.get(url)
+        assert resp.status_code == 200, resp.status_code
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--seconds", type=float, default=5.0, help="time per variant")
+    args = ap.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench_serialization.db")
+    app = build_app(db_path)
+    from db import db
+    import serializers
+
+    with app.app_context():
+        seed(db.engine, args.rows)
+
+    client = app.test_client()
+    encoder = "orjson" if serializers.orjson is not None else "json"
+    results = {
+        "orm + to_dict + jsonify": measure(client, "/bench/orm-jobs", args.seconds),
+        f"projection + {encoder}": measure(client, "/jobs?page_size=50", args.seconds),
+        f"projection + {encoder}, fields=id,title,company": measure(
+            client, "/jobs?page_size=50&fields=id,title,company", args.seconds),
+    }
+
+    base = results["orm + to_dict + jsonify"]
+    print(f"{args.rows} rows, page_size=50, {args.seconds:.0f}s per variant")
+    for name, rps in results.items():
+        print(f"{name:48} {rps:8.1f} req/s  ({rps / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
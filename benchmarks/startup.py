@@ -0,0 +1,140 @@
+# benchmarks/startup.py
+"""
+Cold-start cost of the backend: each scenario runs in a fresh interpreter,
+the way a serverless instance or a scraper run starts.
+
+  import_app      import app (module only)
+  create_app      import app + create_app()
+  first_health    ... + the first GET /health
+  first_jobs      ... + the first GET /jobs (list query, serializers, read model)
+  app_session     create_app() + SELECT 1 in an app context (how tools reached the database before)
+  session         db.SessionFactory() + SELECT 1, no Flask app (scraper, CLIs, Alembic)
+  scraper_write   session + the ingest path the scraper writes through
+
+For every scenario it reports the process wall time, the time spent in
+imports and in the scenario's own code (medians over --repeat plain runs),
+and the packages with the most import self-time (from one extra run under
+-X importtime, which inflates import times itself).
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --output startup.json
+    python benchmarks/startup.py --baseline startup.json     # exit 1 on regressions
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+from collections import defaultdict
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(BASE_DIR, "backend")
+
+SCENARIOS = {
+    "import_app": ("import app", "pass"),
+    "create_app": ("from app import create_app", "create_app()"),
+    "first_health": ("from app import create_app",
+                     "assert create_app().test_client().get('/health').status_code == 200"),
+    "first_jobs": ("from app import create_app",
+                   "assert create_app().test_client().get('/jobs').status_code == 200"),
+    "app_session": ("from sqlalchemy import text\nfrom app import create_app\nfrom db import db",
+                    "with create_app().app_context(): db.session.execute(text('SELECT 1'))"),
+    "session": ("from sqlalchemy import text\nfrom db import SessionFactory",
+                "SessionFactory()().execute(text('SELECT 1'))"),
+    "scraper_write": ("from sqlalchemy import text\nfrom db import SessionFactory\nfrom ingest import bulk_upsert_jobs",
+                      "SessionFactory()().execute(text('SELECT 1'))"),
+}
+
+RUNNER = """
+import json, sys, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+{action}
+t2 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "run_ms": (t2 - t1) * 1000}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Import self-time in ms per top-level package."""
+    by_package = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us) / 1000
+    return dict(by_package)
+
+
+def run_scenario(name: str, env: dict, importtime: bool = False) -> dict:
+    imports, action = SCENARIOS[name]
+    code = RUNNER.format(imports=imports, action=action)
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"{name} failed:\n{proc.stderr[-2000:]}")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"process_ms": wall_ms, **timings, "packages": parse_importtime(proc.stderr) if importtime else {}}
+
+
+def scratch_database() -> str:
+    """A small SQLite database with the full schema, so /jobs has something to list."""
+    sys.path.insert(0, BACKEND_DIR)
+    from sqlalchemy import create_engine
+
+    from dataset import seed
+    from db import db
+
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db")
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    seed(engine, 200)
+    engine.dispose()
+    return url
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5, help="fresh processes per scenario")
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset")
+    ap.add_argument("--top", type=int, default=8, help="packages listed per scenario")
+    ap.add_argument("--output", help="write the results as JSON")
+    ap.add_argument("--baseline", help="previous --output file to compare against")
+    ap.add_argument("--tolerance", type=float, default=1.15,
+                    help="flag process times slower than baseline * tolerance (default 1.15)")
+    args = ap.parse_args()
+
+    env = {**os.environ, "DATABASE_URL": scratch_database(), "CACHE_TTL": "0"}
+    for name in ("DB_AUTO_CREATE", "METRICS_ENABLED", "PYTHONDONTWRITEBYTECODE"):
+        env.pop(name, None)
+
+    results = []
+    for name in [s for s in args.scenarios.split(",") if s]:
+        run_scenario(name, env)  # warm the bytecode cache
+        runs = [run_scenario(name, env) for _ in range(args.repeat)]
+        result = {"name": name, "n": len(runs)}
+        for key in ("process_ms", "import_ms", "run_ms"):
+            result[key] = round(statistics.median(r[key] for r in runs), 1)
+        # -X importtime slows imports down, so the breakdown comes from one extra run
+        top = sorted(run_scenario(name, env, importtime=True)["packages"].items(), key=lambda kv: -kv[1])[:args.top]
+        result["top_packages_ms"] = {pkg: round(ms, 1) for pkg, ms in top}
+        results.append(result)
+        print(f"{name:14} process {result['process_ms']:7.1f} ms  imports {result['import_ms']:7.1f} ms  "
+              f"run {result['run_ms']:6.1f} ms  | " + ", ".join(f"{p} {ms:.0f}" for p, ms in top))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+        regressions = [r for r in results if r["name"] in baseline
+                       and r["process_ms"] > baseline[r["name"]]["process_ms"] * args.tolerance]
+        for r in regressions:
+            print(f"REGRESSION {r['name']}: {baseline[r['name']]['process_ms']} -> {r['process_ms']} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-import React, { useEffect, useState, useMemo } from 'react'
-import { getJobs, createJob, deleteJob, updateJob } from './api'
+import React, { useEffect, useRef, useState, useMemo } from 'react'
+import { getJobs, getFacets, getChanges, createJob, deleteJob, updateJob } from './api'
 import JobList from './components/JobList.jsx'
 import JobForm from './components/JobForm.jsx'
 import FilterBar from './components/FilterBar.jsx'
@@ -28,6 +28,16 @@ export default function App() {
 
   const [editing, setEditing] = useState(null) // job being edited
 
+  // counts per job_type / location / tag under the current filters (for the FilterBar)
+  const [facets, setFacets] = useState(null)
+
+  // changes made elsewhere since the page loaded: visible jobs are patched in place,
+  // others only counted until the user refreshes
+  const [pendingChanges, setPendingChanges] = useState(0)
+  const changesToken = useRef(null)
+  const jobsRef = useRef(jobs)
+  jobsRef.current = jobs
+
   // Build API params (strip job_type=All)
   const apiParams = useMemo(() => {
     const p = { ...filters }
@@ -44,6 +54,7 @@ export default function App() {
       const data = await getJobs(apiParams)
       setJobs(data.jobs || [])
       setMeta({ total: data.total || 0 })
+      setPendingChanges(0)
     } catch (err) {
       setError(err?.message || 'Failed to fetch jobs')
     } finally {
@@ -54,6 +65,56 @@ export default function App() {
   // Fetch whenever params change
   useEffect(() => { fetchJobs() }, [apiParams]) // eslint-disable-line react-hooks/exhaustive-deps
 
+  // Refresh facet counts when filters change (not on page changes)
+  useEffect(() => {
+    const p = { ...filters }
+    if (p.job_type === 'All') delete p.job_type
+    delete p.sort
+    getFacets(p).then(data => setFacets(data.facets)).catch(() => setFacets(null))
+  }, [filters])
+
+  // Poll the change feed every 30s
+  useEffect(() => {
+    let stopped = false
+    const poll = async () => {
+      try {
+        let more = true
+        while (more && !stopped) {
+          const data = await getChanges(changesToken.current || 'now')
+          if (changesToken.current) applyChanges(data.changes)
+          changesToken.current = data.next
+          more = data.has_more
+        }
+      } catch (err) {
+        // 410: the token outlived the feed's retention, start over from now
+        if (err?.response?.status === 410) changesToken.current = null
+      }
+    }
+    poll()
+    const timer = setInterval(poll, 30000)
+    return () => { stopped = true; clearInterval(timer) }
+  }, [])
+
+  const applyChanges = (changes) => {
+    const visible = new Set(jobsRef.current.map(j => j.id))
+    const updated = new Map()
+    const deleted = new Set()
+    let elsewhere = 0
+    for (const c of changes) {
+      if (!visible.has(c.id)) {
+        if (c.op === 'upsert') elsewhere += 1
+      } else if (c.op === 'delete') {
+        deleted.add(c.id)
+      } else {
+        updated.set(c.id, c.job)
+      }
+    }
+    if (updated.size || deleted.size) {
+      setJobs(prev => prev.filter(j => !deleted.has(j.id)).map(j => updated.get(j.id) || j))
+    }
+    if (elsewhere) setPendingChanges(n => n + elsewhere)
+  }
+
   // Whenever filters change, reset to the first page
   useEffect(() => { setPage(1) }, [filters])
 
@@ -68,12 +129,29 @@ export default function App() {
       // await fetchJobs()
       alert('Job added successfully.')
     } catch (err) {
-      alert('Failed to add job: ' + (err?.response?.data?.error || err.message))
+      const duplicateOf = err?.response?.status === 409 && err.response.data?.duplicate_of
+      if (duplicateOf) {
+        await mergeIntoExisting(payload, duplicateOf)
+      } else {
+        alert('Failed to add job: ' + (err?.response?.data?.error || err.message))
+      }
     } finally {
       setLoading(false)
     }
   }
 
+  // The job (or a near-duplicate of it) is already listed: offer to add the new details to that job
+  const mergeIntoExisting = async (payload, duplicateOf) => {
+    if (!window.confirm(`This job is already listed (#${duplicateOf}). Add these details (tags, date, link) to it?`)) return
+    try {
+      const { job } = await createJob(payload, { merge: 1 })
+      setJobs(prev => (prev.some(j => j.id === job.id) ? prev.map(j => (j.id === job.id ? job : j)) : [job, ...prev]))
+      alert('Merged into the existing job.')
+    } catch (err) {
+      alert('Merge failed: ' + (err?.response?.data?.error || err.message))
+    }
+  }
+
   const handleDelete = async (id) => {
     if (!window.confirm('Delete this job?')) return
     setLoading(true)
@@ -118,7 +196,7 @@ export default function App() {
         <p className="muted">Browse, add, edit, and filter actuarial jobs.</p>
       </header>
 
-      <FilterBar value={filters} onChange={setFilters} />
+      <FilterBar value={filters} onChange={setFilters} facets={facets} />
 
       <section className="grid">
         <div>
@@ -135,6 +213,12 @@ export default function App() {
           <h2>Jobs</h2>
           {loading && <div className="notice">Loading…</div>}
           {error && <div className="error">{error}</div>}
+          {pendingChanges > 0 && (
+            <div className="notice">
+              {pendingChanges} new/updated {pendingChanges === 1 ? 'job' : 'jobs'} &mdash;{' '}
+              <button onClick={fetchJobs}>Refresh</button>
+            </div>
+          )}
 
           <JobList jobs={jobs} onDelete={handleDelete} onEdit={handleStartEdit} />
 
@@ -7,8 +7,25 @@ export async function getJobs(params = {}) {
   return data
 }
 
-export async function createJob(payload) {
-  const { data } = await axios.post(`${BASE}/jobs`, payload)
+export async function getFacets(params = {}) {
+  const { data } = await axios.get(`${BASE}/jobs/facets`, { params })
+  return data
+}
+
+export async function getSuggestions(field, prefix, limit = 10) {
+  const { data } = await axios.get(`${BASE}/jobs/suggest`, { params: { field, prefix, limit } })
+  return data.suggestions
+}
+
+// since: a token from the previous call, 'now' to start from the present, or '' for everything
+export async function getChanges(since, limit = 100) {
+  const { data } = await axios.get(`${BASE}/jobs/changes`, { params: { since, limit } })
+  return data
+}
+
+// params: { merge: 1 } folds the job into the one it duplicates (after a 409 with duplicate_of)
+export async function createJob(payload, params = {}) {
+  const { data } = await axios.post(`${BASE}/jobs`, payload, { params })
   return data
 }
 
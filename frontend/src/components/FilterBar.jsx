@@ -1,11 +1,15 @@
 import React, { useState, useEffect } from 'react'
+import { getSuggestions } from '../api'
 
-export default function FilterBar({ value, onChange }) {
+const DEFAULT_JOB_TYPES = ['Full-time', 'Part-time', 'Remote', 'Internship']
+
+export default function FilterBar({ value, onChange, facets }) {
   const [q, setQ] = useState(value.q || '')
   const [jobType, setJobType] = useState(value.job_type || 'All')
   const [location, setLocation] = useState(value.location || '')
   const [tag, setTag] = useState(value.tag || '')
   const [sort, setSort] = useState(value.sort || 'posting_date_desc')
+  const [locationSuggestions, setLocationSuggestions] = useState(null)
 
   // keep local inputs in sync if parent resets filters
   useEffect(() => {
@@ -16,6 +20,21 @@ export default function FilterBar({ value, onChange }) {
     setSort(value.sort || 'posting_date_desc')
   }, [value])
 
+  // typed locations complete from /jobs/suggest (typo tolerant); short input falls back to the facets
+  useEffect(() => {
+    if (location.trim().length < 2) {
+      setLocationSuggestions(null)
+      return
+    }
+    let cancelled = false
+    const timer = setTimeout(() => {
+      getSuggestions('location', location)
+        .then(items => { if (!cancelled) setLocationSuggestions(items) })
+        .catch(() => { if (!cancelled) setLocationSuggestions(null) })
+    }, 150)
+    return () => { cancelled = true; clearTimeout(timer) }
+  }, [location])
+
   const apply = (e) => {
     if (e) e.preventDefault()
     onChange({ q, job_type: jobType, location, tag, sort })
@@ -41,10 +60,15 @@ export default function FilterBar({ value, onChange }) {
         <div className="field">
           <select value={jobType} onChange={e => setJobType(e.target.value)} aria-label="Job type">
             <option>All</option>
-            <option>Full-time</option>
-            <option>Part-time</option>
-            <option>Remote</option>
-            <option>Internship</option>
+            {facets
+              ? facets.job_type.map(f => (
+                  <option key={f.value} value={f.value}>{f.value} ({f.count})</option>
+                ))
+              : DEFAULT_JOB_TYPES.map(t => <option key={t}>{t}</option>)}
+            {/* facets count job types without the job_type filter; keep a selection they no longer list */}
+            {facets && jobType !== 'All' && !facets.job_type.some(f => f.value === jobType) && (
+              <option value={jobType}>{jobType}</option>
+            )}
           </select>
         </div>
 
@@ -54,7 +78,11 @@ export default function FilterBar({ value, onChange }) {
             onChange={e => setLocation(e.target.value)}
             placeholder="Location (e.g., London)"
             aria-label="Location"
+            list="location-facets"
           />
+          <datalist id="location-facets">
+            {(locationSuggestions || facets?.location || []).map(f => <option key={f.value} value={f.value}>{f.count}</option>)}
+          </datalist>
         </div>
 
         <div className="field">
@@ -63,11 +91,18 @@ export default function FilterBar({ value, onChange }) {
             onChange={e => setTag(e.target.value)}
             placeholder="Tag (e.g., Pricing)"
             aria-label="Tag"
+            list="tag-facets"
           />
+          <datalist id="tag-facets">
+            {(facets?.tag || []).map(f => <option key={f.value} value={f.value}>{f.count}</option>)}
+          </datalist>
         </div>
 
         <div className="field">
           <select value={sort} onChange={e => setSort(e.target.value)} aria-label="Sort">
+            <optgroup label="Search">
+              <option value="relevance">Best match</option>
+            </optgroup>
             <optgroup label="Date">
               <option value="posting_date_desc">Newest first</option>
               <option value="posting_date_asc">Oldest first</option>